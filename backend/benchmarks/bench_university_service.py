@@ -0,0 +1,359 @@
+"""
+UniversityService Benchmarks
+Load time, memory and throughput of the catalog paths at 10k / 100k / 1M universities
+
+Synthetic catalogs are generated once per size and seed and reused between runs.
+Every run prints one JSON document (environment + one result object per size),
+so results can be stored and diffed between releases.
+
+Usage (from backend/):
+    python -m benchmarks.bench_university_service
+    python -m benchmarks.bench_university_service --sizes 10000,100000 --output bench.json
+    python -m benchmarks.bench_university_service --sizes 10000 --check
+"""
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.generate_catalog import write_catalog
+from services.catalog_binary import compile_catalog, compiled_path_for
+from services.recommendation_cache import RecommendationCache
+from services.university_record import compact_records
+from services.field_taxonomy import default_taxonomy
+from services.university_scoring import score_batch
+from services.university_service import UniversityService
+from services.university_view import json_default
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / "edu-global-bench"
+
+DEGREES = ["Masters", "MS", "MSc", "MBA", "PhD", "MEng", "LL.M"]
+FIELDS = sorted(default_taxonomy().related_fields) + ["Robotics", "Public Health", "Mechanical Engineering"]
+COUNTRIES = ["United States", "United Kingdom", "Canada", "Germany", "Australia",
+             "Ireland", "Netherlands", "Singapore", "France", "Switzerland"]
+INTAKE_YEARS = [2026, 2027, 2028]
+
+
+def random_profile(rng: random.Random) -> Dict:
+    """A recommendation request shaped like the ones built from onboarding data"""
+    return {
+        "target_degree": rng.choice(DEGREES),
+        "field_of_study": rng.choice(FIELDS),
+        "preferred_countries": rng.sample(COUNTRIES, rng.randint(1, 3)),
+        "budget_max": rng.choice([None, 30000.0, 50000.0, 70000.0, 90000.0]),
+        "target_intake_year": rng.choice(INTAKE_YEARS),
+        "user_gpa": round(rng.uniform(2.5, 4.0), 2),
+        "user_gre": rng.choice([None, 300, 310, 320, 330]),
+        "user_gmat": rng.choice([None, 600, 680, 720]),
+        "user_ielts": rng.choice([None, 6.0, 6.5, 7.0, 7.5]),
+        "user_toefl": rng.choice([None, 90, 100, 110]),
+    }
+
+
+def scoring_profile(profile: Dict) -> Dict:
+    """score_university / score_batch keyword arguments for a recommendation profile"""
+    return {
+        "user_gpa": profile["user_gpa"],
+        "user_gre": profile["user_gre"],
+        "user_gmat": profile["user_gmat"],
+        "user_ielts": profile["user_ielts"],
+        "user_toefl": profile["user_toefl"],
+        "user_budget": profile["budget_max"],
+        "user_countries": profile["preferred_countries"],
+    }
+
+
+def filter_profile(profile: Dict) -> Dict:
+    """filter_universities keyword arguments for a recommendation profile"""
+    return {
+        key: profile[key]
+        for key in ("target_degree", "field_of_study", "preferred_countries", "budget_max", "target_intake_year")
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux only; None elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def measure(operation: Callable[[int], object], min_seconds: float, min_ops: int = 5) -> Dict:
+    """
+    Call operation(i) repeatedly for at least min_seconds and min_ops calls
+    Returns throughput plus per-call latency percentiles in milliseconds
+    """
+    latencies = []
+    started = time.perf_counter()
+    i = 0
+    while i < min_ops or time.perf_counter() - started < min_seconds:
+        call_started = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - call_started)
+        i += 1
+    elapsed = time.perf_counter() - started
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "ops": i,
+        "ops_per_s": round(i / elapsed, 2),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 4),
+    }
+
+
+def timed_load(json_path: Path) -> Tuple[UniversityService, Dict]:
+    """Construct a service for json_path, recording wall time and RSS growth"""
+    gc.collect()
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    service = UniversityService(json_path)
+    elapsed = time.perf_counter() - started
+    rss_after = rss_bytes()
+    if len(service.universities) == 0:
+        raise RuntimeError(f"{json_path} did not load")
+    return service, {
+        "seconds": round(elapsed, 4),
+        "rss_delta_mb": round((rss_after - rss_before) / 2**20, 2) if rss_before is not None else None,
+    }
+
+
+def record_memory(json_path: Path, sample: int = 10_000) -> Dict:
+    """
+    Python heap held by `sample` parsed records as nested dicts vs compact UniversityRecords
+    (traced allocations, so the numbers don't depend on RSS noise)
+    """
+    with open(json_path, 'rb') as f:
+        sample_raw = json.dumps(json.load(f)[:sample]).encode('utf-8')
+    gc.collect()
+    tracemalloc.start()
+    try:
+        universities = json.loads(sample_raw)
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        records = compact_records(universities)
+        del universities
+        gc.collect()
+        record_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    per_10k = 10_000 / len(records)
+    return {
+        "records": len(records),
+        "dict_mb_per_10k": round(dict_bytes * per_10k / 2**20, 2),
+        "compact_mb_per_10k": round(record_bytes * per_10k / 2**20, 2),
+        "saved_mb_per_10k": round((dict_bytes - record_bytes) * per_10k / 2**20, 2),
+    }
+
+
+def check_parity(service: UniversityService, profiles: List[Dict], sample_rows: int) -> Dict:
+    """
+    Compare batch-scored recommendation entries against score_university
+    for a sample of catalog rows under each profile (JSON-identical or mismatch)
+    """
+    snapshot = service._snapshot
+    rng = random.Random(0)
+    positions = np.array(sorted(rng.sample(range(snapshot.columns.size), min(sample_rows, snapshot.columns.size))))
+    compared = 0
+    mismatched = 0
+    examples = []
+    for profile in profiles:
+        kwargs = scoring_profile(profile)
+        scores = score_batch(snapshot.columns, positions, **kwargs)
+        for row, pos in enumerate(positions.tolist()):
+            university = snapshot.universities[pos]
+            expected = service.score_university(university, **kwargs)
+            actual = service._build_scored_university(snapshot, scores, row, kwargs)
+            compared += 1
+            if json.dumps(expected, default=json_default) != json.dumps(actual, default=json_default):
+                mismatched += 1
+                if len(examples) < 10:
+                    examples.append({"id": university.get("id"), "profile": profile})
+    return {"compared": compared, "mismatches": mismatched, "examples": examples}
+
+
+def bench_size(size: int, args) -> Dict:
+    """Run every benchmark against one synthetic catalog size"""
+    json_path = args.data_dir / f"universities_{size}_seed{args.seed}.json"
+    if not json_path.exists():
+        started = time.perf_counter()
+        write_catalog(size, json_path, args.seed)
+        print(f"generated {json_path} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    # Make sure the JSON path is measured, not a leftover compiled catalog
+    compiled_path_for(json_path).unlink(missing_ok=True)
+
+    rng = random.Random(args.seed)
+    profiles = [random_profile(rng) for _ in range(args.profiles)]
+    result = {"size": size, "catalog": str(json_path), "catalog_mb": round(json_path.stat().st_size / 2**20, 2)}
+
+    result["record_memory"] = record_memory(json_path)
+    service, result["load_json"] = timed_load(json_path)
+    snapshot = service._snapshot
+    ids = [uni["id"] for uni in snapshot.universities]
+    print(f"[{size}] loaded in {result['load_json']['seconds']}s", file=sys.stderr)
+
+    result["filter"] = measure(
+        lambda i: service.filter_universities(**filter_profile(profiles[i % len(profiles)])),
+        args.min_seconds,
+    )
+
+    # Reference scorer: one university per call
+    result["score_reference"] = measure(
+        lambda i: service.score_university(
+            snapshot.universities[i % size], **scoring_profile(profiles[i % len(profiles)])
+        ),
+        args.min_seconds,
+    )
+
+    # Batch scorer over the whole catalog; throughput reported in rows
+    all_positions = np.arange(size)
+    score_batch_stats = measure(
+        lambda i: score_batch(snapshot.columns, all_positions, **scoring_profile(profiles[i % len(profiles)])),
+        args.min_seconds,
+    )
+    score_batch_stats["rows_per_s"] = round(score_batch_stats["ops_per_s"] * size, 2)
+    result["score_batch"] = score_batch_stats
+
+    # Recommendations with the cache disabled (every call computes), then cache hits
+    service.recommendation_cache = RecommendationCache(max_entries=0)
+    result["recommend_uncached"] = measure(
+        lambda i: service.get_recommended_universities(**profiles[i % len(profiles)]),
+        args.min_seconds,
+    )
+    result["recommend_uncached_limit10"] = measure(
+        lambda i: service.get_recommended_universities(**profiles[i % len(profiles)], limit=10),
+        args.min_seconds,
+    )
+    # Ten exam / budget variations of one profile, scored together
+    scenarios = (
+        [{"user_gre": gre} for gre in (300, 310, 320, 330)]
+        + [{"user_ielts": ielts} for ielts in (6.0, 7.0, 8.0)]
+        + [{"budget_max": budget} for budget in (30000, 60000, 90000)]
+    )
+    result["what_if_10"] = measure(
+        lambda i: service.evaluate_scenarios(profiles[i % len(profiles)], scenarios),
+        args.min_seconds,
+    )
+    result["pareto_3_layers"] = measure(
+        lambda i: service.get_pareto_frontier(**profiles[i % len(profiles)], layers=3),
+        args.min_seconds,
+    )
+    service.recommendation_cache = RecommendationCache(max_entries=len(profiles))
+    for profile in profiles:
+        service.get_recommended_universities(**profile)
+    result["recommend_cached"] = measure(
+        lambda i: service.get_recommended_universities(**profiles[i % len(profiles)]),
+        args.min_seconds,
+    )
+
+    lookup_ids = [rng.choice(ids) for _ in range(1000)]
+    result["id_lookup"] = measure(
+        lambda i: service.get_university_by_id(lookup_ids[i % len(lookup_ids)]),
+        args.min_seconds,
+    )
+    result["id_lookup_bulk_100"] = measure(
+        lambda i: service.get_universities_by_ids(lookup_ids[(i * 100) % 900:(i * 100) % 900 + 100]),
+        args.min_seconds,
+    )
+
+    # Name resolution: exact names, then names with one character dropped (fuzzy path)
+    result["compare_10"] = measure(
+        lambda i: service.compare_universities(
+            lookup_ids[(i * 10) % 990:(i * 10) % 990 + 10], scoring_profile(profiles[i % len(profiles)])
+        ),
+        args.min_seconds,
+    )
+    lookup_names = [snapshot.universities[snapshot.id_positions[uni_id]]["name"] for uni_id in lookup_ids[:200]]
+    misspelled = [name[:len(name) // 2] + name[len(name) // 2 + 1:] for name in lookup_names]
+    result["name_resolve_exact"] = measure(
+        lambda i: service.resolve_university_name(lookup_names[i % len(lookup_names)]),
+        args.min_seconds,
+    )
+    result["name_resolve_fuzzy"] = measure(
+        lambda i: service.resolve_university_name(misspelled[i % len(misspelled)]),
+        args.min_seconds,
+    )
+
+    # Full-text search: a few words from a record's name, fields, state and country
+    text_queries = []
+    for uni_id in lookup_ids[:200]:
+        uni = snapshot.universities[snapshot.id_positions[uni_id]]
+        words = " ".join([uni["name"], *uni.get("fields", []), uni.get("state") or "", uni.get("country") or ""]).split()
+        text_queries.append(" ".join(rng.sample(words, min(len(words), rng.randint(1, 3)))))
+    result["text_search"] = measure(
+        lambda i: service.search_universities_by_text(text_queries[i % len(text_queries)]),
+        args.min_seconds,
+    )
+    result["similar"] = measure(
+        lambda i: service.get_similar_universities(lookup_ids[i % len(lookup_ids)]),
+        args.min_seconds,
+    )
+
+    if args.check:
+        result["parity"] = check_parity(service, profiles[:5], args.check_rows)
+
+    del service, snapshot, ids
+    gc.collect()
+
+    # Compiled (memory-mapped) catalog: build time and load time
+    started = time.perf_counter()
+    compile_catalog(json_path)
+    result["compile_seconds"] = round(time.perf_counter() - started, 4)
+    compiled_service, result["load_compiled"] = timed_load(json_path)
+    del compiled_service
+    compiled_path_for(json_path).unlink(missing_ok=True)
+    gc.collect()
+
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark UniversityService on synthetic catalogs")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated catalog sizes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profiles", type=int, default=50, help="Distinct recommendation profiles")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Minimum run time per measurement")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Where generated catalogs are kept")
+    parser.add_argument("--check", action="store_true", help="Also verify score_batch against score_university")
+    parser.add_argument("--check-rows", type=int, default=2000, help="Rows compared per profile with --check")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "settings": {
+            "seed": args.seed,
+            "profiles": args.profiles,
+            "min_seconds": args.min_seconds,
+        },
+        "results": [bench_size(int(size), args) for size in args.sizes.split(",") if size.strip()],
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    report = main()
+    if any(r.get("parity", {}).get("mismatches") for r in report["results"]):
+        sys.exit(1)
@@ -0,0 +1,108 @@
+"""
+Synthetic Catalog Generator
+Writes schema-valid universities.json files of any size for benchmarking
+
+Value distributions (countries, tiers, degrees, fields, exam requirements, costs)
+are sampled from the shipped catalog, so filters and scoring see realistic
+selectivity. Output is deterministic for a given seed and is streamed to disk,
+so 1M-row catalogs don't need to fit in memory twice.
+
+Usage:
+    python -m benchmarks.generate_catalog 100000 /tmp/universities_100k.json [--seed 42]
+"""
+from pathlib import Path
+from typing import Dict, Iterator, List
+import argparse
+import json
+import random
+
+SOURCE_CATALOG = Path(__file__).parent.parent / "data" / "universities.json"
+
+NAME_PREFIXES = ["North", "South", "East", "West", "Central", "Royal", "National", "Technical", "State", "Metropolitan"]
+NAME_ROOTS = ["Avon", "Brook", "Cedar", "Dale", "Elm", "Fair", "Glen", "Harbor", "Iron", "Lake",
+              "Maple", "Oak", "Pine", "River", "Stone", "Vale", "Wood", "Ash", "Bay", "Crest"]
+NAME_SUFFIXES = ["field", "ford", "ton", "wood", "bridge", "haven", "mouth", "port", "stead", "view"]
+NAME_PATTERNS = ["University of {place}", "{place} University", "{prefix} {place} University",
+                 "{place} Institute of Technology", "{prefix} University of {place}"]
+
+
+class _Distributions:
+    """Observed values from the shipped catalog, sampled with replacement"""
+
+    def __init__(self, catalog: List[Dict]):
+        self.locations = [(u.get("country"), u.get("state")) for u in catalog]
+        self.degrees = [u.get("degreesOffered", []) for u in catalog]
+        self.fields = sorted({f for u in catalog for f in u.get("fields", [])})
+        self.field_counts = [len(u.get("fields", [])) for u in catalog]
+        self.ranking_tiers = [u.get("rankingTier") for u in catalog]
+        self.academic = [u.get("academicRequirements", {}) for u in catalog]
+        self.exams = [u.get("examRequirements", {}) for u in catalog]
+        self.costs = [u.get("estimatedAnnualCostUSD", {}) for u in catalog]
+        self.budget_tiers = [u.get("budgetTier") for u in catalog]
+        self.difficulties = [u.get("acceptanceDifficulty") for u in catalog]
+        self.intakes = [u.get("intakeYears", []) for u in catalog]
+        self.meta = [u.get("meta", {}) for u in catalog]
+
+
+def _name(rng: random.Random, index: int) -> str:
+    place = rng.choice(NAME_ROOTS) + rng.choice(NAME_SUFFIXES)
+    pattern = rng.choice(NAME_PATTERNS)
+    # Index suffix keeps names unique at any catalog size
+    return f"{pattern.format(prefix=rng.choice(NAME_PREFIXES), place=place)} {index}"
+
+
+def generate_universities(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield count synthetic university records"""
+    with open(SOURCE_CATALOG, 'r', encoding='utf-8') as f:
+        dist = _Distributions(json.load(f))
+    rng = random.Random(seed)
+
+    for index in range(count):
+        country, state = rng.choice(dist.locations)
+        cost = dict(rng.choice(dist.costs))
+        if cost.get("tuition") is not None and cost.get("living") is not None:
+            # Jitter costs so budget filters don't see a handful of distinct values
+            cost["tuition"] = int(cost["tuition"] * rng.uniform(0.8, 1.2))
+            cost["living"] = int(cost["living"] * rng.uniform(0.9, 1.1))
+            cost["total"] = cost["tuition"] + cost["living"]
+
+        yield {
+            "id": f"syn{index + 1}",
+            "name": _name(rng, index + 1),
+            "website": f"https://www.syn{index + 1}.edu",
+            "country": country,
+            "state": state,
+            "degreesOffered": list(rng.choice(dist.degrees)),
+            "fields": rng.sample(dist.fields, rng.choice(dist.field_counts)),
+            "rankingTier": rng.choice(dist.ranking_tiers),
+            "academicRequirements": dict(rng.choice(dist.academic)),
+            "examRequirements": json.loads(json.dumps(rng.choice(dist.exams))),
+            "estimatedAnnualCostUSD": cost,
+            "budgetTier": rng.choice(dist.budget_tiers),
+            "acceptanceDifficulty": rng.choice(dist.difficulties),
+            "intakeYears": list(rng.choice(dist.intakes)),
+            "meta": dict(rng.choice(dist.meta)),
+        }
+
+
+def write_catalog(count: int, output: Path, seed: int = 42) -> Path:
+    """Stream a synthetic catalog to output as a JSON array"""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write("[\n")
+        for index, uni in enumerate(generate_universities(count, seed)):
+            if index:
+                f.write(",\n")
+            f.write(json.dumps(uni, ensure_ascii=False))
+        f.write("\n]\n")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic universities.json")
+    parser.add_argument("count", type=int, help="Number of universities")
+    parser.add_argument("output", type=Path, help="Output JSON path")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(write_catalog(args.count, args.output, args.seed))
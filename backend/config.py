@@ -34,3 +34,9 @@ if not GEMINI_API_KEY:
     )
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
+
+# Optional: shared secret for admin endpoints (e.g. catalog reload). Unset disables them.
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+# Optional: poll universities.json for changes every N seconds (0 disables hot reload)
+CATALOG_RELOAD_INTERVAL_SECONDS = float(os.getenv("CATALOG_RELOAD_INTERVAL_SECONDS", "0"))
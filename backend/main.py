@@ -3,13 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
-from config import FRONTEND_URL
+from config import FRONTEND_URL, CATALOG_RELOAD_INTERVAL_SECONDS
 from routes import onboarding
 from routes import universities
 from routes import ai_counsellor
 from routes import todos
 from routes import users
 from database import Base, engine
+from services.university_service import university_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Catalog revalidation and NDJSON stream summaries
+    expose_headers=[
+        "ETag",
+        "X-Total-Count",
+        "X-Next-Cursor",
+        "X-Dream-Count",
+        "X-Target-Count",
+        "X-Safe-Count",
+    ],
 )
 
 # Custom exception handler for validation errors
@@ -65,6 +75,17 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": formatted_errors}
     )
 
+@app.on_event("startup")
+async def start_catalog_watcher():
+    # Hot-reload universities.json without restarting the worker
+    university_service.start_reload_watcher(CATALOG_RELOAD_INTERVAL_SECONDS)
+
+
+@app.on_event("shutdown")
+async def stop_catalog_watcher():
+    university_service.stop_reload_watcher()
+
+
 # Routes
 app.include_router(onboarding.router)
 app.include_router(universities.router)
@@ -6,6 +6,7 @@ from database import get_db
 from models import User, Onboarding, Shortlist, Todo, Application
 from services.ai_counsellor_service import ai_counsellor_service
 from services.university_service import university_service
+from services.user_profile import UserProfile, get_user_profile
 from auth import get_current_user
 import logging
 
@@ -40,6 +41,28 @@ def execute_tool_call(
             limit = arguments.get("limit", 5)
             return get_recommended_universities_tool(user, db, limit)
 
+        elif tool_name == "search_universities":
+            query = arguments.get("query", "")
+            limit = arguments.get("limit", 5)
+            return search_universities_tool(query, limit)
+
+        elif tool_name == "get_pareto_universities":
+            return get_pareto_universities_tool(
+                user,
+                db,
+                category=arguments.get("category"),
+                layers=arguments.get("layers", 1),
+            )
+
+        elif tool_name == "find_similar_universities":
+            return find_similar_universities_tool(
+                university_id=arguments.get("university_id"),
+                university_name=arguments.get("university_name"),
+                cheaper=bool(arguments.get("cheaper", False)),
+                country=arguments.get("country"),
+                limit=arguments.get("limit", 5),
+            )
+
         elif tool_name == "shortlist_university":
             university_id = arguments.get("university_id")
             university_name = arguments.get("university_name")
@@ -113,59 +136,143 @@ def get_recommended_universities_tool(user: User, db: Session, limit: int = 5) -
     if not onboarding:
         return {"error": "Profile not found"}
 
-    # Parse user data
-    preferred_countries = []
-    if onboarding.preferred_countries:
-        preferred_countries = [c.strip() for c in onboarding.preferred_countries.split(",")]
-
-    budget_max = None
-    if onboarding.budget_range:
-        try:
-            budget_str = onboarding.budget_range.split("-")[-1].strip()
-            budget_max = float(budget_str.replace("$", "").replace(",", ""))
-        except:
-            pass
-
-    user_gpa = None
-    if onboarding.gpa:
-        try:
-            user_gpa = float(onboarding.gpa)
-        except:
-            pass
-
-    # Get recommendations
+    # Same parsed profile as the /recommended route
     recommendations = university_service.get_recommended_universities(
-        target_degree=onboarding.target_degree,
-        field_of_study=onboarding.field_of_study,
-        preferred_countries=preferred_countries,
-        budget_max=budget_max,
-        target_intake_year=onboarding.target_intake_year,
-        user_gpa=user_gpa,
+        **get_user_profile(onboarding).recommendation_kwargs(),
+        limit=limit,
     )
 
-    # Limit results
+    # Plain dicts: tool results end up in the ChatResponse model
     return {
-        "dream": recommendations["dream"][:limit],
-        "target": recommendations["target"][:limit],
-        "safe": recommendations["safe"][:limit],
+        "dream": [uni.to_dict() for uni in recommendations["dream"]],
+        "target": [uni.to_dict() for uni in recommendations["target"]],
+        "safe": [uni.to_dict() for uni in recommendations["safe"]],
     }
 
 
+def get_pareto_universities_tool(user: User, db: Session, category: str = None, layers: int = 1) -> Dict:
+    """Best cost / ranking / match-score trade-offs among the user's recommendations"""
+    onboarding = db.query(Onboarding).filter(Onboarding.user_id == user.id).first()
+    if not onboarding:
+        return {"error": "Profile not found"}
+    layers = max(1, min(int(layers or 1), 3))
+
+    frontier = university_service.get_pareto_frontier(
+        **get_user_profile(onboarding).recommendation_kwargs(),
+        category=category.lower() if category else None,
+        layers=layers,
+    )
+    return {
+        "candidates": frontier["candidates"],
+        "universities": [
+            {
+                "id": uni.get("university_id"),
+                "name": uni.get("university_name"),
+                "country": uni.get("country"),
+                "ranking_tier": uni.get("rankingTier"),
+                "estimated_total_cost_usd": uni.get("estimated_total_cost_usd"),
+                "match_score": uni["match_score"],
+                "category": uni["category"],
+                "layer": uni["pareto_layer"],
+            }
+            for layer in frontier["layers"]
+            for uni in layer
+        ],
+    }
+
+
+def search_universities_tool(query: str, limit: int = 5) -> Dict:
+    """Full-text search of the university catalog (names, fields, states, countries)"""
+    if not query or not query.strip():
+        return {"error": "Search query is empty"}
+    limit = max(1, min(int(limit or 5), 20))
+
+    universities = university_service.search_universities_by_text(query, limit=limit)
+    return {
+        "query": query,
+        "count": len(universities),
+        "universities": [
+            {
+                "id": uni.get("id"),
+                "name": uni.get("name"),
+                "country": uni.get("country"),
+                "state": uni.get("state"),
+                "fields": list(uni.get("fields") or []),
+                "ranking_tier": uni.get("rankingTier"),
+                "search_score": uni["search_score"],
+            }
+            for uni in universities
+        ],
+    }
+
+
+def find_similar_universities_tool(
+    university_id: str = None,
+    university_name: str = None,
+    cheaper: bool = False,
+    country: str = None,
+    limit: int = 5,
+) -> Dict:
+    """Universities like a given one (e.g. "like Stanford but cheaper")"""
+    if university_name and not university_id:
+        resolved = university_service.resolve_university_name(university_name)
+        university_id = resolved["university_id"]
+        if not university_id:
+            return {"error": f"University '{university_name}' not found.{_did_you_mean(resolved)}"}
+    limit = max(1, min(int(limit or 5), 20))
+
+    reference = university_service.get_university_by_id(university_id) if university_id else None
+    if not reference:
+        return {"error": "University not found"}
+    similar = university_service.get_similar_universities(
+        university_id,
+        limit=limit,
+        cheaper=cheaper,
+        preferred_countries=[c.strip() for c in country.split(",")] if country else None,
+    )
+    return {
+        "reference": {
+            "id": university_id,
+            "name": reference.get("name"),
+            "country": reference.get("country"),
+            "estimated_total_cost_usd": reference.get("estimated_total_cost_usd"),
+        },
+        "count": len(similar),
+        "universities": [
+            {
+                "id": uni.get("id"),
+                "name": uni.get("name"),
+                "country": uni.get("country"),
+                "ranking_tier": uni.get("rankingTier"),
+                "estimated_total_cost_usd": uni.get("estimated_total_cost_usd"),
+                "cost_difference_usd": uni["cost_difference_usd"],
+                "shared_fields": list(uni["shared_fields"]),
+                "similarity": uni["similarity"],
+            }
+            for uni in similar
+        ],
+    }
+
+
+def _did_you_mean(resolved: Dict) -> str:
+    """Suggestion suffix for tool errors when a name was ambiguous or misspelled"""
+    names = [c["name"] for c in resolved["candidates"][:3]]
+    if not names:
+        return ""
+    return f" Did you mean: {', '.join(names)}?"
+
+
 def shortlist_university_tool(user: User, db: Session, university_id: str = None, university_name: str = None) -> Dict:
     """Shortlist a university by ID or name"""
     try:
         # If name provided but no ID, search for the university by name
         if university_name and not university_id:
-            all_universities = university_service.get_all_universities()
-            university = None
-            for uni in all_universities:
-                if uni.get("name", "").lower() == university_name.lower():
-                    university_id = uni.get("id")
-                    university = uni
-                    break
+            resolved = university_service.resolve_university_name(university_name)
+            university_id = resolved["university_id"]
+            university = university_service.get_university_by_id(university_id) if university_id else None
 
             if not university:
-                return {"error": f"University '{university_name}' not found. Please check the spelling or ask for recommendations first."}
+                return {"error": f"University '{university_name}' not found.{_did_you_mean(resolved)} Please check the spelling or ask for recommendations first."}
         else:
             # Check if university exists by ID
             university = university_service.get_university_by_id(university_id)
@@ -185,62 +292,11 @@ def shortlist_university_tool(user: User, db: Session, university_id: str = None
                 "university_name": university.get("university_name"),
             }
 
-        # Get user's onboarding data to calculate match score
+        # Score against the user's onboarding profile (all values unknown without one)
         onboarding = db.query(Onboarding).filter(Onboarding.user_id == user.id).first()
-        
-        # Extract user scores for matching
-        user_gpa = None
-        user_gre = None
-        user_gmat = None
-        user_ielts = None
-        user_toefl = None
-        user_budget = None
-        user_countries = None
-        
-        if onboarding:
-            # Parse GPA
-            if onboarding.gpa and onboarding.gpa != "Not Applicable":
-                try:
-                    import re
-                    numbers = re.findall(r'\d+\.?\d*', onboarding.gpa)
-                    if numbers:
-                        user_gpa = float(numbers[0])
-                except (ValueError, TypeError):
-                    pass
-            
-            # Parse exam scores
-            user_gre = None
-            if onboarding.gre_quant_score and onboarding.gre_verbal_score:
-                user_gre = onboarding.gre_quant_score + onboarding.gre_verbal_score
-            
-            user_gmat = onboarding.gmat_score
-            user_ielts = onboarding.ielts_score
-            user_toefl = onboarding.toefl_score
-            
-            # Parse budget
-            if onboarding.budget_range:
-                try:
-                    budget_str = onboarding.budget_range.split("-")[-1].strip()
-                    user_budget = float(budget_str.replace("$", "").replace(",", ""))
-                except (ValueError, AttributeError, IndexError):
-                    pass
-            
-            # Parse countries
-            if onboarding.preferred_countries:
-                user_countries = [c.strip() for c in onboarding.preferred_countries.split(",")]
-        
-        # Score the university
-        scored_university = university_service.score_university(
-            university,
-            user_gpa=user_gpa,
-            user_gre=user_gre,
-            user_gmat=user_gmat,
-            user_ielts=user_ielts,
-            user_toefl=user_toefl,
-            user_budget=user_budget,
-            user_countries=user_countries,
-        )
-        
+        profile = get_user_profile(onboarding) if onboarding else UserProfile()
+        scored_university = university_service.score_university(university, **profile.scoring_kwargs())
+
         match_score = scored_university.get("match_score", 0)
         category = scored_university.get("category", "Target")
 
@@ -284,14 +340,13 @@ def lock_university_tool(user: User, db: Session, university_id: str = None, uni
         # If name provided but no ID, find it in the user's shortlist
         if university_name and not university_id:
             shortlisted = db.query(Shortlist).filter(Shortlist.user_id == user.id).all()
-            for sl in shortlisted:
-                uni = university_service.get_university_by_id(sl.university_id)
-                if uni and uni.get("university_name", "").lower() == university_name.lower():
-                    university_id = sl.university_id
-                    break
+            resolved = university_service.resolve_university_name(
+                university_name, [sl.university_id for sl in shortlisted]
+            )
+            university_id = resolved["university_id"]
 
             if not university_id:
-                return {"error": f"'{university_name}' not found in your shortlist. Please shortlist it first."}
+                return {"error": f"'{university_name}' not found in your shortlist.{_did_you_mean(resolved)} Please shortlist it first."}
 
         shortlist = db.query(Shortlist).filter(
             Shortlist.user_id == user.id,
@@ -461,9 +516,13 @@ def get_shortlisted_universities_tool(user: User, db: Session) -> Dict:
     """Get user's shortlisted universities"""
     shortlist_entries = db.query(Shortlist).filter(Shortlist.user_id == user.id).all()
 
+    universities_by_id = university_service.get_universities_by_ids(
+        [entry.university_id for entry in shortlist_entries]
+    )
+
     universities = []
     for entry in shortlist_entries:
-        uni = university_service.get_university_by_id(entry.university_id)
+        uni = universities_by_id.get(entry.university_id)
         if uni:
             universities.append({
                 "id": entry.university_id,
@@ -545,16 +604,14 @@ def remove_from_shortlist_tool(user: User, db: Session, university_id: str = Non
         # If name provided but no ID, find it in the user's shortlist
         if university_name and not university_id:
             shortlisted = db.query(Shortlist).filter(Shortlist.user_id == user.id).all()
-            shortlist_entry = None
-            for sl in shortlisted:
-                uni = university_service.get_university_by_id(sl.university_id)
-                if uni and uni.get("university_name", "").lower() == university_name.lower():
-                    university_id = sl.university_id
-                    shortlist_entry = sl
-                    break
+            resolved = university_service.resolve_university_name(
+                university_name, [sl.university_id for sl in shortlisted]
+            )
+            university_id = resolved["university_id"]
+            shortlist_entry = next((sl for sl in shortlisted if sl.university_id == university_id), None)
 
             if not shortlist_entry:
-                return {"error": f"'{university_name}' not found in your shortlist."}
+                return {"error": f"'{university_name}' not found in your shortlist.{_did_you_mean(resolved)}"}
         else:
             shortlist_entry = db.query(Shortlist).filter(
                 Shortlist.user_id == user.id,
@@ -591,16 +648,14 @@ def unlock_university_tool(user: User, db: Session, university_id: str = None, u
         # If name provided but no ID, find it in the user's shortlist
         if university_name and not university_id:
             shortlisted = db.query(Shortlist).filter(Shortlist.user_id == user.id).all()
-            shortlist_entry = None
-            for sl in shortlisted:
-                uni = university_service.get_university_by_id(sl.university_id)
-                if uni and uni.get("university_name", "").lower() == university_name.lower():
-                    university_id = sl.university_id
-                    shortlist_entry = sl
-                    break
+            resolved = university_service.resolve_university_name(
+                university_name, [sl.university_id for sl in shortlisted]
+            )
+            university_id = resolved["university_id"]
+            shortlist_entry = next((sl for sl in shortlisted if sl.university_id == university_id), None)
 
             if not shortlist_entry:
-                return {"error": f"'{university_name}' not found in your shortlist."}
+                return {"error": f"'{university_name}' not found in your shortlist.{_did_you_mean(resolved)}"}
         else:
             shortlist_entry = db.query(Shortlist).filter(
                 Shortlist.user_id == user.id,
@@ -787,6 +842,25 @@ async def chat_with_counsellor(
                             tool_results_text += f"\n{category.upper()} Schools:\n"
                             for uni in result[category]:
                                 tool_results_text += f"- {uni.get('university_name')} ({uni.get('country')})\n"
+                elif tool_name == "search_universities":
+                    tool_results_text += f"Search results for '{result.get('query')}': {result.get('count', 0)}\n"
+                    for uni in result.get('universities', []):
+                        tool_results_text += f"- {uni.get('name')} ({uni.get('country')}) [ID: {uni.get('id')}]\n"
+                elif tool_name == "get_pareto_universities":
+                    if result.get("error"):
+                        tool_results_text += f"Error: {result.get('error')}\n"
+                    else:
+                        tool_results_text += f"Best trade-offs (cost / ranking / match) among {result.get('candidates')} universities:\n"
+                        for uni in result.get('universities', []):
+                            tool_results_text += f"- {uni.get('name')} ({uni.get('country')}): ${uni.get('estimated_total_cost_usd'):,}/year, {uni.get('ranking_tier')}, match {uni.get('match_score')}/100 ({uni.get('category')})\n"
+                elif tool_name == "find_similar_universities":
+                    if result.get("error"):
+                        tool_results_text += f"Error: {result.get('error')}\n"
+                    else:
+                        reference = result.get("reference", {})
+                        tool_results_text += f"Universities similar to {reference.get('name')}:\n"
+                        for uni in result.get('universities', []):
+                            tool_results_text += f"- {uni.get('name')} ({uni.get('country')}), ${uni.get('estimated_total_cost_usd'):,}/year ({uni.get('cost_difference_usd'):+,} vs {reference.get('name')})\n"
                 elif tool_name == "get_shortlisted_universities":
                     tool_results_text += f"Shortlisted Universities: {len(result.get('universities', []))}\n"
                     for uni in result.get('universities', []):
@@ -1,17 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Header, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 from database import get_db
 from models import User, Onboarding, Shortlist, Todo
-from services.university_service import university_service
+from services.university_service import MAX_PARETO_LAYERS, university_service
+from services.user_profile import UserProfile, get_user_profile, user_profiles
+from services.university_view import dumps
+from services.catalog_responses import EncodedBody, etag_matches, negotiate_encoding, response_cache
+from services import shortlist_rescoring
 from auth import get_current_user
+from config import ADMIN_API_KEY
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/universities", tags=["universities"])
 
+# Opt-in streaming: one JSON document per line, sent in chunks of this many lines
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_CHUNK_LINES = 64
+
+# Scenarios per what-if request
+MAX_WHAT_IF_SCENARIOS = 20
+
+# Universities per comparison request
+MAX_COMPARE_UNIVERSITIES = 20
+
+
+class UniversityJSONResponse(JSONResponse):
+    """
+    JSON response that serializes university views directly
+    Returned from routes instead of a dict, so FastAPI doesn't re-encode (copy) every record
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def catalog_response(
+    request: Request,
+    key: tuple,
+    build: Callable[[], Dict],
+    etag_suffix: str = "",
+    cache_control: str = "public, no-cache",
+) -> Response:
+    """
+    JSON response for catalog-level data, encoded once per catalog version
+    The ETag is the catalog version (plus etag_suffix for per-user fields), so a
+    matching If-None-Match gets 304 and a cache hit costs a dictionary lookup
+    """
+    version = university_service.catalog_version
+    etag = f'W/"{version}{etag_suffix}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(key, version)
+    cached_bytes = 0 if body is None else body.nbytes
+    if body is None:
+        body = EncodedBody(dumps(build()))
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    content = body.variant(encoding)
+    # A new body, or a new compressed variant of a cached one, is (re)charged to the cache
+    if body.nbytes != cached_bytes:
+        response_cache.put(key, version, body)
+    if content is not body.identity:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[tuple]:
+    """Top-level fields of a projection, in the order asked without repeats (None for everything)"""
+    keys = tuple(dict.fromkeys(key.strip() for key in fields.split(",") if key.strip())) if fields else ()
+    return keys or None
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True if the client asked for a streamed NDJSON response"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(items: Iterable, headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """
+    Stream items as NDJSON while they are produced
+    Summary values (counts, cursors) go in headers since every line is one item
+    """
+    def lines():
+        chunk = []
+        for item in items:
+            chunk.append(dumps(item))
+            if len(chunk) == NDJSON_CHUNK_LINES:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
 
 class ShortlistRequest(BaseModel):
     """Request body for adding to shortlist"""
@@ -19,31 +107,215 @@ class ShortlistRequest(BaseModel):
     category: Optional[str] = "Target"
 
 
+class WhatIfProfile(BaseModel):
+    """Profile values for a what-if request (unset fields keep the saved onboarding value)"""
+    gpa: Optional[float] = Field(None, ge=0, le=10, description="GPA")
+    gre: Optional[int] = Field(None, ge=260, le=340, description="Combined GRE quant + verbal")
+    gmat: Optional[int] = Field(None, ge=200, le=800, description="GMAT total")
+    ielts: Optional[float] = Field(None, ge=0, le=9, description="IELTS band")
+    toefl: Optional[int] = Field(None, ge=0, le=120, description="TOEFL iBT total")
+    budget_max: Optional[float] = Field(None, gt=0, description="Maximum estimated annual cost (USD)")
+    preferred_countries: Optional[List[str]] = Field(None, description="Preferred countries")
+
+
+class WhatIfScenario(WhatIfProfile):
+    name: Optional[str] = Field(None, max_length=100, description="Label echoed in the response")
+
+
+class WhatIfRequest(BaseModel):
+    """Request body for what-if recommendations"""
+    base: Optional[WhatIfProfile] = None
+    scenarios: List[WhatIfScenario] = Field(..., min_length=1, max_length=MAX_WHAT_IF_SCENARIOS)
+    limit: int = Field(10, ge=0, le=100, description="Moved universities listed per scenario")
+
+
+# What-if field -> recommendation profile argument
+WHAT_IF_FIELDS = {
+    "gpa": "user_gpa",
+    "gre": "user_gre",
+    "gmat": "user_gmat",
+    "ielts": "user_ielts",
+    "toefl": "user_toefl",
+    "budget_max": "budget_max",
+    "preferred_countries": "preferred_countries",
+}
+
+
 @router.get("/all")
-async def get_all_universities():
-    """Get all universities (no filtering)"""
-    try:
-        universities = university_service.get_all_universities()
+async def get_all_universities(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Universities per page (default: all)"),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return, e.g. id,name,country"),
+    country: Optional[List[str]] = Query(None, description="Only these countries (repeatable)"),
+    degree: Optional[str] = Query(None, description="Only universities offering this degree"),
+    budget_max: Optional[float] = Query(None, gt=0, description="Maximum estimated annual cost (USD)"),
+    intake_year: Optional[int] = Query(None, description="Only universities with this intake year"),
+):
+    """
+    Get all universities, optionally filtered, paginated and projected
+    Pages are in catalog order; pass next_cursor back as cursor until it is null
+    """
+    keys = parse_fields(fields)
+
+    def fetch_page() -> Dict:
+        return university_service.list_universities(
+            target_degree=degree,
+            preferred_countries=country,
+            budget_max=budget_max,
+            target_intake_year=intake_year,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    def build_page() -> Dict:
+        page = fetch_page()
+        universities = page["universities"]
+        if keys:
+            universities = [uni.project(keys) for uni in universities]
+
         return {
             "status": "success",
             "count": len(universities),
-            "universities": universities
+            "universities": universities,
+            "total_count": page["total_count"],
+            "next_cursor": page["next_cursor"],
         }
+
+    try:
+        # A bad cursor is a 400 even when If-None-Match matches the catalog version
+        after = university_service.cursor_position(cursor)
+        if wants_ndjson(request):
+            page = fetch_page()
+            universities = page["universities"]
+            if keys:
+                universities = (uni.project(keys) for uni in universities)
+            headers = {"X-Total-Count": str(page["total_count"])}
+            if page["next_cursor"]:
+                headers["X-Next-Cursor"] = page["next_cursor"]
+            return ndjson_response(universities, headers)
+
+        key = ("all", after, limit, keys, tuple(country) if country else None, degree, budget_max, intake_year)
+        return catalog_response(request, key, build_page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching universities: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/search")
+async def search_universities(
+    request: Request,
+    country: Optional[List[str]] = Query(None, description="Countries (repeatable, any of)"),
+    budget_tier: Optional[List[str]] = Query(None, description="Budget tiers (repeatable, any of)"),
+    ranking_tier: Optional[List[str]] = Query(None, description="Ranking tiers (repeatable, any of)"),
+    acceptance_difficulty: Optional[List[str]] = Query(None, description="Acceptance difficulties (repeatable, any of)"),
+    degree: Optional[List[str]] = Query(None, description="Degrees offered (repeatable, any of)"),
+    visa_difficulty: Optional[List[str]] = Query(None, description="Visa difficulties (repeatable, any of)"),
+    budget_max: Optional[float] = Query(None, gt=0, description="Maximum estimated annual cost (USD)"),
+    intake_year: Optional[int] = Query(None, description="Only universities with this intake year"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Universities per page (default: all)"),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return, e.g. id,name,country"),
+):
+    """
+    Search universities by facet values, with counts per value for the current filters
+    Each facet's counts apply all other filters, so selected facets still show their alternatives
+    """
+    keys = parse_fields(fields)
+    facets = {
+        "country": country,
+        "budgetTier": budget_tier,
+        "rankingTier": ranking_tier,
+        "acceptanceDifficulty": acceptance_difficulty,
+        "degree": degree,
+        "visaDifficulty": visa_difficulty,
+    }
+
+    def build_page() -> Dict:
+        page = university_service.search_universities(
+            facets={facet: values for facet, values in facets.items() if values},
+            budget_max=budget_max,
+            target_intake_year=intake_year,
+            cursor=cursor,
+            limit=limit,
+        )
+        universities = page["universities"]
+        if keys:
+            universities = [uni.project(keys) for uni in universities]
+
+        return {
+            "status": "success",
+            "count": len(universities),
+            "universities": universities,
+            "total_count": page["total_count"],
+            "next_cursor": page["next_cursor"],
+            "facets": page["facets"],
+        }
+
+    try:
+        # A bad cursor is a 400 even when If-None-Match matches the catalog version
+        after = university_service.cursor_position(cursor)
+        key = (
+            "search", after, limit, keys, budget_max, intake_year,
+            *(tuple(values) if values else None for values in facets.values()),
+        )
+        return catalog_response(request, key, build_page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching universities: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search/text")
+async def search_universities_by_text(
+    q: str = Query(..., min_length=1, max_length=200, description="Free text, e.g. 'data science germany'"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum universities to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return, e.g. id,name,search_score"),
+):
+    """
+    Full-text search over university names, fields of study, states and countries
+    Results are ranked by relevance (BM25), best first, with their search_score
+    """
+    try:
+        universities = university_service.search_universities_by_text(q, limit=limit)
+        keys = parse_fields(fields)
+        if keys:
+            universities = [uni.project(keys) for uni in universities]
+
+        return UniversityJSONResponse({
+            "status": "success",
+            "query": q,
+            "count": len(universities),
+            "universities": universities,
+        })
+    except Exception as e:
+        logger.error(f"Error searching universities by text: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/recommended")
 async def get_recommended_universities(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum universities per list"),
+    category: Optional[str] = Query(None, description="Only return one category: dream, target or safe"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Get recommended universities based on user's onboarding profile
-    Returns universities categorized as Dream/Target/Safe
+    Returns universities categorized as Dream/Target/Safe, or with
+    Accept: application/x-ndjson one university per line (the "all" list, best first)
     """
     try:
+        if category and category.lower() not in ("dream", "target", "safe"):
+            raise HTTPException(
+                status_code=400,
+                detail="category must be one of: dream, target, safe"
+            )
+
         clerk_user_id = current_user["clerk_user_id"]
 
         # Get user from database
@@ -66,95 +338,61 @@ async def get_recommended_universities(
                 detail="Please complete onboarding first"
             )
 
-        # Parse user data
-        preferred_countries = []
-        if onboarding.preferred_countries:
-            preferred_countries = [
-                c.strip()
-                for c in onboarding.preferred_countries.split(",")
-            ]
-
-        # Parse budget
-        budget_max = None
-        if onboarding.budget_range:
-            # Extract max from range like "$40,000 - $60,000"
-            try:
-                budget_str = onboarding.budget_range.split("-")[-1].strip()
-                budget_max = float(budget_str.replace("$", "").replace(",", ""))
-            except (ValueError, AttributeError, IndexError) as e:
-                logger.warning(f"Could not parse budget range: {onboarding.budget_range}, error: {e}")
-                budget_max = None
-
-        # Parse GPA - handle string ranges like "Above 3.7 / 90%+"
-        user_gpa = None
-        if onboarding.gpa and onboarding.gpa != "Not Applicable":
-            try:
-                # Try to extract numeric value from string
-                if isinstance(onboarding.gpa, str):
-                    # Handle ranges like "Above 3.7 / 90%+" or "3.5 - 3.7 / 85-90%"
-                    import re
-                    numbers = re.findall(r'\d+\.?\d*', onboarding.gpa)
-                    if numbers:
-                        # Take the first number as representative GPA
-                        user_gpa = float(numbers[0])
-                else:
-                    user_gpa = float(onboarding.gpa)
-            except (ValueError, TypeError, AttributeError) as e:
-                logger.warning(f"Could not parse GPA: {onboarding.gpa}, error: {e}")
-                user_gpa = None
-
-        # Extract exam scores from onboarding
-        user_gre = None
-        user_gmat = None
-        user_ielts = None
-        user_toefl = None
-
-        # GRE: Calculate combined score if both sections available
-        if onboarding.gre_quant_score and onboarding.gre_verbal_score:
-            user_gre = onboarding.gre_quant_score + onboarding.gre_verbal_score
-
-        if onboarding.gmat_score:
-            user_gmat = onboarding.gmat_score
-
-        if onboarding.ielts_score:
-            user_ielts = onboarding.ielts_score
-
-        if onboarding.toefl_score:
-            user_toefl = onboarding.toefl_score
-
-        # Get recommendations
-        recommendations = university_service.get_recommended_universities(
-            target_degree=onboarding.target_degree,
-            field_of_study=onboarding.field_of_study,
-            preferred_countries=preferred_countries,
-            budget_max=budget_max,
-            target_intake_year=onboarding.target_intake_year,
-            user_gpa=user_gpa,
-            user_gre=user_gre,
-            user_gmat=user_gmat,
-            user_ielts=user_ielts,
-            user_toefl=user_toefl,
-        )
+        # Parsed once per saved onboarding and shared with the counsellor's tools
+        request_profile = {
+            **get_user_profile(onboarding).recommendation_kwargs(),
+            "limit": limit,
+            "category": category,
+        }
 
         # Get user's shortlisted universities
         shortlisted = db.query(Shortlist).filter(Shortlist.user_id == user.id).all()
         shortlisted_ids = {s.university_id for s in shortlisted}
         locked_ids = {s.university_id for s in shortlisted if s.locked}
 
-        # Add shortlist status to each university
-        for category in ["dream", "target", "safe", "all"]:
-            for uni in recommendations[category]:
-                uni["is_shortlisted"] = uni["university_id"] in shortlisted_ids
-                uni["is_locked"] = uni["university_id"] in locked_ids
+        if wants_ndjson(request):
+            # Each entry once, with its category; scored and serialized as the client reads
+            stream = university_service.stream_recommended_universities(**request_profile)
+            counts = stream["counts"]
+            return ndjson_response(
+                (
+                    uni.layer(
+                        is_shortlisted=uni["university_id"] in shortlisted_ids,
+                        is_locked=uni["university_id"] in locked_ids,
+                    )
+                    for uni in stream["universities"]
+                ),
+                headers={
+                    "X-Total-Count": str(counts["all"]),
+                    "X-Dream-Count": str(counts["dream"]),
+                    "X-Target-Count": str(counts["target"]),
+                    "X-Safe-Count": str(counts["safe"]),
+                },
+            )
 
-        return {
+        recommendations = university_service.get_recommended_universities(**request_profile)
+        counts = recommendations["counts"]
+
+        # Layer shortlist status over the views - the service result is cached and shared
+        overlaid = {}
+        for list_name in ["dream", "target", "safe", "all"]:
+            overlaid[list_name] = [
+                uni.layer(
+                    is_shortlisted=uni["university_id"] in shortlisted_ids,
+                    is_locked=uni["university_id"] in locked_ids,
+                )
+                for uni in recommendations[list_name]
+            ]
+        recommendations = overlaid
+
+        return UniversityJSONResponse({
             "status": "success",
             "recommendations": recommendations,
-            "total_count": len(recommendations["all"]),
-            "dream_count": len(recommendations["dream"]),
-            "target_count": len(recommendations["target"]),
-            "safe_count": len(recommendations["safe"]),
-        }
+            "total_count": counts["all"],
+            "dream_count": counts["dream"],
+            "target_count": counts["target"],
+            "safe_count": counts["safe"],
+        })
 
     except HTTPException:
         raise
@@ -163,9 +401,300 @@ async def get_recommended_universities(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/what-if")
+async def what_if_recommendations(
+    body: WhatIfRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    How the user's Dream/Target/Safe lists would change under hypothetical profiles
+    (e.g. a GRE of 325 or an IELTS of 7.5). The saved onboarding profile, with base
+    applied on top, is compared with each scenario; nothing is written.
+    """
+    try:
+        clerk_user_id = current_user["clerk_user_id"]
+
+        user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        onboarding = db.query(Onboarding).filter(Onboarding.user_id == user.id).first()
+        profile = get_user_profile(onboarding) if onboarding else UserProfile()
+
+        # Only fields the client sent count: an explicit null removes a value
+        def overrides(values: BaseModel) -> Dict:
+            return {
+                WHAT_IF_FIELDS[field]: value
+                for field, value in values.model_dump(exclude_unset=True).items()
+                if field in WHAT_IF_FIELDS
+            }
+
+        base = profile.recommendation_kwargs()
+        if body.base:
+            base.update(overrides(body.base))
+        scenarios = [overrides(scenario) for scenario in body.scenarios]
+
+        result = university_service.evaluate_scenarios(base, scenarios, limit=body.limit)
+        return {
+            "status": "success",
+            "base": {
+                "profile": {field: base[name] for field, name in WHAT_IF_FIELDS.items()},
+                **result["base"],
+            },
+            "scenarios": [
+                {
+                    "name": scenario.name or f"Scenario {i + 1}",
+                    "changes": scenario.model_dump(exclude_unset=True, exclude={"name"}),
+                    **scenario_result,
+                }
+                for i, (scenario, scenario_result) in enumerate(zip(body.scenarios, result["scenarios"]))
+            ],
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error evaluating what-if scenarios: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/pareto")
+async def get_pareto_universities(
+    category: Optional[str] = Query(None, description="Only one category: dream, target or safe"),
+    layers: int = Query(1, ge=1, le=MAX_PARETO_LAYERS, description="Successive frontiers to return"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Recommended universities that are not beaten on cost, ranking and match score at once
+    (the Pareto frontier of the user's candidates), cheapest first; layers > 1 adds the
+    next-best frontiers
+    """
+    try:
+        clerk_user_id = current_user["clerk_user_id"]
+
+        user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        onboarding = db.query(Onboarding).filter(Onboarding.user_id == user.id).first()
+        if not onboarding:
+            raise HTTPException(
+                status_code=404,
+                detail="Please complete onboarding first"
+            )
+
+        frontier = university_service.get_pareto_frontier(
+            **get_user_profile(onboarding).recommendation_kwargs(),
+            category=category,
+            layers=layers,
+        )
+        return UniversityJSONResponse({
+            "status": "success",
+            "candidates": frontier["candidates"],
+            "layers": frontier["layers"],
+            "count": sum(len(layer) for layer in frontier["layers"]),
+        })
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing Pareto frontier: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/compare")
+async def compare_universities(
+    ids: List[str] = Query(..., description="University IDs to compare (comma-separated or repeated)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Compare universities side by side, scored against the user's profile
+    Returns the scored universities in request order plus aligned comparison
+    columns (one value per university), in place of one detail request each
+    """
+    try:
+        university_ids = list(dict.fromkeys(
+            university_id.strip()
+            for value in ids
+            for university_id in value.split(",")
+            if university_id.strip()
+        ))
+        if not university_ids:
+            raise HTTPException(status_code=400, detail="ids must name at least one university")
+        if len(university_ids) > MAX_COMPARE_UNIVERSITIES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_COMPARE_UNIVERSITIES} universities can be compared at once"
+            )
+
+        clerk_user_id = current_user["clerk_user_id"]
+
+        user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        onboarding = db.query(Onboarding).filter(Onboarding.user_id == user.id).first()
+        profile = get_user_profile(onboarding) if onboarding else UserProfile()
+
+        comparison = university_service.compare_universities(university_ids, profile.scoring_kwargs())
+        if not comparison["universities"]:
+            raise HTTPException(status_code=404, detail="University not found")
+
+        # Shortlist state for all compared universities in one query
+        shortlisted = {
+            s.university_id: s
+            for s in db.query(Shortlist).filter(
+                Shortlist.user_id == user.id,
+                Shortlist.university_id.in_(university_ids)
+            ).all()
+        }
+        universities = [
+            uni.layer(
+                is_shortlisted=uni["university_id"] in shortlisted,
+                is_locked=bool(shortlisted[uni["university_id"]].locked) if uni["university_id"] in shortlisted else False,
+            )
+            for uni in comparison["universities"]
+        ]
+        columns = comparison["columns"]
+        columns["is_shortlisted"] = [uni["is_shortlisted"] for uni in universities]
+        columns["is_locked"] = [uni["is_locked"] for uni in universities]
+
+        return UniversityJSONResponse({
+            "status": "success",
+            "count": len(universities),
+            "columns": columns,
+            "universities": universities,
+            "missing": comparison["missing"],
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error comparing universities: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache/stats")
+async def get_recommendation_cache_stats():
+    """Get recommendation, catalog response and user profile cache hit/miss/eviction counters"""
+    return {
+        "status": "success",
+        "cache": university_service.get_cache_stats(),
+        "responses": response_cache.stats(),
+        "user_profiles": user_profiles.stats(),
+    }
+
+
+@router.post("/admin/reload")
+async def reload_catalog(x_admin_key: Optional[str] = Header(None)):
+    """
+    Reload universities.json without restarting the worker
+    A failed reload keeps serving the current catalog
+    """
+    if not ADMIN_API_KEY or x_admin_key != ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    result = university_service.load_universities()
+    if result.get("error"):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Catalog reload failed, still serving version {result['version']}: {result['error']}"
+        )
+
+    return {
+        "status": "success",
+        **result,
+    }
+
+
+@router.post("/admin/rescore-shortlists", status_code=202)
+async def rescore_shortlists(
+    background_tasks: BackgroundTasks,
+    workers: Optional[int] = Query(None, ge=0, le=64, description="Worker processes (0 = in the API process)"),
+    dry_run: bool = Query(False, description="Score and report without writing"),
+    x_admin_key: Optional[str] = Header(None),
+):
+    """
+    Re-score every user's shortlist against the current catalog in the background
+    Poll GET on the same path for the report
+    """
+    if not ADMIN_API_KEY or x_admin_key != ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if shortlist_rescoring.is_running():
+        raise HTTPException(status_code=409, detail="Shortlist rescoring is already running")
+
+    background_tasks.add_task(shortlist_rescoring.run_in_background, workers=workers, dry_run=dry_run)
+    return {
+        "status": "accepted",
+        "catalog_version": university_service.catalog_version,
+    }
+
+
+@router.get("/admin/rescore-shortlists")
+async def get_rescore_report(x_admin_key: Optional[str] = Header(None)):
+    """Report of the last (or current) shortlist rescoring run"""
+    if not ADMIN_API_KEY or x_admin_key != ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return {
+        "status": "success",
+        "running": shortlist_rescoring.is_running(),
+        "report": shortlist_rescoring.last_report,
+    }
+
+
+@router.get("/{university_id}/similar")
+async def get_similar_universities(
+    university_id: str,
+    request: Request,
+    limit: int = Query(10, ge=1, le=50, description="Maximum universities to return"),
+    cheaper: bool = Query(False, description="Only universities cheaper than this one"),
+    budget_max: Optional[float] = Query(None, gt=0, description="Maximum estimated annual cost (USD)"),
+    country: Optional[List[str]] = Query(None, description="Only these countries (repeatable)"),
+):
+    """
+    Universities most like this one (cost, ranking, difficulty, country, fields, exam thresholds)
+    Most similar first, each with similarity, shared_fields and cost_difference_usd
+    """
+    try:
+        if university_service.get_university_by_id(university_id) is None:
+            raise HTTPException(status_code=404, detail="University not found")
+
+        def build() -> Dict:
+            universities = university_service.get_similar_universities(
+                university_id,
+                limit=limit,
+                cheaper=cheaper,
+                budget_max=budget_max,
+                preferred_countries=country,
+            ) or []
+            return {
+                "status": "success",
+                "university_id": university_id,
+                "count": len(universities),
+                "universities": universities,
+            }
+
+        key = ("similar", university_id, limit, cheaper, budget_max, tuple(country) if country else None)
+        return catalog_response(request, key, build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding similar universities: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{university_id}")
 async def get_university_details(
     university_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -179,22 +708,28 @@ async def get_university_details(
         clerk_user_id = current_user["clerk_user_id"]
         user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
 
+        is_shortlisted = False
+        is_locked = False
         if user:
             shortlist = db.query(Shortlist).filter(
                 Shortlist.user_id == user.id,
                 Shortlist.university_id == university_id
             ).first()
 
-            university["is_shortlisted"] = shortlist is not None
-            university["is_locked"] = shortlist.locked if shortlist else False
-        else:
-            university["is_shortlisted"] = False
-            university["is_locked"] = False
+            is_shortlisted = shortlist is not None
+            is_locked = shortlist.locked if shortlist else False
 
-        return {
-            "status": "success",
-            "university": university
-        }
+        # Cached per shortlist state; the ETag changes with it as well as with the catalog
+        return catalog_response(
+            request,
+            ("university", university_id, is_shortlisted, is_locked),
+            lambda: {
+                "status": "success",
+                "university": university.layer(is_shortlisted=is_shortlisted, is_locked=is_locked),
+            },
+            etag_suffix=f"-{int(is_shortlisted)}{int(is_locked)}",
+            cache_control="private, no-cache",
+        )
 
     except HTTPException:
         raise
@@ -359,27 +894,33 @@ async def get_my_shortlist(
             Shortlist.user_id == user.id
         ).all()
 
-        # Fetch full university data for each shortlisted item
+        # Fetch full university data for all shortlisted items in one lookup
+        universities_by_id = university_service.get_universities_by_ids(
+            [entry.university_id for entry in shortlist_entries]
+        )
         shortlisted_universities = []
         for entry in shortlist_entries:
-            uni = university_service.get_university_by_id(entry.university_id)
+            uni = universities_by_id.get(entry.university_id)
             if uni:
-                uni["is_shortlisted"] = True
-                uni["is_locked"] = entry.locked
-                uni["shortlist_id"] = entry.id
-                uni["shortlisted_at"] = entry.created_at.isoformat()
+                # One layer per entry: the same university can appear twice in the shortlist
+                entry_fields = {
+                    "is_shortlisted": True,
+                    "is_locked": entry.locked,
+                    "shortlist_id": entry.id,
+                    "shortlisted_at": entry.created_at.isoformat(),
+                }
                 # Preserve match_score and category from Shortlist table
                 if entry.match_score is not None:
-                    uni["match_score"] = entry.match_score
+                    entry_fields["match_score"] = entry.match_score
                 if entry.category:
-                    uni["category"] = entry.category
-                shortlisted_universities.append(uni)
+                    entry_fields["category"] = entry.category
+                shortlisted_universities.append(uni.layer(**entry_fields))
 
-        return {
+        return UniversityJSONResponse({
             "status": "success",
             "count": len(shortlisted_universities),
             "shortlist": shortlisted_universities
-        }
+        })
 
     except HTTPException:
         raise
@@ -45,6 +45,71 @@ class AICounsellorService:
                             },
                         },
                     ),
+                    FunctionDeclaration(
+                        name="search_universities",
+                        description="Search the university catalog by free text: university name, field of study, state/city or country",
+                        parameters={
+                            "type": "OBJECT",
+                            "properties": {
+                                "query": {
+                                    "type": "STRING",
+                                    "description": "What to search for (e.g., 'data science germany', 'Imperial', 'robotics canada')",
+                                },
+                                "limit": {
+                                    "type": "INTEGER",
+                                    "description": "Maximum number of universities to return",
+                                }
+                            },
+                            "required": ["query"],
+                        },
+                    ),
+                    FunctionDeclaration(
+                        name="get_pareto_universities",
+                        description="Get the best trade-offs among the student's recommended universities: those no other option beats on cost, ranking and match score at once",
+                        parameters={
+                            "type": "OBJECT",
+                            "properties": {
+                                "category": {
+                                    "type": "STRING",
+                                    "description": "Optional: only Dream, Target or Safe universities",
+                                },
+                                "layers": {
+                                    "type": "INTEGER",
+                                    "description": "Optional: 1 for the best trade-offs only, up to 3 to include the next-best ones",
+                                }
+                            },
+                        },
+                    ),
+                    FunctionDeclaration(
+                        name="find_similar_universities",
+                        description="Find universities similar to a given one (cost, ranking, difficulty, country, fields), optionally only cheaper ones",
+                        parameters={
+                            "type": "OBJECT",
+                            "properties": {
+                                "university_name": {
+                                    "type": "STRING",
+                                    "description": "The university to compare with (e.g., 'Stanford', 'University of Toronto')",
+                                },
+                                "university_id": {
+                                    "type": "STRING",
+                                    "description": "Optional: The university ID if known",
+                                },
+                                "cheaper": {
+                                    "type": "BOOLEAN",
+                                    "description": "Only return universities cheaper than the given one",
+                                },
+                                "country": {
+                                    "type": "STRING",
+                                    "description": "Optional: only universities in these countries (comma-separated)",
+                                },
+                                "limit": {
+                                    "type": "INTEGER",
+                                    "description": "Maximum number of universities to return",
+                                }
+                            },
+                            "required": ["university_name"],
+                        },
+                    ),
                     FunctionDeclaration(
                         name="shortlist_university",
                         description="Add a university to the user's shortlist by name",
@@ -53,7 +118,7 @@ class AICounsellorService:
                             "properties": {
                                 "university_name": {
                                     "type": "STRING",
-                                    "description": "The university name (e.g., 'University of Melbourne', 'Stanford University')",
+                                    "description": "The university name, abbreviation or acronym (e.g., 'University of Melbourne', 'UCLA')",
                                 },
                                 "university_id": {
                                     "type": "STRING",
@@ -263,6 +328,21 @@ When a student asks you to DO something, you MUST call the tool immediately. DO
    - "show my tasks"
    - "what do I need to do"
 
+11. **search_universities** - Call when student asks about universities by name, field or place:
+   - "find universities for data science in Germany"
+   - "which universities offer robotics?"
+   - "is there a university called [name]?"
+
+12. **find_similar_universities** - Call when student asks for alternatives to a university:
+   - "something like Stanford but cheaper" → CALL find_similar_universities(university_name="Stanford", cheaper=true)
+   - "universities similar to [university]"
+   - "alternatives to [university] in Canada"
+
+13. **get_pareto_universities** - Call when student must trade off cost, ranking and fit:
+   - "which of my target schools are the best value?" → CALL get_pareto_universities(category="Target")
+   - "best options for cost vs ranking"
+   - "too many choices, which ones are actually worth it?"
+
 **RESPONSE RULES:**
 - NEVER say "I can do that" or "Would you like me to..." - JUST CALL THE TOOL
 - After tool execution, give 1-2 sentence confirmation
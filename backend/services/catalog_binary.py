@@ -0,0 +1,321 @@
+"""
+Compiled Catalog
+Binary, memory-mappable form of universities.json
+
+universities.json stays the source of truth. The compile step writes
+universities.bin next to it:
+
+    MAGIC (8 bytes) | header length (uint64, little endian) | header JSON | sections
+
+The header records the source file's size, mtime and content hash plus the
+offset, dtype and shape of every section. Sections are 8-byte aligned:
+- one fixed-width array per UniversityColumns column
+- one boolean mask matrix per inverted index (rows follow the header's key list)
+- one packed bitmap matrix per search facet (rows follow the header's facet keys)
+- the full-text index: one array per TextIndex postings array
+- string tables: university IDs (sorted, with their positions), names, full-text
+  terms and compact per-record JSON, each as an offsets array (uint64, count + 1
+  entries) plus a byte blob
+
+Opening maps the file read-only, so every worker on a host shares one page-cache
+copy. Columns, masks and postings are used in place; strings and records are
+decoded on access and IDs are binary searched in their table, so a worker's own
+memory doesn't grow with the catalog.
+
+Usage:
+    python -m services.catalog_binary [universities.json] [universities.bin]
+"""
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import json
+import logging
+import mmap
+import struct
+import sys
+import numpy as np
+from services.field_taxonomy import FieldTaxonomy
+from services.university_catalog import CatalogSnapshot, build_indexes
+from services.university_columns import COLUMN_NAMES, UniversityColumns
+from services.university_facets import FacetIndex
+from services.university_search import POSTINGS_NAMES, TextIndex
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"EDUCAT06"
+INDEX_NAMES = ["degree_index", "country_index", "intake_index", "field_index"]
+
+# Decoded records kept per snapshot; older ones are decoded again on demand
+RECORD_CACHE_SIZE = 4096
+
+
+def compiled_path_for(json_path: Path) -> Path:
+    """Default location of the compiled catalog for a JSON source"""
+    return Path(json_path).with_suffix(".bin")
+
+
+def compile_catalog(json_path: Path, bin_path: Optional[Path] = None) -> Path:
+    """Compile universities.json into the binary format; returns the output path"""
+    json_path = Path(json_path)
+    bin_path = Path(bin_path) if bin_path else compiled_path_for(json_path)
+
+    stat = json_path.stat()
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    universities = json.loads(raw.decode('utf-8'))
+    if not isinstance(universities, list):
+        raise ValueError("universities.json must contain a list of universities")
+    indexes = build_indexes(universities)
+    columns = indexes["columns"]
+
+    sections = {}  # name -> bytes
+    meta = {}  # name -> dtype/shape
+
+    def add_array(name: str, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        sections[name] = array.tobytes()
+        meta[name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+
+    def add_strings(name: str, values: List[bytes]):
+        offsets = np.zeros(len(values) + 1, dtype="<u8")
+        np.cumsum([len(v) for v in values], out=offsets[1:])
+        add_array(f"{name}_offsets", offsets)
+        add_array(f"{name}_blob", np.frombuffer(b"".join(values), dtype=np.uint8))
+
+    for name in COLUMN_NAMES:
+        add_array(name, getattr(columns, name))
+
+    index_keys = {}
+    for name in INDEX_NAMES:
+        index = indexes[name]
+        index_keys[name] = list(index.keys())
+        matrix = np.zeros((len(index), columns.size), dtype=bool)
+        for row, mask in enumerate(index.values()):
+            matrix[row] = mask
+        add_array(name, matrix)
+
+    facet_index = indexes["facet_index"]
+    for facet, matrix in facet_index.matrices.items():
+        add_array(f"facet_{facet}", matrix)
+
+    text_index = TextIndex(universities)
+    for name, array in text_index.postings().items():
+        add_array(f"text_{name}", array)
+    add_strings("text_terms", [term.encode('utf-8') for term in text_index.terms])
+
+    # The ids that won in id_positions (duplicates keep the first occurrence), sorted
+    # by their UTF-8 bytes for binary search, and their positions
+    id_items = sorted((str(uni_id).encode('utf-8'), pos) for uni_id, pos in indexes["id_positions"].items())
+    add_array("id_positions", np.array([pos for _, pos in id_items], dtype="<i8"))
+    add_strings("ids", [uni_id for uni_id, _ in id_items])
+    add_strings("names", [str(name).encode('utf-8') for name in indexes["names"]])
+    add_strings("records", [
+        json.dumps(uni, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        for uni in universities
+    ])
+
+    header = {
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_version": hashlib.sha256(raw).hexdigest()[:16],
+        "count": columns.size,
+        "country_names": columns.country_names,
+        "index_keys": index_keys,
+        "facet_keys": facet_index.keys,
+        "sections": {},
+    }
+
+    # Section offsets are relative to the start of the data area (after the header)
+    offset = 0
+    for name, data in sections.items():
+        header["sections"][name] = {"offset": offset, "length": len(data), **meta[name]}
+        offset += len(data) + (-len(data) % 8)
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode('utf-8')
+    header_bytes += b" " * (-(len(MAGIC) + 8 + len(header_bytes)) % 8)
+
+    tmp_path = bin_path.with_suffix(bin_path.suffix + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for data in sections.values():
+            f.write(data)
+            f.write(b"\0" * (-len(data) % 8))
+    # Atomic replace, so workers never map a half-written file
+    tmp_path.replace(bin_path)
+
+    logger.info(f"Compiled {columns.size} universities into {bin_path}")
+    return bin_path
+
+
+class CompiledStrings(Sequence):
+    """Read-only sequence of strings decoded on access from a string table"""
+
+    def __init__(self, buffer: mmap.mmap, offsets: np.ndarray, blob_start: int):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._blob_start = blob_start
+
+    def raw(self, pos: int) -> bytes:
+        """Undecoded bytes of the string at pos"""
+        start = self._blob_start + int(self._offsets[pos])
+        end = self._blob_start + int(self._offsets[pos + 1])
+        return self._buffer[start:end]
+
+    def _decode(self, pos: int):
+        return self.raw(pos).decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self._decode(i) for i in range(*pos.indices(len(self)))]
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError("string table position out of range")
+        return self._decode(pos)
+
+
+class CompiledRecords(CompiledStrings):
+    """Read-only sequence of university records decoded lazily from the string table"""
+
+    def __init__(self, buffer: mmap.mmap, offsets: np.ndarray, blob_start: int):
+        super().__init__(buffer, offsets, blob_start)
+        self._decode = lru_cache(maxsize=RECORD_CACHE_SIZE)(self._decode_record)
+
+    def _decode_record(self, pos: int) -> Dict:
+        return json.loads(self.raw(pos))
+
+
+class CompiledIdPositions(Mapping):
+    """University ID -> catalog position, binary searched in the sorted ID string table"""
+
+    def __init__(self, ids: CompiledStrings, positions: np.ndarray):
+        self._ids = ids
+        self._positions = positions
+
+    def _find(self, university_id) -> int:
+        """Row of university_id in the table, or -1"""
+        if not isinstance(university_id, str):
+            return -1
+        target = university_id.encode('utf-8')
+        low, high = 0, len(self._ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ids.raw(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < len(self._ids) and self._ids.raw(low) == target else -1
+
+    def __getitem__(self, university_id) -> int:
+        row = self._find(university_id)
+        if row < 0:
+            raise KeyError(university_id)
+        return int(self._positions[row])
+
+    def __contains__(self, university_id) -> bool:
+        return self._find(university_id) >= 0
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def open_compiled_catalog(
+    bin_path: Path,
+    source_path: Optional[Path] = None,
+    aliases: Optional[Dict[str, List[str]]] = None,
+    taxonomy: Optional[FieldTaxonomy] = None,
+) -> Optional[CatalogSnapshot]:
+    """
+    Map a compiled catalog read-only and wrap it in a CatalogSnapshot
+    Returns None if the file is missing, not a compiled catalog, or stale
+    compared to source_path (size or mtime differ)
+    """
+    bin_path = Path(bin_path)
+    if not bin_path.exists():
+        return None
+
+    with open(bin_path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:len(MAGIC)] != MAGIC:
+        logger.warning(f"{bin_path} is not a compiled catalog in the current format, ignoring it")
+        buffer.close()
+        return None
+
+    (header_length,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+    header_start = len(MAGIC) + 8
+    header = json.loads(buffer[header_start:header_start + header_length])
+    data_start = header_start + header_length
+
+    if source_path is not None:
+        stat = Path(source_path).stat()
+        if stat.st_size != header["source_size"] or stat.st_mtime_ns != header["source_mtime_ns"]:
+            logger.warning(f"{bin_path} is older than {source_path}; recompile it to use it")
+            buffer.close()
+            return None
+
+    def section(name: str) -> np.ndarray:
+        info = header["sections"][name]
+        dtype = np.dtype(info["dtype"])
+        count = int(np.prod(info["shape"])) if info["shape"] else 1
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + info["offset"])
+        return array.reshape(info["shape"])
+
+    columns = UniversityColumns.from_arrays(
+        {name: section(name) for name in COLUMN_NAMES},
+        header["country_names"],
+    )
+
+    indexes = {"columns": columns}
+    for name in INDEX_NAMES:
+        matrix = section(name)
+        indexes[name] = {key: matrix[row] for row, key in enumerate(header["index_keys"][name])}
+
+    def strings(name: str, table=CompiledStrings) -> CompiledStrings:
+        return table(
+            buffer,
+            section(f"{name}_offsets"),
+            data_start + header["sections"][f"{name}_blob"]["offset"],
+        )
+
+    indexes["facet_index"] = FacetIndex(columns.size, header["facet_keys"], {
+        facet: section(f"facet_{facet}") for facet in header["facet_keys"]
+    })
+
+    indexes["id_positions"] = CompiledIdPositions(strings("ids"), section("id_positions"))
+    indexes["names"] = strings("names")
+
+    records = strings("records", CompiledRecords)
+
+    snapshot = CatalogSnapshot(
+        records,
+        header["source_version"],
+        source_mtime_ns=header["source_mtime_ns"],
+        indexes=indexes,
+        aliases=aliases,
+        taxonomy=taxonomy,
+    )
+    snapshot.text_index = TextIndex.from_postings(
+        columns.size,
+        strings("text_terms"),
+        {name: section(f"text_{name}") for name in POSTINGS_NAMES},
+    )
+    return snapshot
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    default_json = Path(__file__).parent.parent / "data" / "universities.json"
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else default_json
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    print(compile_catalog(source, target))
@@ -0,0 +1,187 @@
+"""
+Catalog Responses
+Pre-serialized, precompressed bodies for catalog-level API responses
+
+Catalog responses only change when the catalog version changes, so their JSON is
+encoded once per version and cached (tagged with the version, like recommendations,
+but with no TTL: only a reload invalidates them). Compressed variants are produced
+on first request and kept next to the JSON; the cache is bounded by the bytes of
+all of them. The version doubles as the ETag, so clients can revalidate with
+If-None-Match.
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+import gzip
+import threading
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are served
+    brotli = None
+
+# Bytes of cached bodies, compressed variants included (catalog pages, projections, university details)
+RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Larger bodies (e.g. the unpaginated catalog of a big dataset) are served but not cached
+MAX_CACHED_BODY_BYTES = 8 * 1024 * 1024
+
+# Bodies are compressed once per catalog version, so spend more CPU than on-the-fly compression would
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Smaller bodies are sent as is (compression would not pay for its headers)
+MIN_COMPRESS_BYTES = 512
+
+
+class EncodedBody:
+    """One serialized JSON body plus its compressed variants (compressed on first use)"""
+
+    __slots__ = ("identity", "_variants")
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self._variants: Dict[str, bytes] = {}
+
+    def variant(self, encoding: Optional[str]) -> bytes:
+        """Body for a content coding ("br", "gzip") or the plain JSON for None"""
+        if encoding is None or len(self.identity) < MIN_COMPRESS_BYTES:
+            return self.identity
+        body = self._variants.get(encoding)
+        if body is None:
+            if encoding == "br":
+                body = brotli.compress(self.identity, quality=BROTLI_QUALITY)
+            else:
+                body = gzip.compress(self.identity, compresslevel=GZIP_LEVEL, mtime=0)
+            self._variants[encoding] = body
+        return body
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the JSON plus every compressed variant produced so far"""
+        return len(self.identity) + sum(len(body) for body in self._variants.values())
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded bodies, bounded by total bytes and tagged with the catalog version
+
+    Entries stored under an older catalog version are treated as misses and dropped.
+    A body is charged at its current nbytes; put it again after producing a new
+    compressed variant so the growth is accounted for.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_BYTES, max_body_bytes: int = MAX_CACHED_BODY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_body_bytes = max_body_bytes
+        self._entries = OrderedDict()  # key -> (catalog_version, body, charged bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.skipped = 0
+
+    def get(self, key: Hashable, catalog_version: str) -> Optional[EncodedBody]:
+        """Return the cached body, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            version, body, size = entry
+            if version != catalog_version:
+                del self._entries[key]
+                self._bytes -= size
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, catalog_version: str, body: EncodedBody):
+        """Store (or re-charge) a body, evicting the least recently used entries over the byte budget"""
+        size = body.nbytes
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            if size > min(self.max_body_bytes, self.max_bytes):
+                self.skipped += 1
+                return
+
+            self._entries[key] = (catalog_version, body, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters, current size and byte budget"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_body_bytes": self.max_body_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "skipped": self.skipped,
+            }
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred content coding the client accepts: brotli (if installed), then gzip, else None"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison (W/ prefixes are ignored)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+# Shared by the catalog routes; entries from an older catalog version count as misses
+response_cache = ResponseCache()
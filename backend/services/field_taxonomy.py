@@ -0,0 +1,105 @@
+"""
+Field Taxonomy
+Related-field expansion loaded from data/field_taxonomy.json and compiled into Aho-Corasick matchers
+
+The taxonomy maps a query keyword to the university field keywords it accepts,
+e.g. "business" -> ["mba", "management", ...]. A user field of study accepts
+itself plus the related keywords of every taxonomy key it contains; a university
+matches if one of its fields contains an accepted keyword. Both "contains" checks
+run through a KeywordMatcher, so their cost does not grow with the taxonomy size.
+"""
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+import json
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent.parent / "data" / "field_taxonomy.json"
+
+# Distinct field-of-study queries whose expansion is memoized
+EXPANSION_CACHE_SIZE = 1024
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton: every keyword that occurs in a text, in one pass over the text"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = [kw for kw in dict.fromkeys(keywords) if kw]
+        self._goto = [{}]  # node -> {char: node}
+        self._fail = [0]
+        self._out = [[]]  # node -> keyword ids ending here (including via fail links)
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            node = 0
+            for ch in keyword:
+                child = self._goto[node].get(ch)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[node][ch] = child
+                node = child
+            self._out[node].append(keyword_id)
+
+        # Breadth-first so every fail target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Keywords occurring in text as substrings"""
+        node = 0
+        found = set()
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            found.update(self._out[node])
+        return {self.keywords[keyword_id] for keyword_id in found}
+
+
+class FieldTaxonomy:
+    """Compiled related-field taxonomy"""
+
+    def __init__(self, related_fields: Dict[str, List[str]]):
+        self.related_fields = {
+            key.lower(): [value.lower() for value in values]
+            for key, values in related_fields.items()
+        }
+        # Every keyword a university field can be matched against (keys and related fields)
+        self.keywords = list(dict.fromkeys(
+            keyword for key, values in self.related_fields.items() for keyword in [key] + values
+        ))
+        self.keyword_matcher = KeywordMatcher(self.keywords)
+        self._key_matcher = KeywordMatcher(self.related_fields)
+        self.expand = lru_cache(maxsize=EXPANSION_CACHE_SIZE)(self._expand)
+
+    def _expand(self, field_lower: str) -> Tuple[str, ...]:
+        """Accepted university field keywords for a lowercase field of study (itself first)"""
+        acceptable_fields = [field_lower]
+        for key in self._key_matcher.find_all(field_lower):
+            acceptable_fields.extend(self.related_fields[key])
+        return tuple(dict.fromkeys(acceptable_fields))
+
+
+def load_taxonomy(path: Path = DEFAULT_TAXONOMY_PATH) -> FieldTaxonomy:
+    """Read {keyword: [related keyword, ...]} from JSON and compile it"""
+    with open(path, 'r', encoding='utf-8') as f:
+        related_fields = json.load(f)
+    if not isinstance(related_fields, dict):
+        raise ValueError(f"{path} must map field keywords to lists of related keywords")
+    return FieldTaxonomy(related_fields)
+
+
+@lru_cache(maxsize=1)
+def default_taxonomy() -> FieldTaxonomy:
+    """The shipped taxonomy, compiled once per process"""
+    return load_taxonomy(DEFAULT_TAXONOMY_PATH)
@@ -0,0 +1,223 @@
+"""
+Shortlist Rescoring
+Re-scores every user's shortlist against the current catalog and writes back what changed
+
+Shortlist.match_score and Shortlist.category are computed when a university is
+shortlisted and go stale when the catalog changes. This job streams shortlist rows
+joined with their owner's onboarding answers through a server-side cursor, scores
+them in a process pool (same rules and UserProfile parsing as the counsellor's
+shortlist tool) and writes changed rows back in batched UPDATEs.
+
+Usage (from backend/):
+    python -m services.shortlist_rescoring
+    python -m services.shortlist_rescoring --workers 4 --batch-size 5000 --dry-run
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import numpy as np
+from sqlalchemy import select, update
+from database import SessionLocal, engine
+from models import Onboarding, Shortlist
+from services.university_scoring import CATEGORY_NAMES, score_batch
+from services.university_service import UniversityService, university_service
+from services.user_profile import ONBOARDING_FIELDS, user_profiles
+
+logger = logging.getLogger(__name__)
+
+# Shortlist rows per cursor fetch, process-pool task and UPDATE batch
+DEFAULT_BATCH_SIZE = 2000
+
+# Columns streamed per shortlist row (user_id first: rows are grouped per user)
+ROW_COLUMNS = [
+    Shortlist.user_id,
+    Shortlist.id,
+    Shortlist.university_id,
+    Shortlist.match_score,
+    Shortlist.category,
+    Onboarding.updated_at,
+    *(getattr(Onboarding, field) for field in ONBOARDING_FIELDS),
+]
+UPDATED_AT = 5  # onboarding.updated_at in a row
+PROFILE_START = 6  # first ONBOARDING_FIELDS column in a row
+
+# Catalog used inside each pool worker (set by the initializer)
+_worker_service: Optional[UniversityService] = None
+
+
+def _init_worker(json_path: str):
+    global _worker_service
+    if Path(json_path) == university_service.json_path:
+        _worker_service = university_service
+    else:
+        _worker_service = UniversityService(Path(json_path))
+
+
+def rescore_rows(rows: List[Tuple], service: Optional[UniversityService] = None) -> Dict:
+    """
+    Score a batch of streamed rows (ordered by user) against the catalog
+    Returns {"changes": [{"id", "match_score", "category"}], "scored", "missing", "version"}
+    """
+    snapshot = (service or _worker_service)._snapshot
+    changes = []
+    scored = 0
+    missing = 0
+    for _, user_rows in groupby(rows, key=lambda row: row[0]):
+        user_rows = list(user_rows)
+        found = [
+            (row, snapshot.id_positions[row[2]])
+            for row in user_rows if row[2] in snapshot.id_positions
+        ]
+        missing += len(user_rows) - len(found)
+        if not found:
+            continue
+
+        # One batch score per user; score_batch follows score_university exactly
+        first = user_rows[0]
+        profile = user_profiles.get_values((first[0], first[UPDATED_AT]), lambda: first[PROFILE_START:])
+        scores = score_batch(snapshot.columns, np.array([pos for _, pos in found]), **profile.scoring_kwargs())
+        for i, (row, _) in enumerate(found):
+            match_score = int(scores.match_score[i])
+            category = CATEGORY_NAMES[scores.category[i]]
+            if (match_score, category) != (row[3], row[4]):
+                changes.append({"id": row[1], "match_score": match_score, "category": category})
+        scored += len(found)
+
+    return {"changes": changes, "scored": scored, "missing": missing, "version": snapshot.version}
+
+
+def _stream_batches(batch_size: int):
+    """Shortlist rows joined with onboarding, ordered by user, in batches"""
+    statement = (
+        select(*ROW_COLUMNS)
+        .outerjoin(Onboarding, Onboarding.user_id == Shortlist.user_id)
+        .order_by(Shortlist.user_id, Shortlist.id)
+    )
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+        if engine.dialect.name == "sqlite":
+            # SQLite has no server-side cursors, and an open read cursor blocks the
+            # writer's commits, so read everything first (development databases only)
+            rows = [tuple(row) for row in result]
+            for start in range(0, len(rows), batch_size):
+                yield rows[start:start + batch_size]
+            return
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+def rescore_shortlists(
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    service: Optional[UniversityService] = None,
+) -> Dict:
+    """
+    Re-score all shortlists and write back changed match scores and categories
+    workers=0 scores in this process; otherwise a process pool of that size
+    (default: CPU count). Returns a throughput report.
+    """
+    service = service or university_service
+    workers = os.cpu_count() or 1 if workers is None else workers
+    started = time.perf_counter()
+    report = {
+        "catalog_version": service.catalog_version,
+        "workers": workers,
+        "batch_size": batch_size,
+        "dry_run": dry_run,
+        "rows_read": 0,
+        "rows_scored": 0,
+        "rows_missing_university": 0,
+        "rows_changed": 0,
+        "batches": 0,
+    }
+    versions = set()
+
+    def write(result: Dict):
+        report["rows_scored"] += result["scored"]
+        report["rows_missing_university"] += result["missing"]
+        report["rows_changed"] += len(result["changes"])
+        versions.add(result["version"])
+        if result["changes"] and not dry_run:
+            with SessionLocal() as db:
+                db.execute(update(Shortlist), result["changes"])
+                db.commit()
+
+    if workers == 0:
+        for rows in _stream_batches(batch_size):
+            report["rows_read"] += len(rows)
+            report["batches"] += 1
+            write(rescore_rows(rows, service))
+    else:
+        # Spawned workers: forking a threaded server process is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(str(service.json_path),),
+        ) as pool:
+            pending = deque()
+            for rows in _stream_batches(batch_size):
+                report["rows_read"] += len(rows)
+                report["batches"] += 1
+                pending.append(pool.submit(rescore_rows, rows))
+                # Bounded read-ahead keeps memory flat however many rows there are
+                while len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - started
+    if len(versions) > 1 or (versions and report["catalog_version"] not in versions):
+        logger.warning(f"Catalog changed during shortlist rescoring (versions {sorted(versions)}); run it again")
+    report["catalog_versions_seen"] = sorted(versions)
+    report["seconds"] = round(elapsed, 3)
+    report["rows_per_s"] = round(report["rows_read"] / elapsed, 1) if elapsed > 0 else None
+    return report
+
+
+# === Background runs (admin endpoint) ===
+_job_lock = threading.Lock()
+last_report: Optional[Dict] = None
+
+
+def run_in_background(**kwargs) -> bool:
+    """Run rescore_shortlists unless a run is already in progress; False if one is"""
+    global last_report
+    if not _job_lock.acquire(blocking=False):
+        return False
+    try:
+        last_report = {"status": "running"}
+        report = rescore_shortlists(**kwargs)
+        last_report = {"status": "finished", **report}
+        logger.info(f"Shortlist rescoring finished: {report}")
+    except Exception as e:
+        last_report = {"status": "failed", "error": str(e)}
+        logger.error(f"Shortlist rescoring failed: {str(e)}")
+    finally:
+        _job_lock.release()
+    return True
+
+
+def is_running() -> bool:
+    return _job_lock.locked()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Re-score all users' shortlists against the current catalog")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in process; default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per fetch, task and UPDATE")
+    parser.add_argument("--dry-run", action="store_true", help="Score and report, but don't write")
+    args = parser.parse_args()
+    print(json.dumps(rescore_shortlists(args.workers, args.batch_size, args.dry_run), indent=2))
@@ -0,0 +1,118 @@
+"""
+University Attributes
+Static per-university facts compiled once at catalog load
+
+Everything score_university and the frontend payloads derive from a record alone
+(thresholds with their defaults, cost total, ranking tier, exam summary parts,
+compat fields like degree_type and city) lives here, so request paths only compare
+these against the user's profile.
+"""
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Dict
+from services.university_columns import ranking_tier_ordinal
+
+# Attributes compiled on demand for lazily decoded (compiled) catalogs
+ATTRIBUTE_CACHE_SIZE = 4096
+
+
+class UniversityAttributes:
+    """Typed derived attributes of one university record"""
+
+    __slots__ = (
+        "gpa_min",
+        "gpa_competitive",
+        "gpa_strong",
+        "gre_considered",
+        "gre_min",
+        "gre_avg",
+        "gre_summary",
+        "gmat_considered",
+        "gmat_min",
+        "gmat_avg",
+        "gmat_summary",
+        "ielts_min",
+        "ielts_summary",
+        "toefl_min",
+        "toefl_summary",
+        "total_cost",
+        "estimated_total_cost_usd",
+        "budget_tier",
+        "listing_cost_level",
+        "country",
+        "ranking_tier",
+        "difficulty",
+        "degree_type",
+        "field_of_study",
+        "program_name",
+        "city",
+    )
+
+    def __init__(self, uni: Dict):
+        # GPA thresholds (competitive = average + 0.2)
+        academic_reqs = uni.get("academicRequirements", {})
+        self.gpa_min = academic_reqs.get("gpaMin", 3.0)
+        self.gpa_competitive = academic_reqs.get("gpaCompetitive", 3.5)
+        self.gpa_strong = self.gpa_competitive + 0.2 if self.gpa_competitive is not None else None
+
+        # Exam minimums; averages are estimated above the minimum (GRE +10, GMAT +30)
+        exam_reqs = uni.get("examRequirements", {})
+        gre_info = exam_reqs.get("gre", {})
+        self.gre_considered = bool(gre_info.get("required") or gre_info.get("recommended"))
+        self.gre_min = gre_info.get("minTotal") or 310
+        self.gre_avg = self.gre_min + 10
+        self.gre_summary = f"GRE {self.gre_avg}+"
+
+        gmat_info = exam_reqs.get("gmat", {})
+        self.gmat_considered = bool(gmat_info.get("required") or gmat_info.get("recommended"))
+        self.gmat_min = gmat_info.get("minScore") or 650
+        self.gmat_avg = self.gmat_min + 30
+        self.gmat_summary = f"GMAT {self.gmat_avg}+"
+
+        self.ielts_min = exam_reqs.get("ielts", {}).get("minScore", 6.5)
+        self.ielts_summary = f"IELTS {self.ielts_min}+"
+        self.toefl_min = exam_reqs.get("toefl", {}).get("minScore", 90)
+        self.toefl_summary = f"TOEFL {self.toefl_min}+"
+
+        # Cost: raw total for scoring text, integer for listings
+        cost_data = uni.get("estimatedAnnualCostUSD", {})
+        self.total_cost = cost_data.get("total", 0) if isinstance(cost_data, dict) else cost_data
+        self.estimated_total_cost_usd = int(self.total_cost) if self.total_cost else 0
+        self.budget_tier = uni.get("budgetTier", "Unknown")
+        self.listing_cost_level = uni.get("budgetTier", "Medium")
+
+        self.country = uni.get("country", "")
+        self.ranking_tier = ranking_tier_ordinal(uni.get("rankingTier") or "")
+        self.difficulty = uni.get("acceptanceDifficulty", "Medium")
+
+        # Frontend compatibility fields
+        degrees_offered = uni.get("degreesOffered", [])
+        fields = uni.get("fields", [])
+        self.degree_type = degrees_offered[0] if degrees_offered else "Masters"
+        self.field_of_study = fields[0] if fields else "Computer Science"
+        self.program_name = f"{self.degree_type} in {self.field_of_study}"
+        meta = uni.get("meta", {})
+        self.city = meta.get("city") or uni.get("state") or uni.get("city") or ""
+
+
+class LazyAttributes(Sequence):
+    """Attributes for a lazily decoded record sequence, compiled on first access"""
+
+    def __init__(self, universities: Sequence[Dict]):
+        self._universities = universities
+        self._compile = lru_cache(maxsize=ATTRIBUTE_CACHE_SIZE)(self._compile_position)
+
+    def _compile_position(self, pos: int) -> UniversityAttributes:
+        return UniversityAttributes(self._universities[pos])
+
+    def __len__(self) -> int:
+        return len(self._universities)
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self._compile(i) for i in range(*pos.indices(len(self)))]
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError("university position out of range")
+        return self._compile(pos)
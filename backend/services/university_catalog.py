@@ -0,0 +1,267 @@
+"""
+University Catalog
+Immutable snapshot of the university catalog plus every index derived from it
+
+A snapshot is built completely before it is published, and is never modified
+afterwards (the name and similarity indexes, which only name lookups and "similar
+universities" need, are built once on first use). UniversityService swaps snapshots atomically on reload, so a request
+that grabbed a snapshot sees one consistent catalog version throughout.
+"""
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from services.university_columns import UniversityColumns, positions_mask
+from services.university_attributes import LazyAttributes, UniversityAttributes
+from services.university_facets import FacetIndex
+from services.university_names import NameIndex
+from services.university_search import TextIndex
+from services.university_similarity import SimilarityIndex
+from services.university_record import compact_records
+from services.field_taxonomy import FieldTaxonomy, default_taxonomy
+
+# Distinct field-of-study queries whose combined mask is kept per snapshot
+FIELD_MASK_CACHE_SIZE = 1024
+
+def build_indexes(universities: Sequence[Dict]) -> Dict:
+    """Build the id map, names, derived attributes, columns and inverted masks for a list of university records"""
+    # id -> position (first occurrence wins, matching the old linear scan)
+    id_positions = {}
+    for pos, uni in enumerate(universities):
+        uni_id = uni.get("id")
+        if uni_id is not None and uni_id not in id_positions:
+            id_positions[uni_id] = pos
+
+    # Columnar view used for vectorized filtering and scoring
+    columns = UniversityColumns(universities)
+    size = columns.size
+
+    # Inverted indexes: value -> positions in universities
+    degree_positions = {}
+    country_positions = {}
+    intake_positions = {}
+    field_positions = {}  # lowercase university field name -> positions
+    for pos, uni in enumerate(universities):
+        for degree in uni.get("degreesOffered", []):
+            degree_positions.setdefault(degree, []).append(pos)
+        country_positions.setdefault(uni.get("country"), []).append(pos)
+        for year in uni.get("intakeYears", []):
+            intake_positions.setdefault(year, []).append(pos)
+        for uni_field in uni.get("fields", []):
+            field_positions.setdefault(uni_field.lower(), []).append(pos)
+
+    # Stored as boolean masks over the catalog so filters combine with & and |
+    return {
+        "id_positions": id_positions,
+        "names": [uni.get("name", "") for uni in universities],
+        "attributes": [UniversityAttributes(uni) for uni in universities],
+        "columns": columns,
+        "degree_index": {k: positions_mask(v, size) for k, v in degree_positions.items()},
+        "country_index": {k: positions_mask(v, size) for k, v in country_positions.items()},
+        "intake_index": {k: positions_mask(v, size) for k, v in intake_positions.items()},
+        "field_index": {k: positions_mask(v, size) for k, v in field_positions.items()},
+        # Packed per-value bitmaps for faceted search
+        "facet_index": FacetIndex.build(universities),
+    }
+
+
+class CatalogSnapshot:
+    """One version of the catalog with its lookup, inverted and columnar indexes"""
+
+    def __init__(
+        self,
+        universities: Sequence[Dict],
+        version: str,
+        source_mtime_ns: Optional[int] = None,
+        indexes: Optional[Dict] = None,
+        aliases: Optional[Dict[str, List[str]]] = None,
+        taxonomy: Optional[FieldTaxonomy] = None,
+    ):
+        """
+        universities can be a list or any sequence of records (e.g. lazily decoded
+        from a compiled catalog); indexes skips building when they are precomputed.
+        aliases maps university IDs to extra names for name lookups; taxonomy
+        defaults to the shipped field taxonomy
+        """
+        self.universities = universities
+        self.version = version
+        self.source_mtime_ns = source_mtime_ns
+        self.aliases = aliases or {}
+        self.taxonomy = taxonomy or default_taxonomy()
+
+        if indexes is None:
+            indexes = build_indexes(universities)
+        self.id_positions = indexes["id_positions"]
+        self.columns = indexes["columns"]
+        self.degree_index = indexes["degree_index"]
+        self.country_index = indexes["country_index"]
+        self.intake_index = indexes["intake_index"]
+        self.field_index = indexes["field_index"]
+        self.facet_index = indexes["facet_index"]
+        # Derived attributes per position (compiled catalogs compile them on access)
+        if "attributes" in indexes:
+            self.attributes = indexes["attributes"]
+        else:
+            self.attributes = LazyAttributes(universities)
+
+        # Name / alias / acronym lookups for free-text university names, built on first
+        # use (see name_index) so loading never normalizes the whole catalog's names
+        self._names = indexes["names"]
+        self._name_index: Optional[NameIndex] = None
+        self._name_index_lock = threading.Lock()
+
+        # Taxonomy keyword -> mask of universities with a field containing it.
+        # One matcher pass per distinct lowercase field, however many keywords there are
+        size = self.columns.size
+        self.field_keyword_index = {
+            keyword: np.zeros(size, dtype=bool) for keyword in self.taxonomy.keywords
+        }
+        for uni_field, field_mask in self.field_index.items():
+            for keyword in self.taxonomy.keyword_matcher.find_all(uni_field):
+                self.field_keyword_index[keyword] |= field_mask
+
+        self.field_mask = lru_cache(maxsize=FIELD_MASK_CACHE_SIZE)(self._field_mask)
+
+        # Feature vectors and nearest-neighbour index for "universities like this one",
+        # built on first use (see similarity_index) so workers that never serve it don't hold it
+        self._similarity_index: Optional[SimilarityIndex] = None
+        self._similarity_index_lock = threading.Lock()
+
+        # Full-text index, mapped by open_compiled_catalog or attached by UniversityService
+        # before the snapshot is published (so it can reuse the work of the snapshot it replaces)
+        self.text_index: Optional[TextIndex] = None
+
+    @property
+    def name_index(self) -> NameIndex:
+        """Name index of this snapshot, built by the first lookup"""
+        if self._name_index is None:
+            with self._name_index_lock:
+                if self._name_index is None:
+                    self._name_index = NameIndex(self._names, {
+                        self.id_positions[uni_id]: names
+                        for uni_id, names in self.aliases.items()
+                        if uni_id in self.id_positions
+                    })
+        return self._name_index
+
+    @property
+    def similarity_index(self) -> SimilarityIndex:
+        """Similarity index of this snapshot, built by the first similar-universities query"""
+        if self._similarity_index is None:
+            with self._similarity_index_lock:
+                if self._similarity_index is None:
+                    self._similarity_index = SimilarityIndex(self.columns, self.field_index)
+        return self._similarity_index
+
+    def _field_mask(self, field_lower: str) -> np.ndarray:
+        """
+        Mask of universities matching a lowercase field of study or a related field
+        Memoized per snapshot (see field_mask); the returned array is read-only
+        """
+        mask = np.zeros(self.columns.size, dtype=bool)
+        for keyword in self.taxonomy.expand(field_lower):
+            keyword_mask = self.field_keyword_index.get(keyword)
+            if keyword_mask is None:
+                keyword_mask = self.match_field_keyword(keyword)
+            mask |= keyword_mask
+        mask.setflags(write=False)
+        return mask
+
+    def match_field_keyword(self, keyword: str) -> np.ndarray:
+        """Mask of universities with a field containing keyword (substring match)"""
+        mask = np.zeros(self.columns.size, dtype=bool)
+        for uni_field, field_mask in self.field_index.items():
+            if keyword in uni_field:
+                mask |= field_mask
+        return mask
+
+    def record_by_id(self, university_id: str) -> Optional[Dict]:
+        """Raw university record for an ID, or None"""
+        pos = self.id_positions.get(university_id)
+        if pos is None:
+            return None
+        return self.universities[pos]
+
+    def filter_positions(
+        self,
+        target_degree: Optional[str] = None,
+        field_of_study: Optional[str] = None,
+        preferred_countries: Optional[List[str]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+    ) -> Optional[np.ndarray]:
+        """Catalog positions matching the filters, in catalog order (None if no filter applies)"""
+        mask = self.filter_mask(target_degree, field_of_study, preferred_countries, budget_max, target_intake_year)
+        if mask is None:
+            return None
+        return np.flatnonzero(mask)
+
+    def filter_mask(
+        self,
+        target_degree: Optional[str] = None,
+        field_of_study: Optional[str] = None,
+        preferred_countries: Optional[List[str]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Boolean mask of the universities matching the filters (None if no filter applies)
+        Every filter is a boolean mask over the catalog, so no records are touched here
+        """
+        size = self.columns.size
+        mask = None  # None means "no restriction yet"
+
+        def restrict(condition: np.ndarray):
+            nonlocal mask
+            mask = condition.copy() if mask is None else mask & condition
+
+        # Filter by degree type (degreesOffered is an array)
+        if target_degree:
+            restrict(self.degree_index.get(target_degree, np.zeros(size, dtype=bool)))
+
+        # Filter by field of study (fields is an array - flexible matching with related fields)
+        if field_of_study:
+            restrict(self.field_mask(field_of_study.lower()))
+
+        # Filter by countries
+        if preferred_countries:
+            country_mask = np.zeros(size, dtype=bool)
+            for country in preferred_countries:
+                if country in self.country_index:
+                    country_mask |= self.country_index[country]
+            restrict(country_mask)
+
+        # Filter by budget (using estimatedAnnualCostUSD.total)
+        if budget_max:
+            restrict(self.columns.cost_total <= budget_max)
+
+        # Filter by intake year (intakeYears is an array)
+        if target_intake_year:
+            restrict(self.intake_index.get(target_intake_year, np.zeros(size, dtype=bool)))
+
+        return mask
+
+
+def load_snapshot(
+    json_path: Path,
+    aliases: Optional[Dict[str, List[str]]] = None,
+    taxonomy: Optional[FieldTaxonomy] = None,
+) -> CatalogSnapshot:
+    """Read universities.json and build a snapshot (raises if the file is missing or invalid)"""
+    source_mtime_ns = json_path.stat().st_mtime_ns
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    universities = json.loads(raw.decode('utf-8'))
+    if not isinstance(universities, list):
+        raise ValueError("universities.json must contain a list of universities")
+    # Content hash tags everything derived from this catalog (e.g. cached recommendations)
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    # Indexes read the parsed dicts; the snapshot then keeps only compact records
+    indexes = build_indexes(universities)
+    return CatalogSnapshot(
+        compact_records(universities), version, source_mtime_ns,
+        indexes=indexes, aliases=aliases, taxonomy=taxonomy,
+    )
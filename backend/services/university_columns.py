@@ -0,0 +1,155 @@
+"""
+University Columns
+Columnar NumPy view of the university catalog for vectorized filtering and scoring
+"""
+from typing import Dict, Iterable, List
+import re
+import numpy as np
+
+# Ranking tier patterns in the order score_university checks them.
+# Note "Top100" contains "Top10", so precedence matters - keep this order.
+RANKING_TIER_PATTERNS = [
+    ("Top10", "Top 10"),
+    ("Top20", "Top 20"),
+    ("Top50", "Top 50"),
+    ("Top100", "Top 100"),
+    ("Top200", "Top 200"),
+    ("Top300", "Top 300"),
+    ("Top500", "Top 500"),
+]
+UNRANKED_TIER = len(RANKING_TIER_PATTERNS)
+
+# The N of a "TopN" / "Top N" ranking tier
+_RANKING_NUMBER = re.compile(r'Top\s*(\d+)')
+
+# Array attributes of UniversityColumns (also the column sections of a compiled catalog)
+COLUMN_NAMES = [
+    "cost_total",
+    "gpa_min",
+    "gpa_competitive",
+    "ielts_min",
+    "toefl_min",
+    "gre_considered",
+    "gre_min",
+    "gmat_considered",
+    "gmat_min",
+    "ranking_tier",
+    "ranking_rank",
+    "difficulty",
+    "country",
+]
+
+# acceptanceDifficulty codes (anything else maps to OTHER_DIFFICULTY)
+DIFFICULTY_CODES = {"Low": 0, "Medium": 1, "High": 2, "Very High": 3}
+OTHER_DIFFICULTY = 4
+
+
+def ranking_tier_ordinal(ranking_tier: str) -> int:
+    """Index of the first tier pattern found in ranking_tier, or UNRANKED_TIER"""
+    for ordinal, patterns in enumerate(RANKING_TIER_PATTERNS):
+        if any(pattern in ranking_tier for pattern in patterns):
+            return ordinal
+    return UNRANKED_TIER
+
+
+def ranking_rank(ranking_tier: str) -> float:
+    """
+    Rank bound of a ranking tier ("Top150" -> 150.0), inf when it has none
+    Unlike ranking_tier_ordinal this orders every tier correctly ("Top100" is not
+    "Top10"), so it is what ranking comparisons use; the ordinal only feeds the
+    ranking points of score_university
+    """
+    match = _RANKING_NUMBER.search(ranking_tier or "")
+    return float(match.group(1)) if match else np.inf
+
+
+def positions_mask(positions: Iterable[int], size: int) -> np.ndarray:
+    """Boolean mask of length size with the given positions set"""
+    mask = np.zeros(size, dtype=bool)
+    mask[list(positions)] = True
+    return mask
+
+
+def _number(value) -> float:
+    """Column value for a possibly missing number (explicit null becomes NaN)"""
+    if value is None:
+        return np.nan
+    return float(value)
+
+
+class UniversityColumns:
+    """Column arrays aligned with positions in the university catalog list"""
+
+    def __init__(self, universities: List[Dict]):
+        self.size = len(universities)
+
+        cost_total = []
+        gpa_min = []
+        gpa_competitive = []
+        ielts_min = []
+        toefl_min = []
+        gre_considered = []
+        gre_min = []
+        gmat_considered = []
+        gmat_min = []
+        ranking_tier = []
+        rank = []
+        difficulty = []
+        country = []
+
+        self.country_names = []
+        self.country_codes = {}
+
+        for uni in universities:
+            cost_total.append(_number(uni.get("estimatedAnnualCostUSD", {}).get("total", 0)))
+
+            academic_reqs = uni.get("academicRequirements", {})
+            gpa_min.append(_number(academic_reqs.get("gpaMin", 3.0)))
+            gpa_competitive.append(_number(academic_reqs.get("gpaCompetitive", 3.5)))
+
+            exam_reqs = uni.get("examRequirements", {})
+            ielts_min.append(_number(exam_reqs.get("ielts", {}).get("minScore", 6.5)))
+            toefl_min.append(_number(exam_reqs.get("toefl", {}).get("minScore", 90)))
+            gre_info = exam_reqs.get("gre", {})
+            gre_considered.append(bool(gre_info.get("required") or gre_info.get("recommended")))
+            gre_min.append(float(gre_info.get("minTotal") or 310))
+            gmat_info = exam_reqs.get("gmat", {})
+            gmat_considered.append(bool(gmat_info.get("required") or gmat_info.get("recommended")))
+            gmat_min.append(float(gmat_info.get("minScore") or 650))
+
+            ranking_tier.append(ranking_tier_ordinal(uni.get("rankingTier", "")))
+            rank.append(ranking_rank(uni.get("rankingTier", "")))
+            difficulty.append(
+                DIFFICULTY_CODES.get(uni.get("acceptanceDifficulty", "Medium"), OTHER_DIFFICULTY)
+            )
+
+            uni_country = uni.get("country")
+            if uni_country not in self.country_codes:
+                self.country_codes[uni_country] = len(self.country_names)
+                self.country_names.append(uni_country)
+            country.append(self.country_codes[uni_country])
+
+        self.cost_total = np.array(cost_total, dtype=np.float64)
+        self.gpa_min = np.array(gpa_min, dtype=np.float64)
+        self.gpa_competitive = np.array(gpa_competitive, dtype=np.float64)
+        self.ielts_min = np.array(ielts_min, dtype=np.float64)
+        self.toefl_min = np.array(toefl_min, dtype=np.float64)
+        self.gre_considered = np.array(gre_considered, dtype=bool)
+        self.gre_min = np.array(gre_min, dtype=np.float64)
+        self.gmat_considered = np.array(gmat_considered, dtype=bool)
+        self.gmat_min = np.array(gmat_min, dtype=np.float64)
+        self.ranking_tier = np.array(ranking_tier, dtype=np.int8)
+        self.ranking_rank = np.array(rank, dtype=np.float64)
+        self.difficulty = np.array(difficulty, dtype=np.int8)
+        self.country = np.array(country, dtype=np.int32)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], country_names: List) -> "UniversityColumns":
+        """Wrap existing column arrays (e.g. memory-mapped from a compiled catalog) without copying"""
+        columns = cls.__new__(cls)
+        columns.size = len(arrays["cost_total"])
+        for name in COLUMN_NAMES:
+            setattr(columns, name, arrays[name])
+        columns.country_names = list(country_names)
+        columns.country_codes = {name: code for code, name in enumerate(columns.country_names)}
+        return columns
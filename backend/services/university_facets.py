@@ -0,0 +1,121 @@
+"""
+University Facets
+Per-facet bitmaps over the catalog for filtered search with facet counts
+
+Every facet value (a country, a budget tier, a degree, ...) gets a bitmap with one
+bit per catalog position, packed 8 positions per byte. Bitmaps of one facet are
+stacked into a matrix, so filtering is a few ORs and ANDs of packed rows and the
+counts for every value of a facet are one AND plus a popcount over the matrix.
+
+Counts follow the usual multi-select behaviour: a facet's counts apply every
+selection except its own, so the alternatives to a selected value keep their counts.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Response name -> path of the record field it counts (list fields count each item)
+FACETS = {
+    "country": ("country",),
+    "budgetTier": ("budgetTier",),
+    "rankingTier": ("rankingTier",),
+    "acceptanceDifficulty": ("acceptanceDifficulty",),
+    "degree": ("degreesOffered",),
+    "visaDifficulty": ("meta", "visaDifficulty"),
+}
+
+# Set bits per byte value (numpy 1.26 has no bitwise_count)
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def _facet_values(uni: Dict, path: Tuple[str, ...]) -> List[str]:
+    value = uni
+    for key in path:
+        value = value.get(key) if hasattr(value, "get") else None
+        if value is None:
+            return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+def popcount(bitmaps: np.ndarray) -> np.ndarray:
+    """Set bits per row of a packed bitmap matrix (or in one packed bitmap)"""
+    return _POPCOUNT[bitmaps].sum(axis=-1, dtype=np.int64)
+
+
+class FacetIndex:
+    """Packed bitmaps per facet value, aligned with positions in the university catalog list"""
+
+    def __init__(self, size: int, keys: Dict[str, List[str]], matrices: Dict[str, np.ndarray]):
+        """keys[facet][row] is the value of matrices[facet][row] (matrices can be memory-mapped)"""
+        self.size = size
+        self.keys = keys
+        self.matrices = matrices
+        self.rows = {facet: {value: row for row, value in enumerate(values)} for facet, values in keys.items()}
+        # Every catalog position set (pad bits stay clear, so counts never include them)
+        self.all_bits = np.packbits(np.ones(size, dtype=bool))
+
+    @classmethod
+    def build(cls, universities: Sequence[Dict]) -> "FacetIndex":
+        size = len(universities)
+        positions = {facet: {} for facet in FACETS}  # facet -> value -> positions
+        for pos, uni in enumerate(universities):
+            for facet, path in FACETS.items():
+                for value in _facet_values(uni, path):
+                    value_positions = positions[facet].setdefault(value, [])
+                    # A value listed twice in one record counts once
+                    if not value_positions or value_positions[-1] != pos:
+                        value_positions.append(pos)
+
+        keys = {}
+        matrices = {}
+        for facet, by_value in positions.items():
+            keys[facet] = list(by_value)
+            matrix = np.zeros((len(by_value), size), dtype=bool)
+            for row, value_positions in enumerate(by_value.values()):
+                matrix[row, value_positions] = True
+            matrices[facet] = np.packbits(matrix, axis=-1)
+        return cls(size, keys, matrices)
+
+    def pack(self, mask: np.ndarray) -> np.ndarray:
+        """Packed bitmap of a boolean mask over the catalog"""
+        return np.packbits(mask)
+
+    def selection(self, facet: str, values: List[str]) -> np.ndarray:
+        """Packed bitmap of positions having any of the values (unknown values match nothing)"""
+        rows = [self.rows[facet][value] for value in values if value in self.rows[facet]]
+        if not rows:
+            return np.zeros_like(self.all_bits)
+        return np.bitwise_or.reduce(self.matrices[facet][rows], axis=0)
+
+    def search(
+        self,
+        selected: Dict[str, List[str]],
+        base: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Dict[str, int]]]:
+        """
+        Positions matching every selected facet (and base, a packed bitmap of
+        positions allowed by other filters), plus counts per facet value
+        Returns (positions in catalog order, {facet: {value: count}}), values by count then name
+        """
+        base = self.all_bits if base is None else base
+        selections = {facet: self.selection(facet, values) for facet, values in selected.items() if values}
+
+        counts = {}
+        for facet, matrix in self.matrices.items():
+            # Every filter except this facet's own selection
+            allowed = base
+            for other, bits in selections.items():
+                if other != facet:
+                    allowed = allowed & bits
+            value_counts = popcount(matrix & allowed)
+            order = sorted(range(len(value_counts)), key=lambda row: (-value_counts[row], self.keys[facet][row]))
+            counts[facet] = {self.keys[facet][row]: int(value_counts[row]) for row in order}
+
+        matched = base
+        for bits in selections.values():
+            matched = matched & bits
+        positions = np.flatnonzero(np.unpackbits(matched, count=self.size))
+        return positions, counts
@@ -0,0 +1,277 @@
+"""
+University Names
+Normalized name / alias / acronym index with a trigram fuzzy fallback
+
+Resolves the free-text names the AI counsellor emits ("MIT", "Univ. of Melbourne",
+"Standford") to catalog positions. Exact keys are checked first; only when none
+match are names ranked by trigram (Dice) similarity. Fuzzy matching compares core
+forms (generic words dropped), so a shared "University" doesn't outweigh the
+words that tell names apart.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+import json
+import re
+import unicodedata
+import numpy as np
+
+# Abbreviations expanded during normalization (applied to names and queries alike)
+ABBREVIATIONS = {
+    "univ": "university",
+    "uni": "university",
+    "inst": "institute",
+    "tech": "technology",
+    "coll": "college",
+    "natl": "national",
+    "intl": "international",
+}
+
+# Words skipped when building acronyms
+ACRONYM_STOPWORDS = {"of", "the", "and", "at", "for", "in", "de", "di", "la"}
+
+# Words removed for the "core" form ("University of Oxford" -> "oxford")
+GENERIC_WORDS = ACRONYM_STOPWORDS | {"university", "college", "institute", "school"}
+
+# Score per exact key kind; fuzzy matches score their Dice coefficient (0..1)
+EXACT_SCORES = {"name": 1.0, "alias": 1.0, "acronym": 0.95, "core": 0.9}
+
+MIN_ACRONYM_LENGTH = 3
+MIN_FUZZY_SCORE = 0.35
+
+# A fuzzy match is accepted on its own if it scores this high and leads the runner-up clearly
+ACCEPT_FUZZY_SCORE = 0.7
+ACCEPT_FUZZY_MARGIN = 0.1
+
+# Trigrams shared by more names than this don't help ranking and are skipped
+# when collecting candidates (the rarest ones are still used if nothing else is left)
+MAX_POSTINGS = 2000
+FUZZY_CANDIDATES = 32
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, expand abbreviations"""
+    text = name or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower()
+    text = text.replace("&", " and ")
+    # "King's" -> "kings", "M.I.T." -> "mit", "Univ." -> "univ"
+    text = re.sub(r"['.’]", "", text)
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+def core_name(normalized: str) -> str:
+    """Normalized name without generic words"""
+    return " ".join(word for word in normalized.split() if word not in GENERIC_WORDS)
+
+
+def fuzzy_form(normalized: str) -> str:
+    """What fuzzy matching compares: the core name, or the whole name if it is all generic words"""
+    return core_name(normalized) or normalized
+
+
+def name_acronym(normalized: str) -> str:
+    """First letters of the significant words ("university of california los angeles" -> "ucla")"""
+    return "".join(word[0] for word in normalized.split() if word not in ACRONYM_STOPWORDS)
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized string, padded so word edges count"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_codes(texts: List[str]) -> tuple:
+    """
+    Byte trigrams of several normalized strings as packed integers
+    Returns (codes, text index per code); used for the postings, where bytes are
+    close enough to characters and keep the build vectorized
+    """
+    padded = [f"  {text} ".encode('utf-8') for text in texts]
+    lengths = np.array([len(p) for p in padded], dtype=np.int64)
+    data = np.frombuffer(b"".join(padded), dtype=np.uint8).astype(np.int64)
+    codes = (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+    owners = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)[:len(codes)]
+    # Drop windows that run across the end of a string
+    offsets = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)[:len(codes)]
+    valid = offsets <= lengths[owners] - 3
+    return codes[valid], owners[valid]
+
+
+def _run_starts(sorted_values: np.ndarray) -> np.ndarray:
+    """Mask of the first element of each run of equal values"""
+    starts = np.ones(len(sorted_values), dtype=bool)
+    starts[1:] = sorted_values[1:] != sorted_values[:-1]
+    return starts
+
+
+def dice(query_trigrams: Set[str], text: str) -> float:
+    """Dice similarity between a query's trigrams and a string"""
+    text_trigrams = trigrams(text)
+    shared = len(query_trigrams & text_trigrams)
+    return 2 * shared / (len(query_trigrams) + len(text_trigrams))
+
+
+def load_aliases(path: Path) -> Dict[str, List[str]]:
+    """Read {university_id: [alias, ...]} from JSON; a missing file means no aliases"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        aliases = json.load(f)
+    if not isinstance(aliases, dict):
+        raise ValueError(f"{path} must map university IDs to lists of aliases")
+    return {str(uni_id): [str(a) for a in values] for uni_id, values in aliases.items()}
+
+
+class NameIndex:
+    """Exact (name, alias, acronym, core) and trigram lookups over university names"""
+
+    def __init__(self, names: Sequence[str], aliases_by_position: Optional[Dict[int, List[str]]] = None):
+        self.names = names
+        self.aliases_by_position = {
+            pos: [normalize_name(a) for a in aliases]
+            for pos, aliases in (aliases_by_position or {}).items()
+        }
+
+        self._exact = {}  # normalized key -> [(position, kind)]
+        fuzzy_keys = []
+        fuzzy_positions = []
+
+        for pos, name in enumerate(names):
+            for key, kind in self._keys_for(pos, normalize_name(name)):
+                self._exact.setdefault(key, []).append((pos, kind))
+                if kind in ("name", "alias"):
+                    fuzzy_keys.append(fuzzy_form(key))
+                    fuzzy_positions.append(pos)
+
+        self._fuzzy_keys = fuzzy_keys
+        self._fuzzy_positions = fuzzy_positions
+
+        # Postings as two flat arrays: (trigram code, key id) pairs sorted by code,
+        # plus the start of each distinct code's run
+        codes, key_ids = trigram_codes(fuzzy_keys)
+        pairs = np.sort((codes << 32) | key_ids)
+        pairs = pairs[_run_starts(pairs)]  # a key repeating a trigram counts once
+        pair_codes = pairs >> 32
+        gram_starts = np.flatnonzero(_run_starts(pair_codes))
+        self._posting_keys = (pairs & 0xFFFFFFFF).astype(np.int32)
+        self._gram_codes = pair_codes[gram_starts]
+        self._gram_bounds = np.append(gram_starts, len(pairs))
+
+    def _postings(self, code: int) -> Optional[np.ndarray]:
+        """Fuzzy key ids containing a trigram code, or None"""
+        idx = int(np.searchsorted(self._gram_codes, code))
+        if idx == len(self._gram_codes) or self._gram_codes[idx] != code:
+            return None
+        return self._posting_keys[self._gram_bounds[idx]:self._gram_bounds[idx + 1]]
+
+    def _keys_for(self, pos: int, normalized: str) -> List:
+        """(key, kind) pairs indexed for one university"""
+        keys = []
+        if normalized:
+            keys.append((normalized, "name"))
+            acronym = name_acronym(normalized)
+            if len(acronym) >= MIN_ACRONYM_LENGTH:
+                keys.append((acronym, "acronym"))
+            core = core_name(normalized)
+            if core and core != normalized:
+                keys.append((core, "core"))
+        for alias in self.aliases_by_position.get(pos, []):
+            if alias:
+                keys.append((alias, "alias"))
+        return keys
+
+    def search(self, query: str, positions: Optional[Iterable[int]] = None, limit: int = 5) -> List[Dict]:
+        """
+        Best matches for query as [{"position", "score", "match"}], best first
+        positions restricts the search (e.g. to a user's shortlist)
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        if positions is not None:
+            return self._search_positions(normalized, positions, limit)
+
+        # Exact keys: the query as typed, then its core form ("Melbourne Uni" -> "melbourne")
+        best = {}
+        for key in (normalized, core_name(normalized)):
+            for pos, kind in self._exact.get(key, []):
+                score = EXACT_SCORES[kind]
+                if score > best.get(pos, (0, None))[0]:
+                    best[pos] = (score, kind)
+        if not best:
+            best = self._fuzzy(normalized)
+        return self._ranked(best, limit)
+
+    def _fuzzy(self, normalized: str) -> Dict[int, tuple]:
+        """Trigram candidates from the postings lists, re-ranked by exact Dice score (core forms)"""
+        query = fuzzy_form(normalized)
+        query_trigrams = trigrams(query)
+        codes, _ = trigram_codes([query])
+        lists = sorted(
+            (ids for ids in map(self._postings, set(codes.tolist())) if ids is not None),
+            key=len,
+        )
+        if not lists:
+            return {}
+        selective = [ids for ids in lists if len(ids) <= MAX_POSTINGS] or lists[:3]
+        key_ids, counts = np.unique(np.concatenate(selective), return_counts=True)
+        if len(key_ids) > FUZZY_CANDIDATES:
+            key_ids = key_ids[np.argpartition(-counts, FUZZY_CANDIDATES)[:FUZZY_CANDIDATES]]
+
+        best = {}
+        for key_id in key_ids.tolist():
+            score = dice(query_trigrams, self._fuzzy_keys[key_id])
+            pos = self._fuzzy_positions[key_id]
+            if score >= MIN_FUZZY_SCORE and score > best.get(pos, (0, None))[0]:
+                best[pos] = (score, "fuzzy")
+        return best
+
+    def _search_positions(self, normalized: str, positions: Iterable[int], limit: int) -> List[Dict]:
+        """Exact then fuzzy matching over a small set of positions, without the postings"""
+        query_keys = {normalized, core_name(normalized)}
+        query_trigrams = trigrams(fuzzy_form(normalized))
+        exact = {}
+        fuzzy = {}
+        for pos in positions:
+            for key, kind in self._keys_for(pos, normalize_name(self.names[pos])):
+                if key in query_keys:
+                    score = EXACT_SCORES[kind]
+                    if score > exact.get(pos, (0, None))[0]:
+                        exact[pos] = (score, kind)
+                elif kind in ("name", "alias"):
+                    score = dice(query_trigrams, fuzzy_form(key))
+                    if score >= MIN_FUZZY_SCORE and score > fuzzy.get(pos, (0, None))[0]:
+                        fuzzy[pos] = (score, "fuzzy")
+        return self._ranked(exact or fuzzy, limit)
+
+    @staticmethod
+    def _ranked(best: Dict[int, tuple], limit: int) -> List[Dict]:
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+        return [
+            {"position": pos, "score": round(score, 3), "match": kind}
+            for pos, (score, kind) in ranked
+        ]
+
+
+def pick_match(matches: List[Dict]) -> Optional[Dict]:
+    """
+    The match to act on without asking the user, or None if ambiguous
+    A single exact match wins; a fuzzy match must be the only candidate (every
+    candidate already scores MIN_FUZZY_SCORE) or be strong and clearly ahead
+    """
+    if not matches:
+        return None
+    top = matches[0]
+    runner_up = matches[1]["score"] if len(matches) > 1 else 0
+    if top["match"] != "fuzzy":
+        # Several exact hits (e.g. a shared acronym) are ambiguous unless one ranks higher
+        return top if top["score"] > runner_up else None
+    if len(matches) == 1:
+        return top
+    if top["score"] >= ACCEPT_FUZZY_SCORE and top["score"] - runner_up >= ACCEPT_FUZZY_MARGIN:
+        return top
+    return None
@@ -0,0 +1,83 @@
+"""
+University Pareto Frontier
+Non-dominated universities over cost, ranking and match score
+
+A university dominates another when it is no more expensive, no worse ranked and
+matches the student at least as well, and is strictly better on one of them. The
+frontier is everything no other candidate dominates: the only sensible choices
+when trading cost against ranking against fit.
+
+Ranking is the tier's rank bound (Top10 < Top100 < Top150 < unranked), replaced by
+its order among the distinct bounds present. Skyline in O(n log n): candidates are
+sorted by cost (then ranking, then score, so any dominator comes before what it
+dominates), and a running maximum of match score per ranking prefix tells whether
+something earlier dominates each one. A catalog has a handful of distinct
+ranking tiers, so that is one vectorized pass per tier after the sort. Before
+sorting, an O(n) pass keeps only the cheapest candidate per (tier, score) pair,
+which bounds the sort by tiers x scores rather than the catalog. Peeling the
+frontier off and repeating gives successive layers.
+"""
+from typing import List
+import numpy as np
+
+
+def pareto_layers(
+    cost: np.ndarray,
+    rank: np.ndarray,
+    match_score: np.ndarray,
+    layers: int = 1,
+) -> List[np.ndarray]:
+    """
+    Indices of the first `layers` Pareto frontiers (lower cost, lower rank bound,
+    higher match score are better), each sorted by cost then rank. Unknown costs
+    (zero or less) count as the most expensive, unranked (inf) as the worst rank.
+    Equal candidates don't dominate each other, so duplicates share a layer.
+    """
+    cost = np.where(cost > 0, cost, np.inf)
+    # Dense ordinals of the rank bounds (only their order matters)
+    ranking_tier = np.unique(np.asarray(rank, dtype=np.float64), return_inverse=True)[1].reshape(-1)
+    match_score = np.asarray(match_score, dtype=np.int64)
+    remaining = np.arange(len(cost))
+    frontiers = []
+    while len(remaining) and len(frontiers) < layers:
+        # Only the cheapest of each (tier, score) pair can be on the frontier; the
+        # rest are dominated by it, so the sort only sees a few hundred candidates
+        cheapest = _cheapest_per_pair(cost[remaining], ranking_tier[remaining], match_score[remaining])
+        candidates = remaining[cheapest]
+        frontier = candidates[_skyline(cost[candidates], ranking_tier[candidates], match_score[candidates])]
+        frontiers.append(frontier)
+        keep = np.ones(len(cost), dtype=bool)
+        keep[frontier] = False
+        remaining = remaining[keep[remaining]]
+    return frontiers
+
+
+def _cheapest_per_pair(cost: np.ndarray, ranking_tier: np.ndarray, match_score: np.ndarray) -> np.ndarray:
+    """Indices of the points costing the least among those with the same tier and score"""
+    low = match_score.min()
+    pair = ranking_tier * (match_score.max() - low + 1) + (match_score - low)
+    cheapest = np.full(int(pair.max()) + 1, np.inf)
+    np.minimum.at(cheapest, pair, cost)
+    return np.flatnonzero(cost <= cheapest[pair])
+
+
+def _skyline(cost: np.ndarray, ranking_tier: np.ndarray, match_score: np.ndarray) -> np.ndarray:
+    """Indices of the non-dominated points, sorted by cost, ranking tier, then score (descending)"""
+    order = np.lexsort((-match_score, ranking_tier, cost))
+    cost, tier, score = cost[order], ranking_tier[order], match_score[order].astype(np.int64)
+    size = len(order)
+
+    # Start of each point's run of identical points: only points before it can dominate it
+    new_run = np.ones(size, dtype=bool)
+    new_run[1:] = (cost[1:] != cost[:-1]) | (tier[1:] != tier[:-1]) | (score[1:] != score[:-1])
+    run_start = np.maximum.accumulate(np.where(new_run, np.arange(size), 0))
+
+    # Best score among earlier points with a tier at least as good, per tier
+    dominated = np.zeros(size, dtype=bool)
+    for t in np.unique(tier).tolist():
+        best_so_far = np.maximum.accumulate(np.where(tier <= t, score, -1))
+        rows = np.flatnonzero(tier == t)
+        starts = run_start[rows]
+        earlier_best = np.where(starts > 0, best_so_far[np.maximum(starts - 1, 0)], -1)
+        dominated[rows] = earlier_best >= score[rows]
+    return order[~dominated]
@@ -0,0 +1,185 @@
+"""
+University Record
+Compact read-only catalog record: __slots__ fields with the nested requirements flattened
+
+A parsed catalog record is a tree of small dicts (requirements, exams, cost, meta)
+that repeats the same country, tier, degree and field strings across the catalog.
+UniversityRecord keeps every known leaf in a slot, interns categorical strings and
+shares equal numbers and lists between records. It is still a Mapping that rebuilds
+the original nested layout on access - same keys, same order, lists as tuples - so
+routes, views and JSON output don't change.
+
+Keys the schema doesn't know are kept as parsed, so no catalog content is lost.
+"""
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Tuple
+import sys
+
+# Known leaf fields: JSON path -> slot name
+RECORD_FIELDS = {
+    ("id",): "id",
+    ("name",): "name",
+    ("website",): "website",
+    ("country",): "country",
+    ("state",): "state",
+    ("degreesOffered",): "degrees_offered",
+    ("fields",): "fields",
+    ("rankingTier",): "ranking_tier",
+    ("academicRequirements", "gpaMin"): "gpa_min",
+    ("academicRequirements", "gpaCompetitive"): "gpa_competitive",
+    ("examRequirements", "ielts", "required"): "ielts_required",
+    ("examRequirements", "ielts", "minScore"): "ielts_min_score",
+    ("examRequirements", "toefl", "required"): "toefl_required",
+    ("examRequirements", "toefl", "minScore"): "toefl_min_score",
+    ("examRequirements", "gre", "required"): "gre_required",
+    ("examRequirements", "gre", "recommended"): "gre_recommended",
+    ("examRequirements", "gre", "minQuant"): "gre_min_quant",
+    ("examRequirements", "gre", "minVerbal"): "gre_min_verbal",
+    ("examRequirements", "gre", "minTotal"): "gre_min_total",
+    ("examRequirements", "gmat", "required"): "gmat_required",
+    ("examRequirements", "gmat", "recommended"): "gmat_recommended",
+    ("examRequirements", "gmat", "minScore"): "gmat_min_score",
+    ("estimatedAnnualCostUSD", "tuition"): "cost_tuition",
+    ("estimatedAnnualCostUSD", "living"): "cost_living",
+    ("estimatedAnnualCostUSD", "total"): "cost_total",
+    ("budgetTier",): "budget_tier",
+    ("acceptanceDifficulty",): "acceptance_difficulty",
+    ("intakeYears",): "intake_years",
+    ("meta", "visaDifficulty"): "visa_difficulty",
+    ("meta", "workOpportunities"): "work_opportunities",
+}
+
+# Slots holding a small set of distinct strings, interned so records share them
+CATEGORICAL_SLOTS = {
+    "country",
+    "state",
+    "degrees_offered",
+    "fields",
+    "ranking_tier",
+    "budget_tier",
+    "acceptance_difficulty",
+    "visa_difficulty",
+    "work_opportunities",
+}
+
+# Paths that are nested objects in the JSON (parents of the known leaves)
+NESTED_PATHS = {path[:i] for path in RECORD_FIELDS for i in range(1, len(path))}
+
+
+class RecordShape:
+    """
+    Key layout of one (nested) object: which keys exist, in which order, and where
+    each value lives. Records with the same layout share one shape
+    """
+
+    __slots__ = ("keys", "getters")
+
+    def __init__(self, entries: Tuple):
+        self.keys = tuple(key for key, _ in entries)
+        # key -> function(record) returning the value in its original (nested) form
+        self.getters = {key: self._getter(spec) for key, spec in entries}
+
+    @staticmethod
+    def _getter(spec):
+        if isinstance(spec, str):
+            return attrgetter(spec)
+        if spec[0] == "extra":
+            path = spec[1]
+            return lambda record: record._extra[path]
+        return _shape_for(spec[1]).materialize
+
+    def materialize(self, record: "UniversityRecord") -> Dict:
+        return {key: get(record) for key, get in self.getters.items()}
+
+
+# Layout signature -> shared RecordShape (a catalog normally has a handful of layouts)
+_SHAPES: Dict[Tuple, RecordShape] = {}
+
+
+def _shape_for(signature: Tuple) -> RecordShape:
+    shape = _SHAPES.get(signature)
+    if shape is None:
+        shape = _SHAPES[signature] = RecordShape(signature)
+    return shape
+
+
+class UniversityRecord(Mapping):
+    """One catalog record, read-only, stored flat in slots"""
+
+    __slots__ = ("_shape", "_extra") + tuple(RECORD_FIELDS.values())
+
+    def __getitem__(self, key):
+        return self._shape.getters[key](self)
+
+    def get(self, key, default=None):
+        getter = self._shape.getters.get(key)
+        return default if getter is None else getter(self)
+
+    def __contains__(self, key) -> bool:
+        return key in self._shape.getters
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._shape.keys)
+
+    def to_dict(self) -> Dict:
+        """The record as nested plain dicts (lists stay tuples)"""
+        return self._shape.materialize(self)
+
+    def __repr__(self) -> str:
+        return f"UniversityRecord({self.to_dict()!r})"
+
+
+class RecordCompactor:
+    """Builds UniversityRecords, sharing equal values between the records it builds"""
+
+    def __init__(self):
+        self._values = {}
+
+    def _share(self, value, categorical: bool):
+        """One object per distinct value (strings only when categorical)"""
+        if isinstance(value, str):
+            return sys.intern(value) if categorical else value
+        if isinstance(value, list):
+            items = tuple(self._share(item, categorical) for item in value)
+            if not all(isinstance(item, (str, int, float)) for item in items):
+                return items
+            key = (tuple, tuple(map(type, items)), items)
+            return self._values.setdefault(key, items)
+        if isinstance(value, (int, float)):
+            # Keyed by type too: 1, 1.0 and True are equal but serialize differently
+            return self._values.setdefault((type(value), value), value)
+        return value
+
+    def compact(self, uni: Dict) -> UniversityRecord:
+        record = UniversityRecord.__new__(UniversityRecord)
+        extra = {}
+        signature = self._fill(record, uni, (), extra)
+        record._shape = _shape_for(signature)
+        record._extra = extra or None
+        return record
+
+    def _fill(self, record: UniversityRecord, obj: Dict, prefix: Tuple, extra: Dict) -> Tuple:
+        """Store obj's leaves on record; returns obj's layout signature"""
+        entries = []
+        for key, value in obj.items():
+            path = prefix + (key,)
+            slot = RECORD_FIELDS.get(path)
+            if slot is not None and not isinstance(value, dict):
+                setattr(record, slot, self._share(value, slot in CATEGORICAL_SLOTS))
+                entries.append((key, slot))
+            elif path in NESTED_PATHS and isinstance(value, dict):
+                entries.append((key, ("nested", self._fill(record, value, path, extra))))
+            else:
+                extra[path] = value
+                entries.append((key, ("extra", path)))
+        return tuple(entries)
+
+
+def compact_records(universities: Iterable[Dict]) -> List[UniversityRecord]:
+    """Compact parsed catalog records (equal values are shared across the whole list)"""
+    compactor = RecordCompactor()
+    return [compactor.compact(uni) for uni in universities]
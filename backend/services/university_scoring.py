@@ -0,0 +1,437 @@
+"""
+University Scoring
+Batch (vectorized) version of UniversityService.score_university
+
+score_university stays the reference implementation; score_batch must produce
+the same match_score, category and acceptance_chance for every row. Reason and
+risk strings are not built here - explain_scores turns the per-component levels
+into text only for the rows that are actually returned.
+
+score_profiles scores one candidate set for several profiles (what-if scenarios):
+each component is computed once per distinct input and shared between profiles.
+"""
+from typing import Dict, List, Optional
+import numpy as np
+from services.university_columns import UniversityColumns, DIFFICULTY_CODES, OTHER_DIFFICULTY
+from services.university_attributes import UniversityAttributes
+
+LOW = DIFFICULTY_CODES["Low"]
+HIGH = DIFFICULTY_CODES["High"]
+VERY_HIGH = DIFFICULTY_CODES["Very High"]
+
+CATEGORY_NAMES = ["Dream", "Target", "Safe"]
+DREAM, TARGET, SAFE = 0, 1, 2
+
+ACCEPTANCE_NAMES = ["Strong", "Good", "Moderate", "Reach"]
+
+# Component levels. NOT_PROVIDED / NOT_CONSIDERED rows still score points.
+NOT_CONSIDERED = -1
+NOT_PROVIDED = 0
+
+# Points per level for each component (index = level)
+GPA_POINTS = np.array([22, 35, 32, 28, 15], dtype=np.int16)
+GRE_POINTS = np.array([8, 25, 22, 18, 10], dtype=np.int16)
+GMAT_POINTS = np.array([0, 25, 20, 13, 5], dtype=np.int16)
+BUDGET_POINTS = np.array([10, 20, 16, 12, 7, 3], dtype=np.int16)
+RANKING_POINTS = np.array([10, 9, 9, 8, 7, 6, 6, 5], dtype=np.int16)
+BUDGET_COST_LEVELS = [None, "Low", "Medium", "Medium", "High", "High"]
+
+# English levels
+ENGLISH_MISSING, ENGLISH_STRONG, ENGLISH_MEETS, ENGLISH_BELOW = 0, 1, 2, 3
+
+RANKING_REASONS = [
+    "Top 10 ranked university",
+    "Top 20 ranked university",
+    "Top 50 ranked university",
+    "Top 100 ranked university",
+    "Top 200 ranked university",
+]
+
+
+class BatchScores:
+    """Score arrays for a set of catalog positions (all arrays aligned with positions)"""
+
+    def __init__(self, positions: np.ndarray):
+        self.positions = positions
+        self.gpa_level = None
+        self.gre_level = None
+        self.gmat_level = None
+        self.english_level = None
+        self.budget_level = None
+        self.country_match = None
+        self.ranking_tier = None
+        self.match_score = None
+        self.acceptance = None
+        self.category = None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+def _levels(value, thresholds: List[np.ndarray], size: int) -> np.ndarray:
+    """
+    Level 1..len(thresholds) for the first threshold value meets, else len(thresholds) + 1
+    Returns NOT_PROVIDED (0) everywhere when value is falsy (not provided)
+    """
+    levels = np.full(size, NOT_PROVIDED, dtype=np.int8)
+    if not value:
+        return levels
+    levels[:] = len(thresholds) + 1
+    for level in range(len(thresholds), 0, -1):
+        levels[value >= thresholds[level - 1]] = level
+    return levels
+
+
+class ComponentScores:
+    """
+    Score components for one set of catalog positions, computed once per distinct input
+    Each component depends on only some of the profile (GPA, exams, budget, countries),
+    so profiles that differ in one input share every other component's arrays.
+    Returned arrays are shared between profiles and must not be modified.
+    """
+
+    def __init__(self, columns: UniversityColumns, positions: np.ndarray):
+        self.columns = columns
+        self.positions = positions
+        self.size = len(positions)
+        self.ranking_tier = columns.ranking_tier[positions]
+        self.ranking_points = RANKING_POINTS[self.ranking_tier]
+        self.difficulty = columns.difficulty[positions]
+        self._computed = {}
+
+    def _memo(self, key: tuple, compute):
+        if key not in self._computed:
+            self._computed[key] = compute()
+        return self._computed[key]
+
+    def gpa(self, user_gpa: Optional[float]) -> tuple:
+        """(gpa_level, points)"""
+        return self._memo(("gpa", user_gpa), lambda: self._gpa(user_gpa))
+
+    def exams(self, user_gre, user_gmat, user_ielts, user_toefl) -> tuple:
+        """(gre_level, gmat_level, english_level, points)"""
+        key = ("exams", user_gre, user_gmat, user_ielts, user_toefl)
+        return self._memo(key, lambda: self._exams(user_gre, user_gmat, user_ielts, user_toefl))
+
+    def gre(self, user_gre: Optional[int]) -> tuple:
+        """(gre_level, points before the English penalty)"""
+        return self._memo(("gre", user_gre), lambda: self._gre(user_gre))
+
+    def gmat(self, user_gmat: Optional[int]) -> tuple:
+        """(gmat_level, points before the English penalty)"""
+        return self._memo(("gmat", user_gmat), lambda: self._gmat(user_gmat))
+
+    def english(self, user_ielts: Optional[float], user_toefl: Optional[int]) -> np.ndarray:
+        """english_level"""
+        return self._memo(("english", user_ielts, user_toefl), lambda: self._english(user_ielts, user_toefl))
+
+    def budget(self, user_budget: Optional[float]) -> tuple:
+        """(budget_level, points)"""
+        return self._memo(("budget", user_budget), lambda: self._budget(user_budget))
+
+    def country(self, user_countries: Optional[List[str]]) -> tuple:
+        """(country_match, points)"""
+        key = ("country", tuple(user_countries) if user_countries else None)
+        return self._memo(key, lambda: self._country(user_countries))
+
+    # === COMPONENT 1: GPA Match (35 points) ===
+    def _gpa(self, user_gpa):
+        gpa_min = self.columns.gpa_min[self.positions]
+        gpa_avg = self.columns.gpa_competitive[self.positions]
+        level = _levels(user_gpa, [gpa_avg + 0.2, gpa_avg, gpa_min], self.size)
+        return level, GPA_POINTS[level].astype(np.int16)
+
+    # === COMPONENT 2: Exam Readiness (25 points) ===
+    def _gre(self, user_gre):
+        gre_min = self.columns.gre_min[self.positions]
+        level = _levels(user_gre, [gre_min + 20, gre_min + 10, gre_min], self.size)
+        level[~self.columns.gre_considered[self.positions]] = NOT_CONSIDERED
+        return level, np.where(level == NOT_CONSIDERED, 0, GRE_POINTS[level.clip(0)]).astype(np.int16)
+
+    def _gmat(self, user_gmat):
+        gmat_min = self.columns.gmat_min[self.positions]
+        level = _levels(user_gmat, [gmat_min + 60, gmat_min + 30, gmat_min], self.size)
+        gmat_considered = self.columns.gmat_considered[self.positions]
+        level[~gmat_considered] = NOT_CONSIDERED
+        return level, np.where(gmat_considered, GMAT_POINTS[level.clip(0)], 20).astype(np.int16)
+
+    def _english(self, user_ielts, user_toefl):
+        if user_ielts:
+            ielts_min = self.columns.ielts_min[self.positions]
+            return _levels(user_ielts, [ielts_min + 0.5, ielts_min], self.size)
+        if user_toefl:
+            toefl_min = self.columns.toefl_min[self.positions]
+            return _levels(user_toefl, [toefl_min + 10, toefl_min], self.size)
+        return np.full(self.size, ENGLISH_MISSING, dtype=np.int8)
+
+    def _exams(self, user_gre, user_gmat, user_ielts, user_toefl):
+        gre_level, gre_points = self.gre(user_gre)
+        gmat_level, gmat_points = self.gmat(user_gmat)
+        english_level = self.english(user_ielts, user_toefl)
+        exam_score = gre_points + gmat_points
+
+        # Penalty for not meeting English requirement
+        below = english_level == ENGLISH_BELOW
+        exam_score[below] = np.maximum(0, exam_score[below] - 5)
+        return gre_level, gmat_level, english_level, np.minimum(exam_score, 25)
+
+    # === COMPONENT 3: Budget Fit (20 points) ===
+    def _budget(self, user_budget):
+        level = np.full(self.size, NOT_PROVIDED, dtype=np.int8)
+        if user_budget:
+            total_cost = self.columns.cost_total[self.positions]
+            cost_ratio = total_cost / user_budget
+            level = np.select(
+                [cost_ratio <= 0.70, cost_ratio <= 0.85, cost_ratio <= 1.0, cost_ratio <= 1.15],
+                [1, 2, 3, 4],
+                default=5,
+            ).astype(np.int8)
+            level[~(total_cost > 0)] = NOT_PROVIDED
+        return level, BUDGET_POINTS[level]
+
+    # === COMPONENT 4: Country Preference (10 points) ===
+    def _country(self, user_countries):
+        match = np.zeros(self.size, dtype=bool)
+        if user_countries:
+            codes = [self.columns.country_codes[c] for c in user_countries if c in self.columns.country_codes]
+            match = np.isin(self.columns.country[self.positions], codes)
+        return match, np.where(match, 10, 2).astype(np.int16)
+
+    def score(
+        self,
+        user_gpa: Optional[float] = None,
+        user_gre: Optional[int] = None,
+        user_gmat: Optional[int] = None,
+        user_ielts: Optional[float] = None,
+        user_toefl: Optional[int] = None,
+        user_budget: Optional[float] = None,
+        user_countries: Optional[List[str]] = None,
+    ) -> BatchScores:
+        """Component levels and match scores for one profile (no acceptance / category yet)"""
+        scores = BatchScores(self.positions)
+        scores.gpa_level, gpa_points = self.gpa(user_gpa)
+        scores.gre_level, scores.gmat_level, scores.english_level, exam_points = self.exams(
+            user_gre, user_gmat, user_ielts, user_toefl
+        )
+        scores.budget_level, budget_points = self.budget(user_budget)
+        scores.country_match, country_points = self.country(user_countries)
+        # === COMPONENT 5: University Ranking (10 points) ===
+        scores.ranking_tier = self.ranking_tier
+        score = gpa_points + exam_points
+        score += budget_points
+        score += country_points
+        score += self.ranking_points
+        scores.match_score = np.minimum(score, 100)
+        return scores
+
+
+def _classify_rules(match_score: np.ndarray, difficulty: np.ndarray) -> tuple:
+    """(acceptance, category) codes by the score_university rules (broadcasting arrays)"""
+    # === Determine Acceptance Chance ===
+    acceptance = np.select(
+        [(match_score >= 80) & (difficulty != VERY_HIGH) & (difficulty != HIGH), match_score >= 65, match_score >= 50],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+
+    # Categorize (same rules as UniversityService._categorize_university)
+    category = np.select(
+        [
+            np.broadcast_to(difficulty == VERY_HIGH, np.broadcast(match_score, difficulty).shape),
+            (match_score >= 75) & (difficulty == HIGH),
+            match_score >= 75,
+            match_score >= 50,
+            (difficulty == LOW) & (match_score >= 40),
+        ],
+        [DREAM, TARGET, SAFE, TARGET, TARGET],
+        default=DREAM,
+    ).astype(np.int8)
+    return acceptance, category
+
+
+# Acceptance and category for every (difficulty code, match score 0-100) pair, so
+# classifying a batch is one table lookup instead of a chain of comparisons
+ACCEPTANCE_TABLE, CATEGORY_TABLE = _classify_rules(
+    np.arange(101)[None, :], np.arange(OTHER_DIFFICULTY + 1)[:, None]
+)
+
+
+def classify(match_score: np.ndarray, difficulty: np.ndarray) -> tuple:
+    """(acceptance, category) codes for match scores (any shape broadcasting with difficulty)"""
+    cells = difficulty.astype(np.intp) * ACCEPTANCE_TABLE.shape[1] + match_score
+    return ACCEPTANCE_TABLE.ravel().take(cells), CATEGORY_TABLE.ravel().take(cells)
+
+
+def score_batch(
+    columns: UniversityColumns,
+    positions: np.ndarray,
+    user_gpa: Optional[float] = None,
+    user_gre: Optional[int] = None,
+    user_gmat: Optional[int] = None,
+    user_ielts: Optional[float] = None,
+    user_toefl: Optional[int] = None,
+    user_budget: Optional[float] = None,
+    user_countries: Optional[List[str]] = None,
+) -> BatchScores:
+    """Score every university at positions in one array pass (same rules as score_university)"""
+    components = ComponentScores(columns, positions)
+    scores = components.score(
+        user_gpa=user_gpa,
+        user_gre=user_gre,
+        user_gmat=user_gmat,
+        user_ielts=user_ielts,
+        user_toefl=user_toefl,
+        user_budget=user_budget,
+        user_countries=user_countries,
+    )
+    scores.acceptance, scores.category = classify(scores.match_score, components.difficulty)
+    return scores
+
+
+def score_profiles(columns: UniversityColumns, positions: np.ndarray, profiles: List[Dict]) -> List[BatchScores]:
+    """
+    Score the same positions for several profiles (score_batch keyword dicts)
+    Components are shared between profiles with equal inputs, and acceptance and
+    category are decided for all profiles in one 2-D pass
+    """
+    components = ComponentScores(columns, positions)
+    batches = [components.score(**profile) for profile in profiles]
+    if not batches:
+        return batches
+    acceptance, category = classify(np.stack([b.match_score for b in batches]), components.difficulty)
+    for i, scores in enumerate(batches):
+        scores.acceptance, scores.category = acceptance[i], category[i]
+    return batches
+
+
+def explain_scores(
+    attrs: UniversityAttributes,
+    scores: BatchScores,
+    row: int,
+    user_gpa: Optional[float] = None,
+    user_gre: Optional[int] = None,
+    user_gmat: Optional[int] = None,
+    user_ielts: Optional[float] = None,
+    user_toefl: Optional[int] = None,
+    user_budget: Optional[float] = None,
+    user_countries: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Build the reasons, risks, exam summary and cost level for one scored row
+    Text and ordering match score_university exactly
+    """
+    reasons = []
+    risks = []
+    exam_summary = []
+
+    min_gpa = attrs.gpa_min
+
+    gpa_level = scores.gpa_level[row]
+    if gpa_level == 1:
+        reasons.append(f"Strong GPA ({user_gpa:.2f}) - exceeds competitive threshold")
+    elif gpa_level == 2:
+        reasons.append(f"Good GPA ({user_gpa:.2f}) - meets average requirement")
+    elif gpa_level == 3:
+        reasons.append(f"GPA ({user_gpa:.2f}) - meets minimum requirement")
+    elif gpa_level == 4:
+        risks.append(f"GPA ({user_gpa:.2f}) below minimum ({min_gpa:.2f})")
+    else:
+        risks.append("GPA not provided")
+
+    gre_level = scores.gre_level[row]
+    if gre_level != NOT_CONSIDERED:
+        min_gre = attrs.gre_min
+        avg_gre = attrs.gre_avg
+        exam_summary.append(attrs.gre_summary)
+        if gre_level == 1:
+            reasons.append(f"Excellent GRE score ({user_gre})")
+        elif gre_level == 2:
+            reasons.append(f"Good GRE score ({user_gre})")
+        elif gre_level == 3:
+            reasons.append(f"GRE meets minimum ({user_gre})")
+        elif gre_level == 4:
+            risks.append(f"GRE ({user_gre}) below minimum ({min_gre})")
+        else:
+            risks.append(f"GRE required but not provided (need {avg_gre}+)")
+
+    gmat_level = scores.gmat_level[row]
+    if gmat_level != NOT_CONSIDERED:
+        min_gmat = attrs.gmat_min
+        avg_gmat = attrs.gmat_avg
+        exam_summary.append(attrs.gmat_summary)
+        if gmat_level == 1:
+            reasons.append(f"Excellent GMAT score ({user_gmat})")
+        elif gmat_level == 2:
+            reasons.append(f"Good GMAT score ({user_gmat})")
+        elif gmat_level == 3:
+            reasons.append(f"GMAT meets minimum ({user_gmat})")
+        elif gmat_level == 4:
+            risks.append(f"GMAT ({user_gmat}) below minimum ({min_gmat})")
+        else:
+            risks.append(f"GMAT required but not provided (need {avg_gmat}+)")
+    else:
+        reasons.append("No GRE/GMAT required")
+
+    english_level = scores.english_level[row]
+    if user_ielts:
+        ielts_min = attrs.ielts_min
+        exam_summary.append(attrs.ielts_summary)
+        if english_level == ENGLISH_STRONG:
+            reasons.append(f"Strong IELTS score ({user_ielts})")
+        elif english_level == ENGLISH_MEETS:
+            reasons.append(f"IELTS meets requirement ({user_ielts})")
+        else:
+            risks.append(f"IELTS ({user_ielts}) below minimum ({ielts_min})")
+    elif user_toefl:
+        toefl_min = attrs.toefl_min
+        exam_summary.append(attrs.toefl_summary)
+        if english_level == ENGLISH_STRONG:
+            reasons.append(f"Strong TOEFL score ({user_toefl})")
+        elif english_level == ENGLISH_MEETS:
+            reasons.append(f"TOEFL meets requirement ({user_toefl})")
+        else:
+            risks.append(f"TOEFL ({user_toefl}) below minimum ({toefl_min})")
+    else:
+        risks.append("English proficiency test score not provided")
+
+    total_cost = attrs.total_cost
+    budget_level = scores.budget_level[row]
+    cost_level = BUDGET_COST_LEVELS[budget_level] or attrs.budget_tier
+    if budget_level == 1:
+        reasons.append(f"Well within budget (${total_cost:,})")
+    elif budget_level == 2:
+        reasons.append(f"Comfortably within budget (${total_cost:,})")
+    elif budget_level == 3:
+        reasons.append(f"Fits budget (${total_cost:,})")
+    elif budget_level in (4, 5):
+        overage = total_cost - user_budget
+        risks.append(f"Cost (${total_cost:,}) exceeds budget by ${overage:,}")
+
+    if scores.country_match[row]:
+        reasons.append(f"Located in preferred country ({attrs.country})")
+    elif user_countries:
+        risks.append("Not in preferred countries")
+
+    ranking_tier = scores.ranking_tier[row]
+    if ranking_tier < len(RANKING_REASONS):
+        reasons.append(RANKING_REASONS[ranking_tier])
+
+    difficulty = attrs.difficulty
+    category = CATEGORY_NAMES[scores.category[row]]
+    if difficulty == "Very High":
+        risks.append("Extremely selective university with very low acceptance rate")
+    elif difficulty == "High":
+        if category == "Dream":
+            risks.append("Highly competitive admissions (low acceptance rate)")
+        elif category == "Target":
+            reasons.append("Competitive but achievable with strong profile")
+    elif difficulty == "Low":
+        if category == "Safe":
+            reasons.append("Accessible admissions process")
+
+    return {
+        "fit_reasons": reasons[:3],
+        "risk_factors": risks[:3],
+        "cost_level": cost_level,
+        "exam_requirements_summary": exam_summary,
+    }
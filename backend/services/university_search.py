@@ -0,0 +1,317 @@
+"""
+University Search
+In-memory BM25 full-text index over university names, fields, states and countries
+
+Text is normalized like university names (lowercase, accents and punctuation
+stripped, abbreviations expanded) and split into words. Postings are flat arrays:
+per term, the documents containing it and their BM25 impact (the term's score
+contribution in that document), precomputed at build time and sorted best first.
+Single-term queries read just the head of one list. Longer queries take a score
+threshold from the heads, then only score the prefix of each list that could
+still reach it (MaxScore-style pruning), looking other terms up by document.
+
+A rebuild reuses the term counts of records whose searchable text is unchanged,
+so a reload only tokenizes what changed. Term ids follow the sorted vocabulary
+and every other part of the index is a flat array, so a compiled catalog stores
+the whole index (see postings / from_postings) and workers map it instead of
+tokenizing the catalog at startup.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import bisect
+import numpy as np
+from services.university_names import ACRONYM_STOPWORDS, normalize_name
+
+# Searchable record fields and how much one occurrence of a word in each counts
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "fields": 1.5,
+    "state": 1.0,
+    "country": 1.0,
+}
+
+# BM25 parameters: term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# A query word that is not a known term matches the most common terms it prefixes ("comp" -> "computer")
+MAX_PREFIX_TERMS = 16
+
+# Slack for float32 impacts when pruning, so rounding never drops a qualifying document
+SCORE_TOLERANCE = 1e-4
+
+# Postings of the rarest query term scored up front to set the pruning threshold
+THRESHOLD_SAMPLE = 256
+
+# Terms in at least 1/DENSE_FRACTION of the catalog keep a dense impact array; queries
+# whose candidates reach that share are scored over the whole catalog
+DENSE_FRACTION = 8
+
+# Binary searching one position costs about as much as spreading this many postings
+LOOKUP_COST = 8
+
+# Array attributes of TextIndex (also the postings sections of a compiled catalog)
+POSTINGS_NAMES = ["docs", "impacts", "bounds", "docs_by_doc", "impacts_by_doc", "dense_terms", "dense_impacts"]
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized words of a text, without stopwords"""
+    return [word for word in normalize_name(text).split() if word not in ACRONYM_STOPWORDS]
+
+
+def _searchable(uni: Dict) -> Tuple:
+    """The record's searchable values (also the key for reusing its term counts)"""
+    fields = uni.get("fields") or ()
+    return (
+        uni.get("name") or "",
+        tuple(f for f in fields if isinstance(f, str)) if isinstance(fields, (list, tuple)) else (),
+        uni.get("state") or "",
+        uni.get("country") or "",
+    )
+
+
+def _term_counts(searchable: Tuple, token_cache: Dict[str, List[str]]) -> Dict[str, float]:
+    """Weighted term frequencies of one record"""
+    name, fields, state, country = searchable
+    counts = {}
+    for texts, weight in (
+        ((name,), FIELD_WEIGHTS["name"]),
+        (fields, FIELD_WEIGHTS["fields"]),
+        ((state,), FIELD_WEIGHTS["state"]),
+        ((country,), FIELD_WEIGHTS["country"]),
+    ):
+        for text in texts:
+            if not isinstance(text, str):
+                continue
+            tokens = token_cache.get(text)
+            if tokens is None:
+                tokens = token_cache[text] = tokenize(text)
+            for token in tokens:
+                counts[token] = counts.get(token, 0.0) + weight
+    return counts
+
+
+class TextIndex:
+    """BM25 index aligned with positions in the university catalog list"""
+
+    def __init__(self, universities: Sequence[Dict], previous: Optional["TextIndex"] = None):
+        """previous: the index of the catalog being replaced, whose term counts are reused"""
+        self.size = len(universities)
+        reused = previous._term_counts if previous is not None else {}
+        token_cache = {}
+
+        # Term counts per record, keyed by searchable values (shared by equal records)
+        self._term_counts = {}
+        doc_counts = []
+        for uni in universities:
+            key = _searchable(uni)
+            counts = self._term_counts.get(key)
+            if counts is None:
+                counts = reused.get(key)
+                if counts is None:
+                    counts = _term_counts(key, token_cache)
+                self._term_counts[key] = counts
+            doc_counts.append(counts)
+        self.reused = sum(1 for key in self._term_counts if key in reused)
+
+        # (term id, document, weighted tf) triples as flat arrays
+        vocabulary = {}
+        term_ids = []
+        tfs = []
+        lengths = np.zeros(self.size, dtype=np.float64)
+        for pos, counts in enumerate(doc_counts):
+            for term, tf in counts.items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                tfs.append(tf)
+            lengths[pos] = sum(counts.values())
+        # Renumber terms in sorted order, so the vocabulary is just the sorted term list
+        terms = sorted(vocabulary)
+        sorted_ids = np.empty(len(terms), dtype=np.int64)
+        sorted_ids[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+        term_ids = sorted_ids[np.array(term_ids, dtype=np.int64)]
+        tfs = np.array(tfs, dtype=np.float64)
+        docs = np.repeat(np.arange(self.size, dtype=np.int64), [len(c) for c in doc_counts])
+
+        df = np.bincount(term_ids, minlength=len(terms))
+        idf = np.log(1 + (self.size - df + 0.5) / (df + 0.5))
+        average_length = lengths.mean() if self.size and lengths.any() else 1.0
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+        impacts = idf[term_ids] * tfs * (BM25_K1 + 1) / (tfs + norms[docs])
+
+        # Postings grouped by term, best impact first (ties in catalog order)
+        order = np.lexsort((docs, -impacts, term_ids))
+        self._docs = docs[order].astype(np.int32)
+        self._impacts = impacts[order].astype(np.float32)
+        self._bounds = np.concatenate(([0], np.cumsum(df)))
+        # The same postings in document order, for looking up one document's impact
+        order = np.argsort(term_ids, kind="stable")
+        self._docs_by_doc = docs[order].astype(np.int32)
+        self._impacts_by_doc = impacts[order].astype(np.float32)
+        # Frequent terms also get their impacts as a dense array over the catalog, so
+        # looking up any set of documents is a plain gather
+        dense_terms = np.flatnonzero(df * DENSE_FRACTION >= max(self.size, 1))
+        dense = np.zeros((len(dense_terms), self.size), dtype=np.float32)
+        for row, term_id in enumerate(dense_terms.tolist()):
+            docs, term_impacts = self._term_postings(term_id)
+            dense[row, docs] = term_impacts
+        self._dense_terms = dense_terms
+        self._dense_impacts = dense
+        self._set_terms(terms)
+
+    @classmethod
+    def from_postings(cls, size: int, terms: Sequence[str], arrays: Dict[str, np.ndarray]) -> "TextIndex":
+        """
+        Wrap the arrays of postings() (e.g. memory-mapped from a compiled catalog) without copying
+        Such an index has no term counts, so a rebuild from it tokenizes every record
+        """
+        index = cls.__new__(cls)
+        index.size = size
+        index._term_counts = {}
+        index.reused = 0
+        for name in POSTINGS_NAMES:
+            setattr(index, f"_{name}", arrays[name])
+        index._set_terms(terms)
+        return index
+
+    def postings(self) -> Dict[str, np.ndarray]:
+        """The index arrays by POSTINGS_NAMES (the vocabulary is `terms`)"""
+        return {name: getattr(self, f"_{name}") for name in POSTINGS_NAMES}
+
+    def _set_terms(self, terms: Sequence[str]):
+        """Vocabulary (sorted; a term's id is its index) and the lookups derived from the arrays"""
+        self.terms = terms
+        self._df = np.diff(self._bounds)
+        self._dense = dict(zip(self._dense_terms.tolist(), self._dense_impacts))
+
+    def _term_id(self, term: str) -> Optional[int]:
+        term_id = bisect.bisect_left(self.terms, term)
+        if term_id < len(self.terms) and self.terms[term_id] == term:
+            return term_id
+        return None
+
+    def _term_postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self._bounds[term_id], self._bounds[term_id + 1]
+        return self._docs[start:end], self._impacts[start:end]
+
+    def _prefix_terms(self, prefix: str) -> List[int]:
+        """Ids of the most common terms starting with prefix"""
+        start = bisect.bisect_left(self.terms, prefix)
+        term_ids = []
+        for term_id in range(start, len(self.terms)):
+            if not self.terms[term_id].startswith(prefix):
+                break
+            term_ids.append(term_id)
+        term_ids.sort(key=lambda term_id: -self._df[term_id])
+        return term_ids[:MAX_PREFIX_TERMS]
+
+    def _exact_scores(self, term_ids: List[int], positions: np.ndarray) -> np.ndarray:
+        """Full scores of the given (sorted, distinct) positions"""
+        scores = np.zeros(len(positions), dtype=np.float64)
+        for term_id in term_ids:
+            dense = self._dense.get(term_id)
+            if dense is not None:
+                scores += dense[positions]
+                continue
+            start, end = self._bounds[term_id], self._bounds[term_id + 1]
+            if len(positions) * LOOKUP_COST < end - start:
+                # Few positions: binary search them in the document-ordered list
+                docs = self._docs_by_doc[start:end]
+                found = np.minimum(np.searchsorted(docs, positions), len(docs) - 1)
+                hit = docs[found] == positions
+                scores[hit] += self._impacts_by_doc[start:end][found[hit]]
+            else:
+                # Many positions: spread the list over the catalog and read them back
+                spread = np.zeros(self.size, dtype=np.float32)
+                spread[self._docs[start:end]] = self._impacts[start:end]
+                scores += spread[positions]
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Best matches for a free-text query as [(position, score)], best first (ties in catalog order)"""
+        term_ids = []
+        for token in dict.fromkeys(tokenize(query)):
+            term_id = self._term_id(token)
+            term_ids.extend([term_id] if term_id is not None else self._prefix_terms(token))
+        term_ids = list(dict.fromkeys(term_ids))
+        if not term_ids or limit <= 0:
+            return []
+
+        if len(term_ids) == 1:
+            # Postings are sorted by impact: the head of the list is the answer
+            docs, impacts = self._term_postings(term_ids[0])
+            return list(zip(docs[:limit].tolist(), impacts[:limit].tolist()))
+
+        # Threshold: the limit-th best full score among a sample of likely results (the
+        # documents heading each list, and the rarest term's documents, which are the
+        # ones that can contain every term)
+        rarest = min(term_ids, key=lambda term_id: self._df[term_id])
+        heads = _distinct(np.concatenate(
+            [self._term_postings(t)[0][:limit] for t in term_ids]
+            + [self._term_postings(rarest)[0][:THRESHOLD_SAMPLE]]
+        ))
+        head_scores = self._exact_scores(term_ids, heads)
+        threshold = float(np.partition(head_scores, len(heads) - limit)[len(heads) - limit]) if len(heads) >= limit else 0.0
+
+        # Lists whose best impacts add up to less than the threshold can't produce a
+        # result on their own, so only the other ("essential") lists supply candidates
+        best = {term_id: float(self._term_postings(term_id)[1][0]) for term_id in term_ids}
+        total_best = sum(best.values())
+        essential = sorted(term_ids, key=best.get)
+        non_essential_best = 0.0
+        while essential and non_essential_best + best[essential[0]] < threshold - SCORE_TOLERANCE:
+            non_essential_best += best[essential.pop(0)]
+
+        # A document reaching the threshold has, in every list it is in, an impact of
+        # at least the threshold minus the best impacts of the other lists
+        prefixes = []
+        for term_id in essential:
+            docs, impacts = self._term_postings(term_id)
+            bound = threshold - (total_best - best[term_id]) - SCORE_TOLERANCE
+            prefixes.append(docs[:_count_at_least(impacts, bound)])
+        if sum(map(len, prefixes)) * DENSE_FRACTION < self.size:
+            candidates = _distinct(np.concatenate(prefixes))
+            return _top(candidates, self._exact_scores(term_ids, candidates), limit)
+
+        # Common terms only: score the whole catalog and keep what reaches the threshold
+        scores = np.zeros(self.size, dtype=np.float64)
+        for term_id in term_ids:
+            dense = self._dense.get(term_id)
+            if dense is not None:
+                scores += dense
+            else:
+                docs, impacts = self._term_postings(term_id)
+                scores[docs] += impacts
+        candidates = np.flatnonzero(scores >= threshold - SCORE_TOLERANCE)
+        return _top(candidates, scores[candidates], limit)
+
+
+def _top(positions: np.ndarray, scores: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+    """The limit best (position, score) pairs with a positive score; positions must be sorted"""
+    if len(positions) > limit:
+        # Everything above the limit-th best score, then ties at it in catalog order
+        cutoff = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+        above = scores > cutoff
+        tied = np.flatnonzero(scores == cutoff)[:limit - int(above.sum())]
+        keep = np.concatenate((np.flatnonzero(above), tied))
+        positions, scores = positions[keep], scores[keep]
+    order = np.lexsort((positions, -scores))
+    return [(pos, score) for pos, score in zip(positions[order].tolist(), scores[order].tolist()) if score > 0]
+
+
+def _distinct(positions: np.ndarray) -> np.ndarray:
+    """Sorted distinct positions"""
+    positions = np.sort(positions)
+    if len(positions) > 1:
+        positions = positions[np.concatenate(([True], positions[1:] != positions[:-1]))]
+    return positions
+
+
+def _count_at_least(descending: np.ndarray, bound: float) -> int:
+    """Number of leading values >= bound in a descending array"""
+    low, high = 0, len(descending)
+    while low < high:
+        middle = (low + high) // 2
+        if descending[middle] >= bound:
+            low = middle + 1
+        else:
+            high = middle
+    return low
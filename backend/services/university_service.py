@@ -2,87 +2,304 @@
 University Service
 Handles loading universities from JSON and matching logic
 """
-import json
+import base64
+import binascii
+import bisect
+import heapq
 from pathlib import Path
 from typing import List, Dict, Optional
 import logging
+import threading
+import numpy as np
+from services.university_catalog import CatalogSnapshot, load_snapshot
+from services.university_attributes import UniversityAttributes
+from services.university_view import UniversityView, UniversityViews
+from services.catalog_binary import compiled_path_for, open_compiled_catalog
+from services.recommendation_cache import RecommendationCache
+from services.university_names import load_aliases, pick_match
+from services.university_search import TextIndex
+from services.university_pareto import pareto_layers
+from services.field_taxonomy import default_taxonomy, load_taxonomy
+from services.university_scoring import (
+    BatchScores,
+    score_batch,
+    score_profiles,
+    explain_scores,
+    CATEGORY_NAMES,
+    ACCEPTANCE_NAMES,
+    RANKING_POINTS,
+    RANKING_REASONS,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CATALOG_PATH = Path(__file__).parent.parent / "data" / "universities.json"
+ALIASES_FILENAME = "university_aliases.json"
+
+# Side-by-side comparison rows: response column -> key of the scored university view
+COMPARISON_COLUMNS = {
+    "university_id": "university_id",
+    "university_name": "university_name",
+    "country": "country",
+    "ranking_tier": "rankingTier",
+    "acceptance_difficulty": "acceptanceDifficulty",
+    "estimated_total_cost_usd": "estimated_total_cost_usd",
+    "cost_level": "cost_level",
+    "match_score": "match_score",
+    "category": "category",
+    "acceptance_chance": "acceptance_chance",
+    "minimum_gpa": "minimum_gpa_estimate",
+    "competitive_gpa": "average_gpa_estimate",
+}
+
+# Pareto frontiers returned at most per request
+MAX_PARETO_LAYERS = 5
+
+# Category code of a university a what-if profile's filters exclude
+NOT_CANDIDATE = -1
+
+# Profile arguments a what-if scenario may change (degree, field and intake stay fixed)
+SCENARIO_FIELDS = ("user_gpa", "user_gre", "user_gmat", "user_ielts", "user_toefl", "budget_max", "preferred_countries")
+
 
 class UniversityService:
     """Service for university data and matching"""
 
-    def __init__(self):
-        self.universities = []
+    def __init__(
+        self,
+        json_path: Optional[Path] = None,
+        aliases_path: Optional[Path] = None,
+        taxonomy_path: Optional[Path] = None,
+    ):
+        self.json_path = Path(json_path) if json_path else DEFAULT_CATALOG_PATH
+        # Extra names per university ID, read together with the catalog
+        self.aliases_path = Path(aliases_path) if aliases_path else self.json_path.with_name(ALIASES_FILENAME)
+        # Related-field taxonomy, compiled once. Cached recommendations depend on it,
+        # so it is not hot-reloaded with the catalog
+        self.field_taxonomy = load_taxonomy(taxonomy_path) if taxonomy_path else default_taxonomy()
+        # Current catalog snapshot. Replaced as a whole on reload, never modified in place
+        self._snapshot = CatalogSnapshot([], "empty")
+        self._reload_lock = threading.Lock()
+        self._seen_mtimes = None
+        self._watcher = None
+        self.recommendation_cache = RecommendationCache()
         self.load_universities()
 
-    def load_universities(self):
-        """Load universities from JSON file"""
-        try:
-            # Get backend directory
-            current_file = Path(__file__)
-            backend_dir = current_file.parent.parent
-            json_path = backend_dir / "data" / "universities.json"
+    @property
+    def universities(self) -> List[Dict]:
+        return self._snapshot.universities
 
-            with open(json_path, 'r', encoding='utf-8') as f:
-                self.universities = json.load(f)
+    @property
+    def catalog_version(self) -> str:
+        return self._snapshot.version
 
-            logger.info(f"Loaded {len(self.universities)} universities")
+    def load_universities(self) -> Dict:
+        """
+        Load universities from JSON file
+        The new catalog and its indexes are built off to the side and swapped in atomically;
+        if anything fails the current snapshot keeps serving
+        """
+        with self._reload_lock:
+            current = self._snapshot
+            try:
+                mtimes = self._source_mtimes()
+                aliases = load_aliases(self.aliases_path)
+                # Prefer the memory-mapped compiled catalog when it is up to date with the JSON
+                snapshot = (
+                    self._open_compiled(aliases)
+                    or load_snapshot(self.json_path, aliases, self.field_taxonomy)
+                )
+                # Full-text index: compiled catalogs map theirs; otherwise unchanged records
+                # reuse the current index's term counts
+                if snapshot.text_index is None:
+                    if snapshot.version == current.version and current.text_index is not None:
+                        snapshot.text_index = current.text_index
+                    else:
+                        snapshot.text_index = TextIndex(snapshot.universities, previous=current.text_index)
+            except Exception as e:
+                logger.error(f"Error loading universities: {e}")
+                return {
+                    "reloaded": False,
+                    "version": current.version,
+                    "count": len(current.universities),
+                    "error": str(e),
+                }
+
+            self._seen_mtimes = mtimes
+            # Same content (e.g. a touched file) keeps the current snapshot
+            reloaded = snapshot.version != current.version or snapshot.aliases != current.aliases
+            if reloaded:
+                self._snapshot = snapshot
+                logger.info(f"Loaded {len(snapshot.universities)} universities (version {snapshot.version})")
+
+            return {
+                "reloaded": reloaded,
+                "version": self._snapshot.version,
+                "count": len(self._snapshot.universities),
+            }
+
+    def _open_compiled(self, aliases: Dict[str, List[str]]) -> Optional[CatalogSnapshot]:
+        """Compiled catalog next to the JSON source, or None if missing, stale or unreadable"""
+        try:
+            return open_compiled_catalog(
+                compiled_path_for(self.json_path), self.json_path, aliases, self.field_taxonomy
+            )
         except Exception as e:
-            logger.error(f"Error loading universities: {e}")
-            self.universities = []
+            logger.warning(f"Ignoring compiled catalog: {e}")
+            return None
 
-    def get_all_universities(self) -> List[Dict]:
-        """Get all universities"""
-        return self.universities
+    def _source_mtimes(self) -> tuple:
+        """mtimes of universities.json and the aliases file (None if there is no aliases file)"""
+        aliases_mtime_ns = self.aliases_path.stat().st_mtime_ns if self.aliases_path.exists() else None
+        return self.json_path.stat().st_mtime_ns, aliases_mtime_ns
 
-    def get_university_by_id(self, university_id: str) -> Optional[Dict]:
+    def reload_if_changed(self) -> Optional[Dict]:
+        """Reload when universities.json or the aliases file has a new mtime; returns the reload result or None"""
+        try:
+            mtimes = self._source_mtimes()
+        except OSError as e:
+            logger.warning(f"Cannot stat {self.json_path}: {e}")
+            return None
+        if mtimes == self._seen_mtimes:
+            return None
+        # Remember the mtimes even if loading fails, so a broken file is retried only once it changes
+        self._seen_mtimes = mtimes
+        return self.load_universities()
+
+    def start_reload_watcher(self, interval_seconds: float):
+        """Poll universities.json for changes in a daemon thread"""
+        if self._watcher is not None or interval_seconds <= 0:
+            return
+
+        def watch():
+            while not stop.wait(interval_seconds):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    logger.error(f"Catalog reload watcher error: {e}")
+
+        stop = threading.Event()
+        self._watcher = (threading.Thread(target=watch, name="catalog-reload", daemon=True), stop)
+        self._watcher[0].start()
+        logger.info(f"Watching {self.json_path} for changes every {interval_seconds}s")
+
+    def stop_reload_watcher(self):
+        """Stop the polling thread started by start_reload_watcher"""
+        if self._watcher is None:
+            return
+        thread, stop = self._watcher
+        stop.set()
+        thread.join(timeout=5)
+        self._watcher = None
+
+    def get_all_universities(self) -> UniversityViews:
+        """Get all universities (read-only: catalog records are shared between requests)"""
+        return UniversityViews(self._snapshot.universities)
+
+    def get_university_by_id(self, university_id: str) -> Optional[UniversityView]:
         """Get a specific university by ID with enhanced fields for frontend"""
-        for uni in self.universities:
-            if uni.get("id") == university_id:
-                # Return enhanced version with mapped field names for frontend compatibility
-                enhanced = uni.copy()
-
-                # Map backend fields to frontend expected fields
-                enhanced["university_id"] = uni.get("id")
-                enhanced["university_name"] = uni.get("name")
-
-                # Map cost fields - ensure it's a number
-                cost_data = uni.get("estimatedAnnualCostUSD", 0)
-                if isinstance(cost_data, dict):
-                    cost = cost_data.get("total", 0)
-                else:
-                    cost = cost_data
-                enhanced["estimated_total_cost_usd"] = int(cost) if cost else 0
-
-                # Map other fields
-                degrees_offered = uni.get("degreesOffered", [])
-                fields = uni.get("fields", [])
-                enhanced["degree_type"] = degrees_offered[0] if degrees_offered else "Masters"
-                enhanced["field_of_study"] = fields[0] if fields else "Computer Science"
-                enhanced["program_name"] = f"{enhanced['degree_type']} in {enhanced['field_of_study']}"
-                enhanced["program_duration_years"] = 2  # Default
-
-                # Add difficulty/competition level
-                difficulty = uni.get("acceptanceDifficulty", "Medium")
-                enhanced["competition_level"] = difficulty
-                enhanced["acceptance_rate_estimate"] = difficulty
-
-                # Add defaults for other expected fields
-                enhanced["average_salary_usd"] = 85000
-                enhanced["minimum_gpa_estimate"] = "3.0"
-                enhanced["average_gpa_estimate"] = "3.5"
-                enhanced["strength_tags"] = []
-                enhanced["cost_level"] = uni.get("budgetTier", "Medium")
-                enhanced["match_score"] = 0  # Default match score (will be overridden by recommendation system)
-
-                # Add city if available (from meta, state, or default)
-                meta = uni.get("meta", {})
-                enhanced["city"] = meta.get("city") or uni.get("state") or uni.get("city") or ""
-
-                return enhanced
-        return None
+        snapshot = self._snapshot
+        pos = snapshot.id_positions.get(university_id)
+        if pos is None:
+            return None
+        return self._enhance_university(snapshot.universities[pos], snapshot.attributes[pos])
+
+    def get_universities_by_ids(self, university_ids: List[str]) -> Dict[str, UniversityView]:
+        """
+        Get several universities at once, keyed by ID
+        Unknown IDs are left out of the result
+        """
+        snapshot = self._snapshot
+        found = {}
+        for university_id in university_ids:
+            if university_id in found:
+                continue
+            pos = snapshot.id_positions.get(university_id)
+            if pos is not None:
+                found[university_id] = self._enhance_university(
+                    snapshot.universities[pos], snapshot.attributes[pos]
+                )
+        return found
+
+    def resolve_university_name(
+        self,
+        university_name: str,
+        university_ids: Optional[List[str]] = None,
+        limit: int = 5,
+    ) -> Dict:
+        """
+        Resolve a free-text university name (full name, alias, acronym or misspelling)
+        university_ids restricts the search, e.g. to a user's shortlist.
+        Returns {"university_id": ID or None if not found / ambiguous, "candidates": [...]}
+        where candidates are the best matches as {"id", "name", "score", "match"}
+        """
+        snapshot = self._snapshot
+        positions = None
+        if university_ids is not None:
+            positions = sorted({
+                snapshot.id_positions[uni_id] for uni_id in university_ids
+                if uni_id in snapshot.id_positions
+            })
+        matches = snapshot.name_index.search(university_name, positions=positions, limit=limit)
+
+        candidates = []
+        for match in matches:
+            uni = snapshot.universities[match["position"]]
+            candidates.append({
+                "id": uni.get("id"),
+                "name": uni.get("name"),
+                "score": match["score"],
+                "match": match["match"],
+            })
+
+        picked = pick_match(matches)
+        return {
+            "university_id": candidates[matches.index(picked)]["id"] if picked else None,
+            "candidates": candidates,
+        }
+
+    def _attributes_for(self, university: Dict) -> UniversityAttributes:
+        """Precompiled attributes when university is a catalog record, else compiled now"""
+        snapshot = self._snapshot
+        if type(university) is UniversityView:
+            university = university.base
+        pos = snapshot.id_positions.get(university.get("id"))
+        if pos is not None and snapshot.universities[pos] is university:
+            return snapshot.attributes[pos]
+        return UniversityAttributes(university)
+
+    def _enhance_university(self, uni: Dict, attrs: Optional[UniversityAttributes] = None) -> UniversityView:
+        """Return enhanced version with mapped field names for frontend compatibility"""
+        if attrs is None:
+            attrs = self._attributes_for(uni)
+
+        return UniversityView(uni, {
+            # Map backend fields to frontend expected fields
+            "university_id": uni.get("id"),
+            "university_name": uni.get("name"),
+            "estimated_total_cost_usd": attrs.estimated_total_cost_usd,
+
+            # Map other fields
+            "degree_type": attrs.degree_type,
+            "field_of_study": attrs.field_of_study,
+            "program_name": attrs.program_name,
+            "program_duration_years": 2,  # Default
+
+            # Add difficulty/competition level
+            "competition_level": attrs.difficulty,
+            "acceptance_rate_estimate": attrs.difficulty,
+
+            # Add defaults for other expected fields
+            "average_salary_usd": 85000,
+            "minimum_gpa_estimate": "3.0",
+            "average_gpa_estimate": "3.5",
+            "strength_tags": [],
+            "cost_level": attrs.listing_cost_level,
+            "match_score": 0,  # Default match score (will be overridden by recommendation system)
+
+            # City from meta, state, or default (resolved at load)
+            "city": attrs.city,
+        })
 
     def filter_universities(
         self,
@@ -91,69 +308,180 @@ class UniversityService:
         preferred_countries: Optional[List[str]] = None,
         budget_max: Optional[float] = None,
         target_intake_year: Optional[int] = None,
-    ) -> List[Dict]:
+    ) -> UniversityViews:
         """
         Filter universities based on user profile
+        Returns a read-only sequence of views over the matching catalog records
         """
-        filtered = self.universities
-
-        # Filter by degree type (degreesOffered is an array)
-        if target_degree:
-            filtered = [u for u in filtered if target_degree in u.get("degreesOffered", [])]
-
-        # Filter by field of study (fields is an array - flexible matching with related fields)
-        if field_of_study:
-            field_lower = field_of_study.lower()
-
-            # Define related field mappings (user query -> acceptable university field keywords)
-            related_fields = {
-                "artificial intelligence": ["computer science", "data science", "machine learning", "ai"],
-                "computer science": ["software engineering", "data science", "artificial intelligence", "machine learning"],
-                "data science": ["computer science", "artificial intelligence", "machine learning", "data analytics"],
-                "business": ["mba", "management", "finance", "economics", "business administration"],
-                "engineering": ["computer science", "software engineering", "robotics", "computer engineering"],
-                "law": ["law", "ll.m", "corporate law", "international law", "business law"],
-                "cybersecurity": ["computer science", "cybersecurity", "software engineering"],
-                "economics": ["economics", "finance", "business", "data science"],
-                "finance": ["finance", "economics", "business", "management"],
-            }
+        return self._filter_views(
+            self._snapshot,
+            target_degree=target_degree,
+            field_of_study=field_of_study,
+            preferred_countries=preferred_countries,
+            budget_max=budget_max,
+            target_intake_year=target_intake_year,
+        )
 
-            # Get related fields for the user's field of study
-            acceptable_fields = [field_lower]
-            for key, values in related_fields.items():
-                if key in field_lower:
-                    acceptable_fields.extend(values)
-
-            filtered = [
-                u for u in filtered
-                if any(
-                    any(field in uni_field.lower() for field in acceptable_fields)
-                    for uni_field in u.get("fields", [])
-                )
-            ]
+    @staticmethod
+    def _filter_views(snapshot: CatalogSnapshot, **filters) -> UniversityViews:
+        positions = snapshot.filter_positions(**filters)
+        return UniversityViews(snapshot.universities, None if positions is None else positions.tolist())
 
-        # Filter by countries
-        if preferred_countries:
-            filtered = [
-                u for u in filtered
-                if u.get("country") in preferred_countries
-            ]
+    def list_universities(
+        self,
+        target_degree: Optional[str] = None,
+        preferred_countries: Optional[List[str]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict:
+        """
+        One page of the (optionally filtered) catalog, in catalog order
+        cursor is the previous page's next_cursor. It is tied to the catalog version,
+        so paging across a reload raises ValueError instead of skipping or repeating records.
+        Returns {"universities": views, "total_count": matches, "next_cursor": str or None}
+        """
+        snapshot = self._snapshot
+        matches = self._filter_views(
+            snapshot,
+            target_degree=target_degree,
+            preferred_countries=preferred_countries,
+            budget_max=budget_max,
+            target_intake_year=target_intake_year,
+        )
+        return self._page(snapshot, matches, cursor, limit)
 
-        # Filter by budget (using estimatedAnnualCostUSD.total)
-        if budget_max:
-            filtered = [
-                u for u in filtered
-                if u.get("estimatedAnnualCostUSD", {}).get("total", 0) <= budget_max
-            ]
+    def search_universities(
+        self,
+        facets: Optional[Dict[str, List[str]]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict:
+        """
+        Faceted search: universities matching the selected facet values plus counts per facet value
+        facets maps facet names (see university_facets.FACETS) to accepted values; a
+        university matches a facet if it has any of them. Paging works as in list_universities.
+        Returns {"universities", "total_count", "next_cursor", "facets": {facet: {value: count}}}
+        """
+        snapshot = self._snapshot
+        facet_index = snapshot.facet_index
+        unknown = set(facets or {}) - set(facet_index.keys)
+        if unknown:
+            raise ValueError(f"unknown facet: {', '.join(sorted(unknown))}")
+
+        # Non-facet filters narrow the base every count starts from
+        mask = snapshot.filter_mask(budget_max=budget_max, target_intake_year=target_intake_year)
+        base = None if mask is None else facet_index.pack(mask)
+
+        positions, counts = facet_index.search(facets or {}, base)
+        if len(positions) == len(snapshot.universities):
+            matches = UniversityViews(snapshot.universities)
+        else:
+            matches = UniversityViews(snapshot.universities, positions.tolist())
+        page = self._page(snapshot, matches, cursor, limit)
+        page["facets"] = counts
+        return page
 
-        # Filter by intake year (intakeYears is an array)
-        if target_intake_year:
-            filtered = [
-                u for u in filtered
-                if target_intake_year in u.get("intakeYears", [])
-            ]
+    def search_universities_by_text(self, query: str, limit: int = 10) -> List[UniversityView]:
+        """
+        Full-text search over university names, fields, states and countries
+        Returns catalog records ranked by BM25 relevance, each with its search_score
+        """
+        snapshot = self._snapshot
+        if snapshot.text_index is None:
+            return []
+        return [
+            UniversityView(snapshot.universities[pos], {"search_score": round(score, 3)})
+            for pos, score in snapshot.text_index.search(query, limit)
+        ]
 
-        return filtered
+    def get_similar_universities(
+        self,
+        university_id: str,
+        limit: int = 10,
+        cheaper: bool = False,
+        budget_max: Optional[float] = None,
+        preferred_countries: Optional[List[str]] = None,
+    ) -> Optional[List[UniversityView]]:
+        """
+        Universities most like the given one (cost, ranking, difficulty, country, fields, exams)
+        cheaper keeps only universities costing less than it; budget_max and
+        preferred_countries filter like recommendations. Returns None for an unknown ID,
+        else enhanced views, most similar first, with similarity (0-1), shared_fields
+        and cost_difference_usd
+        """
+        snapshot = self._snapshot
+        pos = snapshot.id_positions.get(university_id)
+        if pos is None:
+            return None
+
+        allowed = snapshot.filter_mask(preferred_countries=preferred_countries, budget_max=budget_max)
+        if cheaper:
+            cheaper_mask = snapshot.columns.cost_total < snapshot.columns.cost_total[pos]
+            allowed = cheaper_mask if allowed is None else allowed & cheaper_mask
+
+        reference_fields = set(snapshot.universities[pos].get("fields", []))
+        reference_cost = snapshot.attributes[pos].estimated_total_cost_usd
+        similar = []
+        for other, distance in snapshot.similarity_index.nearest(pos, limit, allowed):
+            uni = snapshot.universities[other]
+            attrs = snapshot.attributes[other]
+            similar.append(self._enhance_university(uni, attrs).layer(
+                similarity=round(1 / (1 + distance), 3),
+                shared_fields=[f for f in uni.get("fields", []) if f in reference_fields],
+                cost_difference_usd=attrs.estimated_total_cost_usd - reference_cost,
+            ))
+        return similar
+
+    def _page(self, snapshot: CatalogSnapshot, matches: UniversityViews, cursor: Optional[str], limit: Optional[int]) -> Dict:
+        """One page of matches (views in catalog order), starting after cursor"""
+        positions = matches.positions
+
+        start = 0
+        after = self._cursor_position(cursor, snapshot.version)
+        if after is not None:
+            start = bisect.bisect_right(positions, after)
+        end = len(positions) if limit is None else min(start + limit, len(positions))
+
+        return {
+            "universities": matches if (start, end) == (0, len(positions)) else matches[start:end],
+            "total_count": len(positions),
+            "next_cursor": self._encode_cursor(snapshot.version, positions[end - 1]) if end < len(positions) else None,
+        }
+
+    def cursor_position(self, cursor: Optional[str]) -> Optional[int]:
+        """
+        Catalog position a page cursor resumes after (None for the first page)
+        Raises ValueError for a malformed cursor or one from another catalog version,
+        so routes can reject it before answering from a cache
+        """
+        return self._cursor_position(cursor, self.catalog_version)
+
+    @classmethod
+    def _cursor_position(cls, cursor: Optional[str], version: str) -> Optional[int]:
+        if not cursor:
+            return None
+        cursor_version, after = cls._decode_cursor(cursor)
+        if cursor_version != version:
+            raise ValueError("cursor is from an older catalog version, start again from the first page")
+        return after
+
+    @staticmethod
+    def _encode_cursor(version: str, position: int) -> str:
+        """Opaque page cursor: catalog version plus the last catalog position served"""
+        return base64.urlsafe_b64encode(f"{version}:{position}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            version, position = raw.rsplit(":", 1)
+            return version, int(position)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("invalid cursor")
 
     def score_university(
         self,
@@ -165,7 +493,7 @@ class UniversityService:
         user_toefl: Optional[int] = None,
         user_budget: Optional[float] = None,
         user_countries: Optional[List[str]] = None,
-    ) -> Dict:
+    ) -> UniversityView:
         """
         Score a university for a user using normalized 0-100 scale
         Returns the university with match_score, category, fit_reasons, risk_factors, etc.
@@ -181,11 +509,13 @@ class UniversityService:
         reasons = []
         risks = []
 
+        # Static thresholds, costs and tiers are compiled once per university
+        attrs = self._attributes_for(university)
+
         # === COMPONENT 1: GPA Match (35 points) ===
-        academic_reqs = university.get("academicRequirements", {})
-        min_gpa = academic_reqs.get("gpaMin", 3.0)
-        avg_gpa = academic_reqs.get("gpaCompetitive", 3.5)
-        competitive_gpa = avg_gpa + 0.2  # Competitive threshold
+        min_gpa = attrs.gpa_min
+        avg_gpa = attrs.gpa_competitive
+        competitive_gpa = attrs.gpa_strong  # Competitive threshold (average + 0.2)
 
         if user_gpa:
             if user_gpa >= competitive_gpa:
@@ -208,14 +538,12 @@ class UniversityService:
         # === COMPONENT 2: Exam Readiness (25 points) ===
         exam_score = 0
         exam_summary = []
-        exam_reqs = university.get("examRequirements", {})
 
         # Check GRE requirements
-        gre_info = exam_reqs.get("gre", {})
-        if gre_info.get("required") or gre_info.get("recommended"):
-            min_gre = gre_info.get("minTotal") or 310
-            avg_gre = min_gre + 10  # Estimate avg as 10 points above min
-            exam_summary.append(f"GRE {avg_gre}+")
+        if attrs.gre_considered:
+            min_gre = attrs.gre_min
+            avg_gre = attrs.gre_avg  # Estimated as 10 points above min
+            exam_summary.append(attrs.gre_summary)
 
             if user_gre:
                 if user_gre >= avg_gre + 10:
@@ -235,11 +563,10 @@ class UniversityService:
                 risks.append(f"GRE required but not provided (need {avg_gre}+)")
 
         # Check GMAT requirements
-        gmat_info = exam_reqs.get("gmat", {})
-        if gmat_info.get("required") or gmat_info.get("recommended"):
-            min_gmat = gmat_info.get("minScore") or 650
-            avg_gmat = min_gmat + 30  # Estimate avg as 30 points above min
-            exam_summary.append(f"GMAT {avg_gmat}+")
+        if attrs.gmat_considered:
+            min_gmat = attrs.gmat_min
+            avg_gmat = attrs.gmat_avg  # Estimated as 30 points above min
+            exam_summary.append(attrs.gmat_summary)
 
             if user_gmat:
                 if user_gmat >= avg_gmat + 30:
@@ -262,14 +589,12 @@ class UniversityService:
             reasons.append("No GRE/GMAT required")
 
         # Check English proficiency (IELTS/TOEFL)
-        ielts_info = exam_reqs.get("ielts", {})
-        toefl_info = exam_reqs.get("toefl", {})
-        ielts_min = ielts_info.get("minScore", 6.5)
-        toefl_min = toefl_info.get("minScore", 90)
+        ielts_min = attrs.ielts_min
+        toefl_min = attrs.toefl_min
 
         english_ok = False
         if user_ielts:
-            exam_summary.append(f"IELTS {ielts_min}+")
+            exam_summary.append(attrs.ielts_summary)
             if user_ielts >= ielts_min + 0.5:
                 english_ok = True
                 reasons.append(f"Strong IELTS score ({user_ielts})")
@@ -279,7 +604,7 @@ class UniversityService:
             else:
                 risks.append(f"IELTS ({user_ielts}) below minimum ({ielts_min})")
         elif user_toefl:
-            exam_summary.append(f"TOEFL {toefl_min}+")
+            exam_summary.append(attrs.toefl_summary)
             if user_toefl >= toefl_min + 10:
                 english_ok = True
                 reasons.append(f"Strong TOEFL score ({user_toefl})")
@@ -299,9 +624,8 @@ class UniversityService:
         score += exam_score
 
         # === COMPONENT 3: Budget Fit (20 points) ===
-        cost_info = university.get("estimatedAnnualCostUSD", {})
-        total_cost = cost_info.get("total", 0)
-        cost_level = university.get("budgetTier", "Unknown")
+        total_cost = attrs.total_cost
+        cost_level = attrs.budget_tier
 
         if user_budget and total_cost > 0:
             cost_ratio = total_cost / user_budget
@@ -331,7 +655,7 @@ class UniversityService:
             score += 10
 
         # === COMPONENT 4: Country Preference (10 points) ===
-        uni_country = university.get("country", "")
+        uni_country = attrs.country
         if user_countries and uni_country in user_countries:
             score += 10
             reasons.append(f"Located in preferred country ({uni_country})")
@@ -341,35 +665,18 @@ class UniversityService:
                 risks.append(f"Not in preferred countries")
 
         # === COMPONENT 5: University Ranking (10 points) ===
-        ranking_tier = university.get("rankingTier", "")
-
-        if "Top10" in ranking_tier or "Top 10" in ranking_tier:
-            score += 10
-            reasons.append(f"Top 10 ranked university")
-        elif "Top20" in ranking_tier or "Top 20" in ranking_tier:
-            score += 9
-            reasons.append(f"Top 20 ranked university")
-        elif "Top50" in ranking_tier or "Top 50" in ranking_tier:
-            score += 9
-            reasons.append(f"Top 50 ranked university")
-        elif "Top100" in ranking_tier or "Top 100" in ranking_tier:
-            score += 8
-            reasons.append(f"Top 100 ranked university")
-        elif "Top200" in ranking_tier or "Top 200" in ranking_tier:
-            score += 7
-            reasons.append(f"Top 200 ranked university")
-        elif "Top300" in ranking_tier or "Top 300" in ranking_tier:
-            score += 6
-        elif "Top500" in ranking_tier or "Top 500" in ranking_tier:
-            score += 6
-        else:
-            score += 5
+        # Tier ordinal resolved at load: Top10 (10), Top20/Top50 (9), Top100 (8),
+        # Top200 (7), Top300/Top500 (6), anything else (5)
+        ranking_tier = attrs.ranking_tier
+        score += int(RANKING_POINTS[ranking_tier])
+        if ranking_tier < len(RANKING_REASONS):
+            reasons.append(RANKING_REASONS[ranking_tier])
 
         # Cap final score at 100 (maximum possible)
         score = min(score, 100)
 
         # === Determine Acceptance Chance ===
-        difficulty = university.get("acceptanceDifficulty", "Medium")
+        difficulty = attrs.difficulty
 
         if score >= 80 and difficulty not in ["Very High", "High"]:
             acceptance_chance = "Strong"
@@ -395,51 +702,97 @@ class UniversityService:
             if category == "Safe":
                 reasons.append("Accessible admissions process")
 
-        # Build enhanced university object
-        enhanced_uni = university.copy()
-
-        # Add backward compatibility fields for frontend
-        enhanced_uni["university_id"] = university.get("id")  # Map id to university_id for frontend
-        enhanced_uni["university_name"] = university.get("name")  # Map name to university_name for frontend
-
-        # Map new fields to old field names for frontend compatibility
-        degrees_offered = university.get("degreesOffered", [])
-        fields = university.get("fields", [])
-        enhanced_uni["degree_type"] = degrees_offered[0] if degrees_offered else "Masters"
-        enhanced_uni["field_of_study"] = fields[0] if fields else "Computer Science"
-        enhanced_uni["program_name"] = f"{enhanced_uni['degree_type']} in {enhanced_uni['field_of_study']}"
-        enhanced_uni["program_duration_years"] = 2  # Default to 2 years for Masters
-        enhanced_uni["estimated_total_cost_usd"] = total_cost
-
-        # Add old naming for competition and acceptance
-        enhanced_uni["competition_level"] = difficulty
-        enhanced_uni["acceptance_rate_estimate"] = difficulty
-
-        # Add GPA fields for frontend
-        enhanced_uni["minimum_gpa_estimate"] = min_gpa
-        enhanced_uni["average_gpa_estimate"] = avg_gpa
-
-        # Add default values for fields not in new schema
-        enhanced_uni["average_salary_usd"] = 85000  # Default average salary
-        enhanced_uni["strength_tags"] = []  # Empty for now
-
         # Derive strength tags from budgetTier and acceptanceDifficulty
+        strength_tags = []
+        if cost_level == "Low":
+            strength_tags.append("Budget-friendly")
+        if difficulty == "Low":
+            strength_tags.append("Accessible")
+        elif difficulty == "Very High":
+            strength_tags.append("Prestigious")
+
+        # Enhanced university: scores layered over the shared record, no copy
+        return UniversityView(university, {
+            # Add backward compatibility fields for frontend
+            "university_id": university.get("id"),  # Map id to university_id for frontend
+            "university_name": university.get("name"),  # Map name to university_name for frontend
+
+            # Map new fields to old field names for frontend compatibility
+            "degree_type": attrs.degree_type,
+            "field_of_study": attrs.field_of_study,
+            "program_name": attrs.program_name,
+            "program_duration_years": 2,  # Default to 2 years for Masters
+            "estimated_total_cost_usd": total_cost,
+
+            # Add old naming for competition and acceptance
+            "competition_level": difficulty,
+            "acceptance_rate_estimate": difficulty,
+
+            # Add GPA fields for frontend
+            "minimum_gpa_estimate": min_gpa,
+            "average_gpa_estimate": avg_gpa,
+
+            # Add default values for fields not in new schema
+            "average_salary_usd": 85000,  # Default average salary
+            "strength_tags": strength_tags,
+
+            "match_score": int(score),  # Ensure 0-100 integer
+            "category": category,
+            "fit_reasons": reasons[:3],  # Top 3 reasons
+            "risk_factors": risks[:3],  # Top 3 risks
+            "cost_level": cost_level,
+            "acceptance_chance": acceptance_chance,
+            "exam_requirements_summary": exam_summary,
+        })
+
+    def _build_scored_university(
+        self, snapshot: CatalogSnapshot, scores: BatchScores, row: int, profile: Dict
+    ) -> UniversityView:
+        """Build the enhanced university view for one row of a batch score (same shape as score_university)"""
+        pos = int(scores.positions[row])
+        university = snapshot.universities[pos]
+        attrs = snapshot.attributes[pos]
+        explained = explain_scores(attrs, scores, row, **profile)
+
+        difficulty = attrs.difficulty
+        cost_level = explained["cost_level"]
+
+        strength_tags = []
         if cost_level == "Low":
-            enhanced_uni["strength_tags"].append("Budget-friendly")
+            strength_tags.append("Budget-friendly")
         if difficulty == "Low":
-            enhanced_uni["strength_tags"].append("Accessible")
+            strength_tags.append("Accessible")
         elif difficulty == "Very High":
-            enhanced_uni["strength_tags"].append("Prestigious")
+            strength_tags.append("Prestigious")
+
+        return UniversityView(university, {
+            # Add backward compatibility fields for frontend
+            "university_id": university.get("id"),
+            "university_name": university.get("name"),
+
+            "degree_type": attrs.degree_type,
+            "field_of_study": attrs.field_of_study,
+            "program_name": attrs.program_name,
+            "program_duration_years": 2,
+            "estimated_total_cost_usd": attrs.total_cost,
 
-        enhanced_uni["match_score"] = int(score)  # Ensure 0-100 integer
-        enhanced_uni["category"] = category
-        enhanced_uni["fit_reasons"] = reasons[:3]  # Top 3 reasons
-        enhanced_uni["risk_factors"] = risks[:3]  # Top 3 risks
-        enhanced_uni["cost_level"] = cost_level
-        enhanced_uni["acceptance_chance"] = acceptance_chance
-        enhanced_uni["exam_requirements_summary"] = exam_summary
+            "competition_level": difficulty,
+            "acceptance_rate_estimate": difficulty,
 
-        return enhanced_uni
+            "minimum_gpa_estimate": attrs.gpa_min,
+            "average_gpa_estimate": attrs.gpa_competitive,
+
+            "average_salary_usd": 85000,
+            "strength_tags": strength_tags,
+
+            "match_score": int(scores.match_score[row]),
+            "category": CATEGORY_NAMES[scores.category[row]],
+            "fit_reasons": explained["fit_reasons"],
+            "risk_factors": explained["risk_factors"],
+            "cost_level": cost_level,
+            "acceptance_chance": ACCEPTANCE_NAMES[scores.acceptance[row]],
+            "exam_requirements_summary": explained["exam_requirements_summary"],
+        })
 
     def _categorize_university(self, score: int, university: Dict) -> str:
         """
@@ -494,49 +847,460 @@ class UniversityService:
         user_gmat: Optional[int] = None,
         user_ielts: Optional[float] = None,
         user_toefl: Optional[int] = None,
-    ) -> Dict[str, List[Dict]]:
+        limit: Optional[int] = None,
+        category: Optional[str] = None,
+    ) -> Dict:
         """
         Get recommended universities categorized by Dream/Target/Safe
+
+        limit caps each returned list (top matches only); category ("dream",
+        "target" or "safe") restricts the lists to one category. "counts" always
+        holds the full number of matches per category, ignoring limit and category.
+        Results are cached per profile fingerprint and catalog version; the returned
+        dict is shared with other callers and must be treated as read-only.
         """
-        # Filter universities
-        filtered = self.filter_universities(
-            target_degree=target_degree,
-            field_of_study=field_of_study,
-            preferred_countries=preferred_countries,
-            budget_max=budget_max,
-            target_intake_year=target_intake_year,
+        cache_key = self._profile_fingerprint(
+            target_degree, field_of_study, preferred_countries, budget_max, target_intake_year,
+            user_gpa, user_gre, user_gmat, user_ielts, user_toefl, limit, category,
         )
-
-        # Score each university
-        scored = [
-            self.score_university(
-                uni,
+        # One snapshot for the whole request, even if a reload swaps it meanwhile
+        snapshot = self._snapshot
+        recommendations = self.recommendation_cache.get(cache_key, snapshot.version)
+        if recommendations is None:
+            recommendations = self._compute_recommendations(
+                snapshot,
+                target_degree=target_degree,
+                field_of_study=field_of_study,
+                preferred_countries=preferred_countries,
+                budget_max=budget_max,
+                target_intake_year=target_intake_year,
                 user_gpa=user_gpa,
                 user_gre=user_gre,
                 user_gmat=user_gmat,
                 user_ielts=user_ielts,
                 user_toefl=user_toefl,
-                user_budget=budget_max,
-                user_countries=preferred_countries,
+                limit=limit,
+                category=category,
             )
-            for uni in filtered
-        ]
+            self.recommendation_cache.put(cache_key, snapshot.version, recommendations)
+        return recommendations
+
+    @staticmethod
+    def _profile_fingerprint(
+        target_degree, field_of_study, preferred_countries, budget_max, target_intake_year,
+        user_gpa, user_gre, user_gmat, user_ielts, user_toefl, limit, category,
+    ) -> tuple:
+        """
+        Normalized cache key for a recommendation request
+        Country order and field case don't change results; numbers keep their repr
+        because scores are echoed into reason strings (7 and 7.0 print differently)
+        """
+        return (
+            target_degree,
+            field_of_study.lower() if field_of_study else None,
+            tuple(sorted(set(preferred_countries))) if preferred_countries else None,
+            repr(budget_max),
+            target_intake_year,
+            repr(user_gpa),
+            repr(user_gre),
+            repr(user_gmat),
+            repr(user_ielts),
+            repr(user_toefl),
+            limit,
+            category.lower() if category else None,
+        )
 
-        # Sort by match score (descending)
-        scored.sort(key=lambda x: x["match_score"], reverse=True)
+    def get_cache_stats(self) -> Dict:
+        """Recommendation cache counters, tagged with the current catalog version"""
+        return {"catalog_version": self.catalog_version, **self.recommendation_cache.stats()}
 
-        # Group by category
-        dream = [u for u in scored if u["category"] == "Dream"]
-        target = [u for u in scored if u["category"] == "Target"]
-        safe = [u for u in scored if u["category"] == "Safe"]
+    def stream_recommended_universities(
+        self,
+        target_degree: Optional[str] = None,
+        field_of_study: Optional[str] = None,
+        preferred_countries: Optional[List[str]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+        user_gpa: Optional[float] = None,
+        user_gre: Optional[int] = None,
+        user_gmat: Optional[int] = None,
+        user_ielts: Optional[float] = None,
+        user_toefl: Optional[int] = None,
+        limit: Optional[int] = None,
+        category: Optional[str] = None,
+    ) -> Dict:
+        """
+        Recommendations as a single stream instead of dream/target/safe/all lists
+        Returns {"counts": ..., "universities": iterator} where the iterator yields the
+        "all" list of get_recommended_universities (best match first, each entry carrying
+        its category). Entries are built as they are consumed and not cached, unless the
+        same request is already in the recommendation cache.
+        """
+        cache_key = self._profile_fingerprint(
+            target_degree, field_of_study, preferred_countries, budget_max, target_intake_year,
+            user_gpa, user_gre, user_gmat, user_ielts, user_toefl, limit, category,
+        )
+        snapshot = self._snapshot
+        cached = self.recommendation_cache.get(cache_key, snapshot.version)
+        if cached is not None:
+            return {"counts": cached["counts"], "universities": iter(cached["all"])}
+
+        scores, profile, rows_by_category, counts = self._score_candidates(
+            snapshot,
+            target_degree=target_degree,
+            field_of_study=field_of_study,
+            preferred_countries=preferred_countries,
+            budget_max=budget_max,
+            target_intake_year=target_intake_year,
+            user_gpa=user_gpa,
+            user_gre=user_gre,
+            user_gmat=user_gmat,
+            user_ielts=user_ielts,
+            user_toefl=user_toefl,
+        )
+        rows = rows_by_category.get(category.lower(), []) if category else range(len(scores))
+        ordered = self._top_rows(scores.match_score.tolist(), rows, limit)
+        return {
+            "counts": counts,
+            "universities": (
+                self._build_scored_university(snapshot, scores, row, profile) for row in ordered
+            ),
+        }
+
+    def compare_universities(self, university_ids: List[str], profile: Optional[Dict] = None) -> Dict:
+        """
+        Score several universities side by side for one profile (score_batch keyword arguments)
+        IDs are resolved in one pass and scored in one batch. Returns the scored views in
+        request order (duplicates dropped), "columns" with one value per university for each
+        COMPARISON_COLUMNS row plus exam minimums (None where an exam isn't considered), and
+        "missing" IDs.
+        """
+        snapshot = self._snapshot
+        found = []
+        missing = []
+        for university_id in dict.fromkeys(university_ids):
+            pos = snapshot.id_positions.get(university_id)
+            if pos is None:
+                missing.append(university_id)
+            else:
+                found.append(pos)
 
+        profile = profile or {}
+        scores = score_batch(snapshot.columns, np.array(found, dtype=np.int64), **profile)
+        universities = [
+            self._build_scored_university(snapshot, scores, row, profile) for row in range(len(found))
+        ]
+        attributes = [snapshot.attributes[pos] for pos in found]
+
+        columns = {
+            name: [uni.get(key) for uni in universities]
+            for name, key in COMPARISON_COLUMNS.items()
+        }
+        columns["ielts_minimum"] = [attrs.ielts_min for attrs in attributes]
+        columns["toefl_minimum"] = [attrs.toefl_min for attrs in attributes]
+        columns["gre_minimum"] = [attrs.gre_min if attrs.gre_considered else None for attrs in attributes]
+        columns["gmat_minimum"] = [attrs.gmat_min if attrs.gmat_considered else None for attrs in attributes]
+        return {"universities": universities, "columns": columns, "missing": missing}
+
+    def get_pareto_frontier(
+        self,
+        target_degree: Optional[str] = None,
+        field_of_study: Optional[str] = None,
+        preferred_countries: Optional[List[str]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+        user_gpa: Optional[float] = None,
+        user_gre: Optional[int] = None,
+        user_gmat: Optional[int] = None,
+        user_ielts: Optional[float] = None,
+        user_toefl: Optional[int] = None,
+        category: Optional[str] = None,
+        layers: int = 1,
+    ) -> Dict:
+        """
+        Recommended universities no other candidate beats on cost, ranking and match score
+        Takes get_recommended_universities profile arguments; category ("dream", "target"
+        or "safe") limits the candidates. layers > 1 also returns the next frontiers (the
+        frontier of what is left once the previous ones are removed). Returns
+        {"candidates": count, "layers": [[views by cost, each with pareto_layer]]}
+        """
+        if category and category.lower() not in ("dream", "target", "safe"):
+            raise ValueError("category must be one of: dream, target, safe")
+        if not 1 <= layers <= MAX_PARETO_LAYERS:
+            raise ValueError(f"layers must be between 1 and {MAX_PARETO_LAYERS}")
+
+        snapshot = self._snapshot
+        scores, profile, rows_by_category, _ = self._score_candidates(
+            snapshot,
+            target_degree=target_degree,
+            field_of_study=field_of_study,
+            preferred_countries=preferred_countries,
+            budget_max=budget_max,
+            target_intake_year=target_intake_year,
+            user_gpa=user_gpa,
+            user_gre=user_gre,
+            user_gmat=user_gmat,
+            user_ielts=user_ielts,
+            user_toefl=user_toefl,
+        )
+        if category:
+            rows = np.array(rows_by_category[category.lower()], dtype=np.int64)
+        else:
+            rows = np.arange(len(scores))
+
+        # Skyline over the batch score arrays; only frontier rows become views
+        frontiers = pareto_layers(
+            snapshot.columns.cost_total[scores.positions[rows]],
+            snapshot.columns.ranking_rank[scores.positions[rows]],
+            scores.match_score[rows],
+            layers,
+        )
         return {
-            "dream": dream,
-            "target": target,
-            "safe": safe,
-            "all": scored,
+            "candidates": len(rows),
+            "layers": [
+                [
+                    self._build_scored_university(snapshot, scores, int(rows[i]), profile).layer(pareto_layer=layer)
+                    for i in frontier.tolist()
+                ]
+                for layer, frontier in enumerate(frontiers, start=1)
+            ],
         }
 
+    def evaluate_scenarios(self, base: Dict, scenarios: List[Dict], limit: int = 10) -> Dict:
+        """
+        What-if recommendations: how the Dream/Target/Safe lists change under other profiles
+        base holds get_recommended_universities profile arguments; each scenario overrides
+        some SCENARIO_FIELDS of it (raises ValueError for others). The degree, field and
+        intake filters are applied once for all scenarios, and every scenario is scored in
+        one batch over the union of their candidates. Returns the base counts and, per
+        scenario (in order), its counts, category movements and the `limit` universities that moved
+        (changed category or left/entered the candidates), biggest score change first.
+        """
+        for overrides in scenarios:
+            unknown = set(overrides) - set(SCENARIO_FIELDS)
+            if unknown:
+                raise ValueError(f"Scenarios can't change: {', '.join(sorted(unknown))}")
+        snapshot = self._snapshot
+        profiles = [base] + [{**base, **overrides} for overrides in scenarios]
+
+        # Filters shared by every scenario, then the budget/country part per distinct value
+        shared = snapshot.filter_mask(
+            target_degree=base.get("target_degree"),
+            field_of_study=base.get("field_of_study"),
+            target_intake_year=base.get("target_intake_year"),
+        )
+        varying = {}
+        masks = []
+        for profile in profiles:
+            countries = profile.get("preferred_countries")
+            key = (tuple(countries) if countries else None, profile.get("budget_max"))
+            if key not in varying:
+                varying[key] = snapshot.filter_mask(preferred_countries=countries, budget_max=key[1])
+            mask = varying[key]
+            masks.append(shared if mask is None else mask if shared is None else shared & mask)
+
+        # Score every profile over the union of their candidates
+        if any(mask is None for mask in masks):
+            positions = np.arange(snapshot.columns.size)
+        else:
+            positions = np.flatnonzero(np.logical_or.reduce(masks))
+        batches = score_profiles(snapshot.columns, positions, [
+            {
+                "user_gpa": profile.get("user_gpa"),
+                "user_gre": profile.get("user_gre"),
+                "user_gmat": profile.get("user_gmat"),
+                "user_ielts": profile.get("user_ielts"),
+                "user_toefl": profile.get("user_toefl"),
+                "user_budget": profile.get("budget_max"),
+                "user_countries": profile.get("preferred_countries"),
+            }
+            for profile in profiles
+        ])
+
+        # Category code per row, NOT_CANDIDATE where the profile's filters exclude the row
+        categories = []
+        for mask, scores in zip(masks, batches):
+            category = scores.category
+            if mask is not None:
+                category = np.where(mask[positions], category, NOT_CANDIDATE)
+            categories.append(category)
+
+        def counts(category: np.ndarray) -> Dict:
+            per_category = np.bincount(category[category != NOT_CANDIDATE], minlength=len(CATEGORY_NAMES))
+            result = {name.lower(): int(per_category[code]) for code, name in enumerate(CATEGORY_NAMES)}
+            result["all"] = int(per_category.sum())
+            return result
+
+        def category_name(code: int) -> Optional[str]:
+            return CATEGORY_NAMES[code] if code != NOT_CANDIDATE else None
+
+        base_category = categories[0]
+        base_score = batches[0].match_score.astype(np.int16)
+        results = []
+        for category, scores in zip(categories[1:], batches[1:]):
+            moved_rows = np.flatnonzero(category != base_category)
+            before = base_category[moved_rows]
+            after = category[moved_rows]
+            # (from, to) pairs counted in one bincount; NOT_CANDIDATE (-1) shifts to 0
+            pair_counts = np.bincount((before + 1) * 4 + (after + 1), minlength=16)
+            movements = [
+                {"from": category_name(pair // 4 - 1), "to": category_name(pair % 4 - 1), "count": int(count)}
+                for pair, count in enumerate(pair_counts.tolist()) if count
+            ]
+            movements.sort(key=lambda movement: -movement["count"])
+
+            # Score changes of the moved rows (a row outside the candidates counts as 0)
+            score_before = np.where(before != NOT_CANDIDATE, base_score[moved_rows], 0)
+            score_after = np.where(after != NOT_CANDIDATE, scores.match_score[moved_rows], 0)
+            order = np.lexsort((moved_rows, -np.abs(score_after.astype(np.int32) - score_before)))[:limit]
+            moved = []
+            for i in order.tolist():
+                uni = snapshot.universities[positions[moved_rows[i]]]
+                moved.append({
+                    "university_id": uni.get("id"),
+                    "university_name": uni.get("name"),
+                    "country": uni.get("country"),
+                    "from": category_name(before[i]),
+                    "to": category_name(after[i]),
+                    "match_score_before": int(score_before[i]) if before[i] != NOT_CANDIDATE else None,
+                    "match_score_after": int(score_after[i]) if after[i] != NOT_CANDIDATE else None,
+                })
+
+            # Mean score change over the universities that are candidates in both profiles
+            both = (base_category != NOT_CANDIDATE) & (category != NOT_CANDIDATE)
+            change = scores.match_score[both].astype(np.int32) - base_score[both]
+            results.append({
+                "counts": counts(category),
+                "moved_count": len(moved_rows),
+                "movements": movements,
+                "mean_match_score_change": round(float(change.mean()), 2) if len(change) else 0.0,
+                "moved": moved,
+            })
+
+        return {"base": {"counts": counts(base_category)}, "scenarios": results}
+
+    def _score_candidates(
+        self,
+        snapshot: CatalogSnapshot,
+        target_degree: Optional[str] = None,
+        field_of_study: Optional[str] = None,
+        preferred_countries: Optional[List[str]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+        user_gpa: Optional[float] = None,
+        user_gre: Optional[int] = None,
+        user_gmat: Optional[int] = None,
+        user_ielts: Optional[float] = None,
+        user_toefl: Optional[int] = None,
+    ) -> tuple:
+        """
+        Filter and batch-score the candidates for a profile
+        Returns (scores, scoring profile, score rows per category name, counts)
+        """
+        # Filter universities
+        positions = snapshot.filter_positions(
+            target_degree=target_degree,
+            field_of_study=field_of_study,
+            preferred_countries=preferred_countries,
+            budget_max=budget_max,
+            target_intake_year=target_intake_year,
+        )
+
+        if positions is None:
+            positions = np.arange(snapshot.columns.size)
+
+        profile = {
+            "user_gpa": user_gpa,
+            "user_gre": user_gre,
+            "user_gmat": user_gmat,
+            "user_ielts": user_ielts,
+            "user_toefl": user_toefl,
+            "user_budget": budget_max,
+            "user_countries": preferred_countries,
+        }
+
+        # Score all candidates in one batch (same results as score_university)
+        scores = score_batch(snapshot.columns, positions, **profile)
+
+        rows_by_category = {
+            name.lower(): np.flatnonzero(scores.category == code).tolist()
+            for code, name in enumerate(CATEGORY_NAMES)
+        }
+        counts = {name: len(rows) for name, rows in rows_by_category.items()}
+        counts["all"] = len(scores)
+        return scores, profile, rows_by_category, counts
+
+    @staticmethod
+    def _top_rows(match_scores: List[int], rows, limit: Optional[int]) -> List[int]:
+        """Rows by match score (descending); ties keep catalog order"""
+        key = lambda row: (-match_scores[row], row)
+        if limit is None:
+            return sorted(rows, key=key)
+        # Bounded heap: O(n log limit) instead of a full sort
+        return heapq.nsmallest(limit, rows, key=key)
+
+    def _compute_recommendations(
+        self,
+        snapshot: CatalogSnapshot,
+        target_degree: Optional[str] = None,
+        field_of_study: Optional[str] = None,
+        preferred_countries: Optional[List[str]] = None,
+        budget_max: Optional[float] = None,
+        target_intake_year: Optional[int] = None,
+        user_gpa: Optional[float] = None,
+        user_gre: Optional[int] = None,
+        user_gmat: Optional[int] = None,
+        user_ielts: Optional[float] = None,
+        user_toefl: Optional[int] = None,
+        limit: Optional[int] = None,
+        category: Optional[str] = None,
+    ) -> Dict:
+        """Filter, score and select recommendations (uncached)"""
+        scores, profile, rows_by_category, counts = self._score_candidates(
+            snapshot,
+            target_degree=target_degree,
+            field_of_study=field_of_study,
+            preferred_countries=preferred_countries,
+            budget_max=budget_max,
+            target_intake_year=target_intake_year,
+            user_gpa=user_gpa,
+            user_gre=user_gre,
+            user_gmat=user_gmat,
+            user_ielts=user_ielts,
+            user_toefl=user_toefl,
+        )
+        match_scores = scores.match_score.tolist()
+
+        all_rows = range(len(scores))
+        if category:
+            selected = category.lower()
+            all_rows = rows_by_category.get(selected, [])
+            rows_by_category = {
+                name: rows if name == selected else []
+                for name, rows in rows_by_category.items()
+            }
+
+        # Only selected rows are turned into views; a row shared by a category
+        # list and "all" is built once and appears as the same object in both
+        built = {}
+
+        def materialize(rows: List[int]) -> List[UniversityView]:
+            result = []
+            for row in rows:
+                if row not in built:
+                    built[row] = self._build_scored_university(snapshot, scores, row, profile)
+                result.append(built[row])
+            return result
+
+        recommendations = {
+            name: materialize(self._top_rows(match_scores, rows, limit))
+            for name, rows in rows_by_category.items()
+        }
+        recommendations["all"] = materialize(self._top_rows(match_scores, all_rows, limit))
+        recommendations["counts"] = counts
+
+        return recommendations
+
 
 # Global instance
 university_service = UniversityService()
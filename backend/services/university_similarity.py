@@ -0,0 +1,205 @@
+"""
+University Similarity
+Feature vectors per university and a nearest-neighbour index over them
+
+Every university becomes one weighted vector: standardized cost, ranking,
+acceptance difficulty and exam thresholds, plus its country (one-hot) and fields of
+study (multi-hot). Similar universities are the nearest vectors (squared Euclidean
+distance). Vectors come from the catalog columns and field masks, so compiled
+catalogs don't decode records to build them.
+
+Small catalogs are searched exactly. Larger ones are split into clusters of about
+CLUSTER_SIZE universities (k-means, an IVF index); a query only scores the members
+of the clusters nearest to it, so its cost doesn't grow with the catalog.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from services.university_columns import OTHER_DIFFICULTY, UniversityColumns
+
+# Relative weight of each feature group in the distance
+FEATURE_WEIGHTS = {
+    "cost": 1.5,
+    "ranking": 1.5,  # log of the tier's rank bound, so Top10 / Top20 / Top50 stay apart
+    "difficulty": 1.0,
+    "academics": 0.5,  # GPA and English test thresholds
+    "tests": 0.5,  # whether GRE/GMAT count, and their minimums
+    "country": 1.0,
+    "fields": 1.5,
+}
+
+# Catalogs up to this size are searched exactly
+EXACT_MAX_SIZE = 10_000
+
+# Approximate index: universities per cluster, clusters scored per query
+CLUSTER_SIZE = 256
+PROBE_CLUSTERS = 16
+
+# k-means training: sampled points per cluster and iterations (seeded, so rebuilds agree)
+TRAINING_POINTS_PER_CLUSTER = 40
+KMEANS_ITERATIONS = 10
+KMEANS_SEED = 42
+
+
+def _standardized(values: np.ndarray) -> np.ndarray:
+    """Zero mean, unit variance; missing values become the mean"""
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return np.zeros(len(values))
+    mean = values[finite].mean()
+    std = values[finite].std() or 1.0
+    return np.where(finite, (values - mean) / std, 0.0)
+
+
+def _ranking(rank: np.ndarray) -> np.ndarray:
+    """Log rank bound; unranked universities sit one doubling past the worst ranked one"""
+    rank = np.asarray(rank, dtype=np.float64)
+    ranked = np.isfinite(rank)
+    worst = rank[ranked].max() if ranked.any() else 1.0
+    return np.log(np.where(ranked, rank, 2 * worst))
+
+
+def build_features(columns: UniversityColumns, field_index: Dict[str, np.ndarray]) -> np.ndarray:
+    """Weighted feature matrix (one float32 row per catalog position)"""
+    size = columns.size
+    difficulty = columns.difficulty.astype(np.float64)
+    # Unknown difficulty sits between Medium and High rather than above Very High
+    difficulty[columns.difficulty == OTHER_DIFFICULTY] = 1.5
+
+    blocks = [
+        FEATURE_WEIGHTS["cost"] * _standardized(np.log1p(np.maximum(columns.cost_total, 0)))[:, None],
+        FEATURE_WEIGHTS["ranking"] * _standardized(_ranking(columns.ranking_rank))[:, None],
+        FEATURE_WEIGHTS["difficulty"] * _standardized(difficulty)[:, None],
+        FEATURE_WEIGHTS["academics"] * np.column_stack([
+            _standardized(columns.gpa_competitive),
+            _standardized(columns.ielts_min),
+            _standardized(columns.toefl_min),
+        ]),
+        FEATURE_WEIGHTS["tests"] * np.column_stack([
+            columns.gre_considered.astype(np.float64),
+            columns.gmat_considered.astype(np.float64),
+            np.where(columns.gre_considered, _standardized(columns.gre_min), 0.0),
+            np.where(columns.gmat_considered, _standardized(columns.gmat_min), 0.0),
+        ]),
+    ]
+
+    country = np.zeros((size, len(columns.country_names)))
+    country[np.arange(size), columns.country] = 1.0
+    blocks.append(FEATURE_WEIGHTS["country"] * country)
+
+    if field_index:
+        fields = np.column_stack([field_index[name] for name in sorted(field_index)]).astype(np.float64)
+        # Unit length per university, so listing more fields doesn't move it further away
+        counts = fields.sum(axis=1, keepdims=True)
+        fields /= np.sqrt(np.maximum(counts, 1))
+        blocks.append(FEATURE_WEIGHTS["fields"] * fields)
+
+    return np.hstack(blocks).astype(np.float32) if size else np.zeros((0, 0), dtype=np.float32)
+
+
+def _squared_distances(vectors: np.ndarray, norms: np.ndarray, query: np.ndarray) -> np.ndarray:
+    return np.maximum(norms - 2 * (vectors @ query) + query @ query, 0)
+
+
+class SimilarityIndex:
+    """Nearest-neighbour search over university feature vectors, by catalog position"""
+
+    def __init__(self, columns: UniversityColumns, field_index: Dict[str, np.ndarray]):
+        self.size = columns.size
+        features = build_features(columns, field_index)
+        self.exact = self.size <= EXACT_MAX_SIZE
+        if self.exact:
+            self._vectors = features
+            self._slots = np.arange(self.size)
+            self._norms = (features * features).sum(axis=1)
+            return
+
+        # IVF: members of each cluster stored contiguously, with their vectors (the
+        # only copy of the features; _slots maps a catalog position to its row)
+        centroids = self._kmeans(features, self.size // CLUSTER_SIZE)
+        assignment = self._assign(features, centroids)
+        order = np.argsort(assignment, kind="stable")
+        self._centroids = centroids
+        self._centroid_norms = (centroids * centroids).sum(axis=1)
+        self._members = order.astype(np.int32)
+        self._slots = np.argsort(order).astype(np.int32)
+        self._vectors = features[order]
+        del features
+        self._norms = (self._vectors * self._vectors).sum(axis=1)
+        self._bounds = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=len(centroids)))))
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid per vector (in chunks, to bound the distance matrix)"""
+        centroid_norms = (centroids * centroids).sum(axis=1)
+        assignment = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), 16384):
+            chunk = vectors[start:start + 16384]
+            assignment[start:start + len(chunk)] = np.argmin(centroid_norms - 2 * (chunk @ centroids.T), axis=1)
+        return assignment
+
+    @classmethod
+    def _kmeans(cls, vectors: np.ndarray, clusters: int) -> np.ndarray:
+        """Centroids trained on a sample (empty clusters are reseeded from the sample)"""
+        rng = np.random.default_rng(KMEANS_SEED)
+        sample_size = min(len(vectors), clusters * TRAINING_POINTS_PER_CLUSTER)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, clusters, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = cls._assign(sample, centroids)
+            counts = np.bincount(assignment, minlength=clusters)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            empty = np.flatnonzero(~filled)
+            centroids[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+        return centroids
+
+    def nearest(
+        self,
+        position: int,
+        limit: int = 10,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Closest universities to the one at position, as [(position, squared distance)],
+        nearest first; the university itself is left out. allowed is an optional
+        boolean mask of positions that may be returned
+        """
+        query = self._vectors[self._slots[position]]
+        if self.exact:
+            distances = _squared_distances(self._vectors, self._norms, query)
+            return self._best(self._slots, distances, position, limit, allowed)
+
+        # Clusters nearest to the query first; widen the probe until enough results pass allowed
+        cluster_order = np.argsort(_squared_distances(self._centroids, self._centroid_norms, query))
+        probe = PROBE_CLUSTERS
+        while True:
+            clusters = cluster_order[:probe]
+            slices = [slice(self._bounds[c], self._bounds[c + 1]) for c in clusters.tolist()]
+            candidates = np.concatenate([self._members[s] for s in slices])
+            vectors = np.concatenate([self._vectors[s] for s in slices])
+            norms = np.concatenate([self._norms[s] for s in slices])
+            results = self._best(candidates, _squared_distances(vectors, norms, query), position, limit, allowed)
+            if len(results) >= limit or probe >= len(cluster_order):
+                return results
+            probe *= 4
+
+    @staticmethod
+    def _best(
+        candidates: np.ndarray,
+        distances: np.ndarray,
+        position: int,
+        limit: int,
+        allowed: Optional[np.ndarray],
+    ) -> List[Tuple[int, float]]:
+        keep = candidates != position
+        if allowed is not None:
+            keep &= allowed[candidates]
+        candidates, distances = candidates[keep], distances[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(distances, limit - 1)[:limit]
+            candidates, distances = candidates[top], distances[top]
+        order = np.lexsort((candidates, distances))
+        return list(zip(candidates[order].tolist(), distances[order].tolist()))
@@ -0,0 +1,140 @@
+"""
+University View
+Read-only overlay of per-request fields on a shared catalog record
+
+Catalog records are shared by every request (and by cached recommendations), so
+payloads never copy or modify them. A UniversityView reads a key from its overlay
+first, then from the base record; it iterates and serializes exactly like
+`{**base, **overlay}`, i.e. like the copy-then-assign dicts it replaces.
+Nested values (requirements, meta) belong to the base record and are shared too.
+"""
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, Optional
+import json
+from services.university_record import UniversityRecord
+
+_MISSING = object()
+
+
+class UniversityView(Mapping):
+    """Immutable mapping: base record plus a small overlay of extra/replaced fields"""
+
+    __slots__ = ("_base", "_overlay")
+
+    def __init__(self, base: Mapping, overlay: Optional[Dict] = None):
+        # Exact type check: isinstance() against an ABC costs more than building the view
+        if type(base) is UniversityView:
+            # Flatten view-on-view so lookups stay two levels deep
+            overlay = {**base._overlay, **overlay} if overlay else base._overlay
+            base = base._base
+        self._base = base
+        self._overlay = overlay if overlay is not None else {}
+
+    @property
+    def base(self) -> Mapping:
+        """The shared catalog record underneath the overlay"""
+        return self._base
+
+    def layer(self, **fields) -> "UniversityView":
+        """A new view with fields added on top (this view is unchanged)"""
+        return UniversityView(self._base, {**self._overlay, **fields})
+
+    def to_dict(self) -> Dict:
+        """Plain dict copy, in serialization order"""
+        return {**self._base, **self._overlay}
+
+    def project(self, keys: Iterable[str]) -> Dict:
+        """Plain dict of just the given keys, in the order asked (missing keys are left out)"""
+        return {key: self[key] for key in keys if key in self}
+
+    def __getitem__(self, key):
+        value = self._overlay.get(key, _MISSING)
+        if value is _MISSING:
+            return self._base[key]
+        return value
+
+    def get(self, key, default=None):
+        value = self._overlay.get(key, _MISSING)
+        if value is _MISSING:
+            return self._base.get(key, default)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return key in self._overlay or key in self._base
+
+    def __iter__(self) -> Iterator:
+        yield from self._base
+        for key in self._overlay:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for key in self._overlay if key not in self._base)
+
+    def __repr__(self) -> str:
+        return f"UniversityView({self.to_dict()!r})"
+
+
+class UniversityViews(Sequence):
+    """
+    Read-only list of catalog records (optionally a subset, by position)
+    Views are created on access, so filtering a large catalog allocates nothing per record
+    """
+
+    __slots__ = ("_universities", "_positions")
+
+    def __init__(self, universities: Sequence, positions: Optional[Iterable[int]] = None):
+        self._universities = universities
+        self._positions = positions if positions is None or isinstance(positions, list) else list(positions)
+
+    def __len__(self) -> int:
+        return len(self._universities) if self._positions is None else len(self._positions)
+
+    @property
+    def positions(self) -> Sequence[int]:
+        """Catalog position of each record, in order"""
+        return range(len(self._universities)) if self._positions is None else self._positions
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return UniversityViews(self._universities, list(self.positions[index]))
+        pos = index if self._positions is None else self._positions[index]
+        return UniversityView(self._universities[pos])
+
+    def __iter__(self) -> Iterator[UniversityView]:
+        if self._positions is None:
+            for uni in self._universities:
+                yield UniversityView(uni)
+        else:
+            for pos in self._positions:
+                yield UniversityView(self._universities[pos])
+
+    def records(self) -> Iterator[Mapping]:
+        """The underlying catalog records, for serialization only"""
+        if self._positions is None:
+            return iter(self._universities)
+        return (self._universities[pos] for pos in self._positions)
+
+
+def json_default(value: Any):
+    """json.dumps default= hook for payloads containing views"""
+    if isinstance(value, UniversityView):
+        # Nothing layered: the shared record serializes as is
+        return value.to_dict() if value._overlay else value._base
+    if isinstance(value, UniversityViews):
+        return list(value.records())
+    if isinstance(value, UniversityRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON for API responses (same format as FastAPI's JSONResponse)"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=json_default,
+    ).encode("utf-8")
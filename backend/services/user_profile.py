@@ -0,0 +1,206 @@
+"""
+User Profile
+Typed scoring profile parsed once from a user's onboarding answers
+
+Onboarding stores answers as the form sent them: GPA as a band label
+("3.5 - 3.7 / 85-90%"), budget as a range ("$40,000 - $60,000"), countries as a
+comma-separated string. Every scoring path (recommendations, the counsellor's
+tools, shortlist rescoring) reads them through UserProfile, so they all parse
+them the same way. Profiles are memoized per (user_id, onboarding.updated_at):
+saving the onboarding form bumps updated_at, so an edited profile is parsed afresh
+and the stale entry ages out of the LRU.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Onboarding columns a profile is parsed from, in the order of UserProfile.from_values
+ONBOARDING_FIELDS = (
+    "gpa",
+    "gre_quant_score",
+    "gre_verbal_score",
+    "gmat_score",
+    "ielts_score",
+    "toefl_score",
+    "budget_range",
+    "preferred_countries",
+    "target_degree",
+    "field_of_study",
+    "target_intake_year",
+)
+
+# Parsed profiles kept per process (one per user with a recent request)
+PROFILE_CACHE_SIZE = 4096
+
+_NUMBER = re.compile(r'\d+\.?\d*')
+
+
+def parse_gpa(gpa: Any) -> Optional[float]:
+    """Representative GPA: the first number of a band label ("Above 3.7 / 90%+" -> 3.7)"""
+    if gpa is None or gpa == "Not Applicable":
+        return None
+    if isinstance(gpa, (int, float)):
+        return float(gpa)
+    numbers = _NUMBER.findall(str(gpa))
+    return float(numbers[0]) if numbers else None
+
+
+def parse_budget(budget_range: Optional[str]) -> Optional[float]:
+    """Upper end of a budget range ("$40,000 - $60,000" -> 60000.0)"""
+    if not budget_range:
+        return None
+    try:
+        budget_str = budget_range.split("-")[-1].strip()
+        return float(budget_str.replace("$", "").replace(",", ""))
+    except (ValueError, AttributeError):
+        logger.warning(f"Could not parse budget range: {budget_range}")
+        return None
+
+
+def parse_countries(preferred_countries: Optional[str]) -> Tuple[str, ...]:
+    """Country names from the comma-separated onboarding answer"""
+    if not preferred_countries:
+        return ()
+    return tuple(c.strip() for c in preferred_countries.split(",") if c.strip())
+
+
+class UserProfile:
+    """Parsed, typed onboarding answers used for scoring (read-only, shared between requests)"""
+
+    __slots__ = (
+        "gpa",
+        "gre",
+        "gmat",
+        "ielts",
+        "toefl",
+        "budget_max",
+        "countries",
+        "target_degree",
+        "field_of_study",
+        "target_intake_year",
+    )
+
+    def __init__(
+        self,
+        gpa: Any = None,
+        gre_quant_score: Optional[int] = None,
+        gre_verbal_score: Optional[int] = None,
+        gmat_score: Optional[int] = None,
+        ielts_score: Optional[float] = None,
+        toefl_score: Optional[int] = None,
+        budget_range: Optional[str] = None,
+        preferred_countries: Optional[str] = None,
+        target_degree: Optional[str] = None,
+        field_of_study: Optional[str] = None,
+        target_intake_year: Optional[int] = None,
+    ):
+        self.gpa = parse_gpa(gpa)
+        # GRE is compared as the combined quant + verbal score
+        self.gre = gre_quant_score + gre_verbal_score if gre_quant_score and gre_verbal_score else None
+        self.gmat = gmat_score or None
+        self.ielts = ielts_score or None
+        self.toefl = toefl_score or None
+        self.budget_max = parse_budget(budget_range)
+        self.countries = parse_countries(preferred_countries)
+        self.target_degree = target_degree
+        self.field_of_study = field_of_study
+        self.target_intake_year = target_intake_year
+
+    @classmethod
+    def from_values(cls, values: Sequence) -> "UserProfile":
+        """Profile from onboarding column values in ONBOARDING_FIELDS order"""
+        return cls(**dict(zip(ONBOARDING_FIELDS, values)))
+
+    @classmethod
+    def from_onboarding(cls, onboarding) -> "UserProfile":
+        return cls.from_values([getattr(onboarding, field) for field in ONBOARDING_FIELDS])
+
+    def scoring_kwargs(self) -> Dict:
+        """Keyword arguments for score_university / score_batch"""
+        return {
+            "user_gpa": self.gpa,
+            "user_gre": self.gre,
+            "user_gmat": self.gmat,
+            "user_ielts": self.ielts,
+            "user_toefl": self.toefl,
+            "user_budget": self.budget_max,
+            "user_countries": list(self.countries) or None,
+        }
+
+    def recommendation_kwargs(self) -> Dict:
+        """Keyword arguments for get_recommended_universities / stream_recommended_universities"""
+        return {
+            "target_degree": self.target_degree,
+            "field_of_study": self.field_of_study,
+            "preferred_countries": list(self.countries),
+            "budget_max": self.budget_max,
+            "target_intake_year": self.target_intake_year,
+            "user_gpa": self.gpa,
+            "user_gre": self.gre,
+            "user_gmat": self.gmat,
+            "user_ielts": self.ielts,
+            "user_toefl": self.toefl,
+        }
+
+
+class UserProfileCache:
+    """LRU of parsed profiles keyed by (user_id, onboarding.updated_at)"""
+
+    def __init__(self, max_entries: int = PROFILE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (user_id, updated_at) -> UserProfile
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, onboarding) -> UserProfile:
+        """Profile of an Onboarding row (or any object with its attributes)"""
+        key = (onboarding.user_id, onboarding.updated_at)
+        return self.get_values(key, lambda: [getattr(onboarding, field) for field in ONBOARDING_FIELDS])
+
+    def get_values(self, key: Tuple[Hashable, Any], values: Callable[[], Sequence]) -> UserProfile:
+        """
+        Profile for key = (user_id, updated_at), parsing values() (onboarding column
+        values in ONBOARDING_FIELDS order) on a miss. Rows without updated_at aren't cached.
+        """
+        if key[1] is None:
+            return UserProfile.from_values(values())
+        with self._lock:
+            profile = self._entries.get(key)
+            if profile is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        profile = UserProfile.from_values(values())
+        with self._lock:
+            self._entries[key] = profile
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return profile
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global instance
+user_profiles = UserProfileCache()
+
+
+def get_user_profile(onboarding) -> UserProfile:
+    """Memoized profile of an Onboarding row"""
+    return user_profiles.get(onboarding)
@@ -0,0 +1,12 @@
+"""
+Shared test setup
+
+config refuses to import without its API keys, so placeholders are set before any
+route module is imported. Route tests only exercise catalog endpoints, which never
+reach Clerk, Gemini or the database.
+"""
+import os
+
+os.environ.setdefault("CLERK_SECRET_KEY", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,80 @@
+"""
+Catalog Responses
+Byte-bounded response cache and its keys in the catalog routes
+
+The cache is charged for every body and compressed variant it holds, drops the
+least recently used bodies past its budget, never stores bodies over the per-body
+limit and treats entries from another catalog version as misses. Requests that
+produce the same body (repeated projection fields, the same cursor) share an entry.
+"""
+import base64
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from routes import universities
+from services.catalog_responses import EncodedBody, ResponseCache, response_cache
+from services.university_service import UniversityService
+
+ALL_URL = "/api/universities/all"
+
+
+def body(size: int) -> EncodedBody:
+    return EncodedBody(b"x" * size)
+
+
+def test_evicts_least_recently_used_past_the_byte_budget():
+    cache = ResponseCache(max_bytes=1000, max_body_bytes=1000)
+    cache.put("a", "v1", body(400))
+    cache.put("b", "v1", body(400))
+    assert cache.get("a", "v1") is not None
+    cache.put("c", "v1", body(400))
+
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") is not None and cache.get("c", "v1") is not None
+    assert cache.stats()["bytes"] == 800
+    assert cache.stats()["evictions"] == 1
+
+
+def test_skips_oversized_bodies_and_charges_compressed_variants():
+    cache = ResponseCache(max_bytes=10_000, max_body_bytes=2000)
+    cache.put("big", "v1", body(2001))
+    assert cache.get("big", "v1") is None
+    assert cache.stats()["skipped"] == 1
+
+    cached = body(1500)
+    cache.put("page", "v1", cached)
+    cached.variant("gzip")
+    cache.put("page", "v1", cached)
+    assert cache.stats()["bytes"] == 1500 + len(gzip.compress(b"x" * 1500, compresslevel=9, mtime=0))
+
+
+def test_entries_from_another_catalog_version_are_misses():
+    cache = ResponseCache()
+    cache.put("page", "v1", body(10))
+    assert cache.get("page", "v2") is None
+    assert cache.stats()["bytes"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(universities.router)
+    return TestClient(app)
+
+
+def test_equivalent_requests_share_one_cache_entry(client):
+    response_cache.clear()
+    cursor = client.get(ALL_URL, params={"limit": 3}).json()["next_cursor"]
+    # The same position spelled differently
+    version, after = UniversityService._decode_cursor(cursor)
+    respelled = base64.urlsafe_b64encode(f"{version}:00{after}".encode()).decode()
+    assert respelled != cursor
+
+    first = client.get(ALL_URL, params={"limit": 3, "fields": "id,name", "cursor": cursor})
+    size = response_cache.stats()["size"]
+    for fields, page_cursor in [("id,name,id", cursor), (" id , name ,", respelled)]:
+        again = client.get(ALL_URL, params={"limit": 3, "fields": fields, "cursor": page_cursor})
+        assert again.content == first.content
+    assert response_cache.stats()["size"] == size
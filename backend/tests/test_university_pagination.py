@@ -0,0 +1,90 @@
+"""
+University Pagination
+Cursor pages of GET /api/universities/all against the unpaginated listing
+
+Walking every page must return exactly the unpaginated result, in order, for
+plain, filtered and projected listings. Cursors are bound to the catalog version,
+so a cursor from another version, or one that doesn't decode, is a 400.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from routes import universities
+from services.university_service import UniversityService, university_service
+
+ALL_URL = "/api/universities/all"
+SEARCH_URL = "/api/universities/search"
+
+# Listings walked page by page (query parameters besides cursor and limit)
+LISTINGS = [
+    {},
+    {"country": ["United States", "Canada"]},
+    {"degree": "Masters", "budget_max": 60000, "intake_year": 2027},
+    {"fields": "id,name,country"},
+]
+
+PAGE_SIZES = [1, 7, 50, 500]
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(universities.router)
+    return TestClient(app)
+
+
+def walk_pages(client, params: dict, limit: int) -> list:
+    """Every university of a listing, fetched limit at a time by following next_cursor"""
+    universities = []
+    cursor = None
+    # A cursor that doesn't advance would page forever; no listing needs more pages than rows
+    for _ in range(len(university_service.universities) + 1):
+        page_params = {**params, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(ALL_URL, params=page_params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert page["count"] == len(page["universities"]) <= limit
+        universities.extend(page["universities"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            assert len(universities) == page["total_count"]
+            return universities
+    pytest.fail(f"next_cursor never ran out ({len(universities)} universities fetched)")
+
+
+@pytest.mark.parametrize("limit", PAGE_SIZES)
+@pytest.mark.parametrize("params", LISTINGS)
+def test_pages_concatenate_to_the_full_listing(client, params, limit):
+    full = client.get(ALL_URL, params=params).json()
+    assert full["next_cursor"] is None
+    assert full["count"] == full["total_count"]
+    assert walk_pages(client, params, limit) == full["universities"]
+
+
+def test_cursor_from_another_catalog_version_is_rejected(client):
+    first = client.get(ALL_URL, params={"limit": 5}).json()
+    assert first["next_cursor"] is not None
+
+    stale = UniversityService._encode_cursor("0123456789abcdef", 4)
+    assert university_service.catalog_version != "0123456789abcdef"
+    response = client.get(ALL_URL, params={"limit": 5, "cursor": stale})
+    assert response.status_code == 400
+    assert "catalog version" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("cursor", ["garbage!", "bm90LWEtY3Vyc29y", "YWJjOnh5eg", "%%%"])
+def test_malformed_cursor_is_rejected(client, cursor):
+    response = client.get(ALL_URL, params={"limit": 5, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "invalid cursor"
+
+
+@pytest.mark.parametrize("url", [ALL_URL, SEARCH_URL])
+def test_bad_cursor_is_rejected_before_the_etag_check(client, url):
+    etag = client.get(url, params={"limit": 5}).headers["ETag"]
+    assert client.get(url, params={"limit": 5}, headers={"If-None-Match": etag}).status_code == 304
+
+    stale = UniversityService._encode_cursor("0123456789abcdef", 4)
+    for cursor in ["garbage!", stale]:
+        response = client.get(url, params={"limit": 5, "cursor": cursor}, headers={"If-None-Match": etag})
+        assert response.status_code == 400, cursor
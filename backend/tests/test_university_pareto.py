@@ -0,0 +1,71 @@
+"""
+University Pareto Frontier
+pareto_layers against an O(n²) dominance check
+
+Random (cost, rank, score) arrays, drawn from small value sets so ties and exact
+duplicates are common, with unknown costs (zero, negative, NaN) and unranked (inf)
+bounds mixed in. Every layer must equal what a pairwise dominance check peels
+off, and come sorted by cost, then rank, then score (best first).
+"""
+import numpy as np
+import pytest
+from services.university_pareto import pareto_layers
+
+TRIALS = 300
+MAX_SIZE = 80
+SEEDS = [0, 1, 2]
+
+# Small value sets, so many candidates tie on one or more axes
+COST_VALUES = [0.0, -1.0, np.nan, 10000.0, 20000.0, 20000.0, 35000.0, 60000.5]
+RANK_VALUES = [10.0, 50.0, 100.0, 150.0, 500.0, np.inf]
+
+
+def brute_force_layers(cost: np.ndarray, rank: np.ndarray, score: np.ndarray, layers: int) -> list:
+    """Layers by checking every pair; unknown costs (<= 0 or NaN) are the most expensive"""
+    cost = [c if c > 0 else np.inf for c in cost.tolist()]
+    rank, score = rank.tolist(), score.tolist()
+
+    def dominates(q: int, p: int) -> bool:
+        no_worse = cost[q] <= cost[p] and rank[q] <= rank[p] and score[q] >= score[p]
+        return no_worse and (cost[q], rank[q], score[q]) != (cost[p], rank[p], score[p])
+
+    remaining = list(range(len(cost)))
+    frontiers = []
+    while remaining and len(frontiers) < layers:
+        frontier = [p for p in remaining if not any(dominates(q, p) for q in remaining)]
+        frontiers.append(frontier)
+        remaining = [p for p in remaining if p not in set(frontier)]
+    return frontiers
+
+
+def random_case(rng: np.random.Generator):
+    size = int(rng.integers(0, MAX_SIZE + 1))
+    cost = rng.choice(COST_VALUES, size) if rng.random() < 0.7 else rng.uniform(-5000, 90000, size)
+    rank = rng.choice(RANK_VALUES, size)
+    # Narrow score ranges make exact (cost, rank, score) duplicates likely
+    low = int(rng.integers(0, 90))
+    score = rng.integers(low, low + int(rng.choice([2, 5, 30])), size)
+    return cost, rank, score, int(rng.integers(1, 5))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_layers_match_pairwise_dominance(seed):
+    rng = np.random.default_rng(seed)
+    for trial in range(TRIALS):
+        cost, rank, score, layers = random_case(rng)
+        expected = brute_force_layers(cost, rank, score, layers)
+        actual = pareto_layers(cost, rank, score, layers)
+        assert [sorted(layer.tolist()) for layer in actual] == expected, (seed, trial)
+
+        known_cost = np.where(cost > 0, cost, np.inf)
+        for layer in actual:
+            keys = [(known_cost[i], rank[i], -score[i]) for i in layer.tolist()]
+            assert keys == sorted(keys), (seed, trial)
+
+
+def test_nan_costs_count_as_most_expensive():
+    cost = np.array([np.nan, 20000.0, np.nan, 0.0])
+    rank = np.array([10.0, 10.0, 10.0, 10.0])
+    score = np.array([80, 80, 90, 90])
+    # NaN and zero costs are both unknown and tie, so the better score dominates
+    assert [layer.tolist() for layer in pareto_layers(cost, rank, score, 3)] == [[1, 2, 3], [0]]
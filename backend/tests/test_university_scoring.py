@@ -0,0 +1,148 @@
+"""
+University Scoring Parity
+score_batch (with explain_scores) against the score_university reference
+
+Every catalog row is scored both ways under a grid of profiles, on the shipped
+catalog, on seeded synthetic catalogs and on a catalog of edge-case records
+(missing sections, explicit nulls, spaced and unknown ranking tiers, zero costs).
+The batch-built view must equal the reference view field for field.
+"""
+import json
+import random
+import numpy as np
+import pytest
+from benchmarks.generate_catalog import generate_universities
+from services.university_scoring import score_batch, score_profiles
+from services.university_service import UniversityService
+from services.university_view import dumps
+
+# Fields derived from the score components, checked one by one for readable failures
+PARITY_FIELDS = (
+    "match_score",
+    "category",
+    "acceptance_chance",
+    "fit_reasons",
+    "risk_factors",
+    "exam_requirements_summary",
+    "cost_level",
+    "strength_tags",
+)
+
+# BatchScores arrays that score_profiles must share with score_batch
+COMPONENT_ARRAYS = (
+    "gpa_level",
+    "gre_level",
+    "gmat_level",
+    "english_level",
+    "budget_level",
+    "country_match",
+    "ranking_tier",
+    "match_score",
+    "acceptance",
+    "category",
+)
+
+# Profile values, including the thresholds score_university compares against
+GPA_VALUES = [None, 0, 2.5, 2.9, 3.0, 3.2, 3.3, 3.5, 3.7, 3.75, 4.0]
+GRE_VALUES = [None, 0, 290, 300, 310, 315, 320, 330, 340]
+GMAT_VALUES = [None, 0, 550, 600, 650, 680, 700, 760]
+IELTS_VALUES = [None, 0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0]
+TOEFL_VALUES = [None, 0, 70, 79, 90, 100, 110]
+BUDGET_VALUES = [None, 0, 20000.0, 35000.0, 40000.0, 50000.0, 61000.0, 90000.0]
+
+SYNTHETIC_SEEDS = [1, 7, 42]
+SYNTHETIC_SIZE = 300
+PROFILES_PER_CATALOG = 40
+
+
+def random_profiles(rng: random.Random, countries: list, count: int) -> list:
+    """score_university / score_batch keyword arguments"""
+    country_choices = [None, [], ["Nowhere"]] + [[c] for c in countries[:4]] + [countries[:3]]
+    return [
+        {
+            "user_gpa": rng.choice(GPA_VALUES),
+            "user_gre": rng.choice(GRE_VALUES),
+            "user_gmat": rng.choice(GMAT_VALUES),
+            "user_ielts": rng.choice(IELTS_VALUES),
+            "user_toefl": rng.choice(TOEFL_VALUES),
+            "user_budget": rng.choice(BUDGET_VALUES),
+            "user_countries": rng.choice(country_choices),
+        }
+        for _ in range(count)
+    ]
+
+
+def edge_case_universities(rng: random.Random, count: int) -> list:
+    """Records exercising every default and missing-value branch of the scoring rules"""
+    pick = rng.choice
+    return [
+        {
+            "id": f"edge{index}",
+            "name": f"Edge University {index}",
+            "country": pick(["Germany", "Canada", "United States", ""]),
+            "state": pick(["Bavaria", ""]),
+            "degreesOffered": ["Masters"],
+            "fields": ["Computer Science"],
+            "rankingTier": pick(["Top10", "Top 20", "Top50", "Top100", "Top150", "Top200",
+                                 "Top300", "Top 500", "Unranked", ""]),
+            "academicRequirements": pick([{}, {"gpaMin": pick([2.8, 3.0, 3.3]),
+                                               "gpaCompetitive": pick([3.3, 3.5, 3.8])}]),
+            "examRequirements": {
+                "ielts": pick([{}, {"minScore": pick([6.0, 6.5, 7.0])}]),
+                "toefl": pick([{}, {"minScore": pick([79, 90, 100])}]),
+                "gre": pick([{}, {"required": pick([True, False]), "recommended": pick([True, False, None]),
+                                  "minTotal": pick([None, 300, 320])}]),
+                "gmat": pick([{}, {"required": pick([True, False]), "minScore": pick([None, 600, 700])}]),
+            },
+            "estimatedAnnualCostUSD": pick([{}, {"total": pick([0, 20000, 35000, 42500, 50000, 57500, 80000])}]),
+            "budgetTier": pick(["Low", "Medium", "High"]),
+            "acceptanceDifficulty": pick(["Low", "Medium", "High", "Very High", ""]),
+            "intakeYears": [2026],
+            "meta": {},
+        }
+        for index in range(count)
+    ]
+
+
+def service_for(tmp_path, universities: list) -> UniversityService:
+    json_path = tmp_path / "universities.json"
+    json_path.write_text(json.dumps(universities), encoding='utf-8')
+    return UniversityService(json_path)
+
+
+def assert_batch_matches_reference(service: UniversityService, profiles: list):
+    snapshot = service._snapshot
+    positions = np.arange(snapshot.columns.size)
+    batches = score_profiles(snapshot.columns, positions, profiles)
+    for profile, shared in zip(profiles, batches):
+        scores = score_batch(snapshot.columns, positions, **profile)
+        for name in COMPONENT_ARRAYS:
+            np.testing.assert_array_equal(getattr(shared, name), getattr(scores, name), err_msg=name)
+
+        for row, pos in enumerate(positions.tolist()):
+            university = snapshot.universities[pos]
+            expected = service.score_university(university, **profile)
+            actual = service._build_scored_university(snapshot, scores, row, profile)
+            for field in PARITY_FIELDS:
+                assert actual[field] == expected[field], (field, university.get("id"), profile)
+            assert json.loads(dumps(actual)) == json.loads(dumps(expected)), (university.get("id"), profile)
+
+
+def test_shipped_catalog_parity():
+    service = UniversityService()
+    countries = sorted(service._snapshot.columns.country_names)
+    assert_batch_matches_reference(service, random_profiles(random.Random(0), countries, PROFILES_PER_CATALOG))
+
+
+@pytest.mark.parametrize("seed", SYNTHETIC_SEEDS)
+def test_synthetic_catalog_parity(tmp_path, seed):
+    service = service_for(tmp_path, list(generate_universities(SYNTHETIC_SIZE, seed)))
+    countries = sorted(c for c in service._snapshot.columns.country_names if c)
+    assert_batch_matches_reference(service, random_profiles(random.Random(seed), countries, PROFILES_PER_CATALOG))
+
+
+@pytest.mark.parametrize("seed", SYNTHETIC_SEEDS)
+def test_edge_case_catalog_parity(tmp_path, seed):
+    rng = random.Random(seed)
+    service = service_for(tmp_path, edge_case_universities(rng, 120))
+    assert_batch_matches_reference(service, random_profiles(rng, ["Germany", "Canada", "United States", ""], 60))
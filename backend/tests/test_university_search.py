@@ -0,0 +1,146 @@
+"""
+University Search
+TextIndex.search against a brute-force BM25 over every document
+
+On generated catalogs, multi-term, prefix and mixed queries are scored the slow
+way: each document's weighted term counts summed into BM25 with no postings, no
+pruning and no dense arrays. search() must return a valid top-k of those scores at
+every limit, both for a freshly built index and for one mapped from a compiled
+catalog.
+"""
+import json
+import math
+import random
+import pytest
+from benchmarks.generate_catalog import generate_universities
+from services.catalog_binary import compile_catalog, compiled_path_for, open_compiled_catalog
+from services.university_record import compact_records
+from services.university_search import (
+    BM25_B, BM25_K1, MAX_PREFIX_TERMS, TextIndex, _searchable, _term_counts, tokenize,
+)
+
+CATALOG_SEEDS = [3, 42]
+CATALOG_SIZE = 2500
+LIMITS = [1, 10, 50]
+QUERIES_PER_KIND = 12
+
+# Impacts are stored as float32
+TOLERANCE = 1e-4
+
+# Hand-picked queries: common words (whole-catalog scoring), prefixes, unknown words
+FIXED_QUERIES = [
+    "university",
+    "computer science",
+    "university of technology",
+    "state university united states",
+    "comp",
+    "comp sci",
+    "engineering germ",
+    "zzzz",
+    "of the",
+]
+
+
+class BruteForceBM25:
+    """BM25 scores of every document, computed from weighted term counts alone"""
+
+    def __init__(self, universities: list):
+        self.docs = [_term_counts(_searchable(uni), {}) for uni in universities]
+        self.lengths = [sum(counts.values()) for counts in self.docs]
+        self.average_length = sum(self.lengths) / len(self.docs)
+        self.df = {}
+        for counts in self.docs:
+            for term in counts:
+                self.df[term] = self.df.get(term, 0) + 1
+
+    def query_terms(self, query: str) -> list:
+        """Known words as is; unknown words as the most common terms they prefix"""
+        terms = []
+        for token in dict.fromkeys(tokenize(query)):
+            if token in self.df:
+                terms.append(token)
+            else:
+                prefixed = sorted((t for t in self.df if t.startswith(token)), key=lambda t: (-self.df[t], t))
+                terms.extend(prefixed[:MAX_PREFIX_TERMS])
+        return list(dict.fromkeys(terms))
+
+    def scores(self, query: str) -> dict:
+        """position -> score for every document with a positive score"""
+        terms = self.query_terms(query)
+        size = len(self.docs)
+        scores = {}
+        for pos, counts in enumerate(self.docs):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[pos] / self.average_length)
+            score = 0.0
+            for term in terms:
+                tf = counts.get(term)
+                if tf:
+                    idf = math.log(1 + (size - self.df[term] + 0.5) / (self.df[term] + 0.5))
+                    score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            if score > 0:
+                scores[pos] = score
+        return scores
+
+
+def random_queries(brute: BruteForceBM25, rng: random.Random) -> list:
+    """Multi-term queries, prefix queries and queries mixing both"""
+    words = sorted(brute.df)
+    common = sorted(words, key=lambda t: -brute.df[t])[:50]
+
+    def prefix(word: str) -> str:
+        return word[:max(2, len(word) // 2)]
+
+    multi = [" ".join(rng.sample(words, rng.randint(2, 4))) for _ in range(QUERIES_PER_KIND)]
+    multi += [" ".join(rng.sample(common, rng.randint(2, 3))) + " " + rng.choice(words) for _ in range(QUERIES_PER_KIND)]
+    prefixes = [prefix(rng.choice(words)) for _ in range(QUERIES_PER_KIND)]
+    mixed = [f"{rng.choice(words)} {prefix(rng.choice(common))}" for _ in range(QUERIES_PER_KIND)]
+    return FIXED_QUERIES + multi + prefixes + mixed
+
+
+def assert_top_k(results: list, expected: dict, limit: int, query: str):
+    """results are a best-first top limit of expected, scores within float32 tolerance"""
+    assert len(results) == min(limit, len(expected)), query
+    positions = [pos for pos, _ in results]
+    assert len(set(positions)) == len(positions), query
+    for (pos, score), (_, next_score) in zip(results, results[1:]):
+        assert score >= next_score, query
+    for pos, score in results:
+        assert pos in expected, (query, pos)
+        assert score == pytest.approx(expected[pos], rel=TOLERANCE, abs=TOLERANCE), (query, pos)
+    if results:
+        # Nothing left out scores above the worst result
+        weakest = results[-1][1]
+        returned = set(positions)
+        missed = [pos for pos, score in expected.items() if pos not in returned and score > weakest * (1 + TOLERANCE) + TOLERANCE]
+        assert not missed, (query, missed[:5])
+
+
+@pytest.fixture(scope="module", params=CATALOG_SEEDS)
+def catalog(request, tmp_path_factory):
+    seed = request.param
+    universities = list(generate_universities(CATALOG_SIZE, seed))
+    json_path = tmp_path_factory.mktemp(f"catalog{seed}") / "universities.json"
+    json_path.write_text(json.dumps(universities), encoding='utf-8')
+    records = compact_records(universities)
+    brute = BruteForceBM25(records)
+    return json_path, records, brute, random_queries(brute, random.Random(seed))
+
+
+def test_built_index_matches_brute_force(catalog):
+    _, records, brute, queries = catalog
+    index = TextIndex(records)
+    for query in queries:
+        expected = brute.scores(query)
+        for limit in LIMITS:
+            assert_top_k(index.search(query, limit), expected, limit, query)
+
+
+def test_compiled_index_matches_brute_force(catalog):
+    json_path, _, brute, queries = catalog
+    compile_catalog(json_path)
+    snapshot = open_compiled_catalog(compiled_path_for(json_path), json_path)
+    assert snapshot is not None and snapshot.text_index is not None
+    for query in queries:
+        expected = brute.scores(query)
+        for limit in LIMITS:
+            assert_top_k(snapshot.text_index.search(query, limit), expected, limit, query)